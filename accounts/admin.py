@@ -1,13 +1,12 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
-from audit.models import AuditLog
-from audit.utils import write_audit
+from audit.admin import BulkHardDeleteAdminMixin
 from .models import User
 
 
 @admin.register(User)
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(BulkHardDeleteAdminMixin, BaseUserAdmin):
     ordering = ['email']
     list_display = ['email', 'name', 'role', 'is_staff', 'is_active', 'id']
     list_filter = ['role', 'is_staff', 'is_active']
@@ -40,25 +39,3 @@ class UserAdmin(BaseUserAdmin):
     # Soft-delete bo'lgan userlarni ham ko‘rsatish
     def get_queryset(self, request):
         return User.all_objects.all()
-
-    # --- HARD DELETE ---
-    def delete_model(self, request, obj):
-        write_audit(
-            action=AuditLog.Action.HARD_DELETE,
-            instance=obj,
-            user=request.user,
-            changes={'deleted': {'old': False, 'new': True}},
-            request=request,
-        )
-        obj.hard_delete()
-
-    def delete_queryset(self, request, queryset):
-        for obj in queryset:
-            write_audit(
-                action=AuditLog.Action.HARD_DELETE,
-                instance=obj,
-                user=request.user,
-                changes={'deleted': {'old': False, 'new': True}},
-                request=request,
-            )
-            obj.hard_delete()
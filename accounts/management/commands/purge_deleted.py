@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from accounts.purge import purge_expired
+
+
+class Command(BaseCommand):
+    help = (
+        "Muddati o'tgan soft-deleted qatorlarni (Task, Sprint, Project, User) batch'lab hard delete qiladi. "
+        "Cron misol: 0 3 * * * python manage.py purge_deleted"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retention-days', type=int, default=None,
+                            help="deleted_at shundan eski bo'lsa o'chiriladi (default: SOFT_DELETE_RETENTION_DAYS)")
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help="Bitta tranzaksiyadagi pk soni (default: SOFT_DELETE_PURGE_BATCH_SIZE)")
+        parser.add_argument('--sleep', type=float, default=None,
+                            help="Batch'lar orasidagi pauza, soniya (default: SOFT_DELETE_PURGE_SLEEP)")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Hech narsa o'chirmasdan, nima o'chishini ko'rsatadi")
+
+    def handle(self, *args, **options):
+        result = purge_expired(
+            retention_days=options['retention_days'],
+            batch_size=options['batch_size'],
+            sleep=options['sleep'],
+            dry_run=options['dry_run'],
+            report=self.stdout.write,
+        )
+        total = sum(result.values())
+        verb = "would be purged" if options['dry_run'] else "purged"
+        self.stdout.write(self.style.SUCCESS(f"{total} row(s) {verb}."))
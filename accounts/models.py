@@ -1,4 +1,6 @@
-from django.db import models
+import uuid
+
+from django.db import models, transaction
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
 from django.utils import timezone
 
@@ -6,7 +8,7 @@ from django.utils import timezone
 
 class SoftDeleteQuerySet(models.QuerySet):
     def delete(self):
-        return super().update(is_deleted=True, deleted_at=timezone.now())
+        return super().update(is_deleted=True, deleted_at=timezone.now(), deleted_batch=uuid.uuid4())
 
     def hard_delete(self):
         return super().delete()
@@ -28,6 +30,8 @@ class SoftDeleteManager(models.Manager):
 class SoftDeleteModel(models.Model):
     is_deleted = models.BooleanField(default=False)
     deleted_at = models.DateTimeField(null=True, blank=True)
+    # bitta soft delete (cascade) bilan o'chgan qatorlar uchun umumiy id — restore shu bo'yicha
+    deleted_batch = models.UUIDField(null=True, blank=True, db_index=True)
 
     objects = SoftDeleteManager()                       # default manager
     all_objects = SoftDeleteQuerySet.as_manager()       # manager for all rows
@@ -35,10 +39,52 @@ class SoftDeleteModel(models.Model):
     class Meta:
         abstract = True
 
+    def get_cascade_querysets(self):
+        """
+        Obyekt bilan birga soft delete bo'ladigan bolalar (barcha qatorlar, all_objects orqali).
+        Har bir queryset bitta UPDATE bo'lib bajariladi.
+        """
+        return []
+
     def delete(self, using=None, keep_parents=False):
-        self.is_deleted = True
-        self.deleted_at = timezone.now()
-        self.save(update_fields=["is_deleted", "deleted_at"])
+        return self.soft_delete()
+
+    def soft_delete(self, batch=None):
+        batch = batch or uuid.uuid4()
+        now = timezone.now()
+        fields = {'is_deleted': True, 'deleted_at': now, 'deleted_batch': batch}
+
+        with transaction.atomic():
+            type(self).all_objects.filter(pk=self.pk).update(**fields)
+            for qs in self.get_cascade_querysets():
+                # avval o'chirilganlar o'z batch'ida qoladi
+                qs.filter(is_deleted=False).update(**fields)
+
+        for name, value in fields.items():
+            setattr(self, name, value)
+        return batch
+
+    def restore(self):
+        batch = self.deleted_batch
+        if batch is None:
+            return 0
+        return type(self).restore_batch(batch)
+
+    @classmethod
+    def restore_batch(cls, batch):
+        """
+        `batch` bilan o'chgan barcha qatorlarni tiklaydi; har bir model uchun bitta UPDATE.
+        """
+        fields = {'is_deleted': False, 'deleted_at': None, 'deleted_batch': None}
+        restored = 0
+        with transaction.atomic():
+            for model in cls.get_cascade_models():
+                restored += model.all_objects.filter(deleted_batch=batch).update(**fields)
+        return restored
+
+    @classmethod
+    def get_cascade_models(cls):
+        return [cls]
 
     def hard_delete(self, using=None, keep_parents=False):
         return super().delete(using=using, keep_parents=keep_parents)
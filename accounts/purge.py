@@ -0,0 +1,82 @@
+# accounts/purge.py
+import logging
+import time
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import models
+from django.db.models import Q
+from django.db.models.deletion import get_candidate_relations_to_delete
+from django.utils import timezone
+
+from audit.utils import bulk_hard_delete, count_cascade
+from .models import SoftDeleteModel
+
+logger = logging.getLogger(__name__)
+
+
+def get_purge_models():
+    return [apps.get_model(label) for label in settings.SOFT_DELETE_PURGE_MODELS]
+
+
+def expired_queryset(model, cutoff):
+    qs = model.all_objects.filter(is_deleted=True, deleted_at__lt=cutoff)
+
+    # hali tirik yoki muddati o'tmagan (tiklanishi mumkin) bolasi bor qatorlar o'chirilmaydi:
+    # masalan, live project'lari bor PM yoki kechroq o'chirilgan sprint'lari bor project
+    for rel in get_candidate_relations_to_delete(model._meta):
+        related_model = rel.related_model
+        if rel.on_delete is models.CASCADE and issubclass(related_model, SoftDeleteModel):
+            live_parents = related_model.all_objects.filter(
+                Q(is_deleted=False) | Q(deleted_at__gte=cutoff),
+                **{f"{rel.field.name}__isnull": False},
+            ).values(rel.field.name)
+            qs = qs.exclude(pk__in=live_parents)
+    return qs
+
+
+def purge_expired(retention_days=None, batch_size=None, sleep=None, dry_run=False, report=None):
+    """
+    Scheduler hook (cron, systemd timer va h.k.): muddati o'tgan soft-deleted qatorlarni hard delete qiladi.
+
+    Har bir batch — pk bo'yicha cheklangan tanlov, alohida qisqa tranzaksiya va bitta summary audit.
+    Batch'lar orasida `sleep` soniya kutiladi. To'xtab qolsa, qayta ishga tushirish qolgan joydan davom etadi.
+    """
+    retention_days = settings.SOFT_DELETE_RETENTION_DAYS if retention_days is None else retention_days
+    batch_size = batch_size or settings.SOFT_DELETE_PURGE_BATCH_SIZE
+    sleep = settings.SOFT_DELETE_PURGE_SLEEP if sleep is None else sleep
+    report = report or logger.info
+
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    result = {}
+
+    for model in get_purge_models():
+        label = model._meta.label
+        qs = expired_queryset(model, cutoff)
+
+        if dry_run:
+            total = qs.count()
+            cascade = {m._meta.label: c for m, c in count_cascade(qs).items() if c} if total else {}
+            result[label] = total
+            report(f"[dry-run] {label}: {total} row(s) would be deleted, cascade={cascade}")
+            continue
+
+        purged = 0
+        while True:
+            batch = list(qs.order_by("pk").values_list("pk", flat=True)[:batch_size])
+            if not batch:
+                break
+            deleted, cascade = bulk_hard_delete(
+                model.all_objects.filter(pk__in=batch),
+                chunk_size=batch_size,
+                summary_only=True,
+            )
+            purged += deleted
+            report(f"{label}: purged {purged} (batch of {deleted}, cascade={cascade})")
+            if sleep and len(batch) == batch_size:
+                time.sleep(sleep)
+
+        result[label] = purged
+
+    return result
@@ -1,3 +1,86 @@
+from datetime import timedelta
+
 from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import User
+from accounts.purge import expired_queryset, purge_expired
+from management.models import Project, Sprint, Task
+from management.tests import APITestCase
+
+
+class PurgeExpiredTests(TestCase):
+
+    def setUp(self):
+        self.pm = User.objects.create_user('pm@example.com', 'secret', name='PM', role=User.Role.PM)
+        self.project = Project.objects.create(title='Old', pm=self.pm)
+        self.sprint = Sprint.objects.create(project=self.project, name='S1', start_date=timezone.now())
+        self.cutoff = timezone.now() - timedelta(days=90)
+
+    def age(self, obj, days):
+        """Obyektni (cascade bilan) `days` kun oldin o'chirilgan qiladi."""
+        batch = obj.soft_delete()
+        for model in (Project, Sprint, Task):
+            model.all_objects.filter(deleted_batch=batch).update(deleted_at=timezone.now() - timedelta(days=days))
+
+    def test_expired_parent_with_expired_children_is_purged(self):
+        self.age(self.project, 120)
+        self.assertEqual(list(expired_queryset(Project, self.cutoff)), [self.project])
+
+    def test_expired_parent_keeps_child_that_has_not_expired(self):
+        # sprint kechroq o'chirilgan — hali tiklanishi mumkin, project cascade bilan yo'qolmasin
+        self.age(self.sprint, 10)
+        self.age(self.project, 120)
+        self.assertFalse(expired_queryset(Project, self.cutoff).exists())
+
+        purge_expired(retention_days=90, sleep=0)
+        self.assertTrue(Project.all_objects.filter(pk=self.project.pk).exists())
+        self.assertTrue(Sprint.all_objects.filter(pk=self.sprint.pk).exists())
+
+    def test_expired_parent_keeps_live_child(self):
+        Project.all_objects.filter(pk=self.project.pk).update(
+            is_deleted=True, deleted_at=timezone.now() - timedelta(days=120),
+        )
+        self.assertFalse(expired_queryset(Project, self.cutoff).exists())
+
+
+class UserViewTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.dev = User.objects.create_user('dev@example.com', 'secret', name='Dev', role=User.Role.DEV)
+
+    def test_me(self):
+        response = self.client.get('/accounts/me/')
+        self.assertEqual(response.data['email'], 'owner@example.com')
+
+        response = self.client.patch('/accounts/me/', {'name': 'Boss'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['name'], 'Boss')
+
+    def test_list_and_create(self):
+        response = self.client.get('/accounts/users/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 2)
+
+        response = self.client.post('/accounts/users/', {
+            'email': 'new@example.com', 'name': 'New', 'role': User.Role.DEV, 'password': 'secret12',
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+
+    def test_detail_update_reset_and_delete(self):
+        url = f'/accounts/users/{self.dev.pk}/'
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.client.patch(url, {'name': 'Developer'}, format='json').status_code, 200)
+        response = self.client.patch(f'{url}reset-password/', {'password': 'secret12'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(User.objects.filter(pk=self.dev.pk).exists())
 
-# Create your tests here.
+    def test_pm_cannot_delete_owner(self):
+        pm = User.objects.create_user('pm@example.com', 'secret', name='PM', role=User.Role.PM)
+        self.authenticate(pm)
+        response = self.client.delete(f'/accounts/users/{self.owner.pk}/')
+        self.assertEqual(response.status_code, 403)
@@ -8,10 +8,11 @@ from rest_framework.exceptions import PermissionDenied
 from .models import User
 from .serializers import UserSerializer, UserCreateSerializer
 from .permissions import IsOwnerOrPM
-from drf_yasg.utils import swagger_auto_schema
+from config.swagger import swagger_auto_schema
 
 class MeView(APIView):
     permission_classes = [IsAuthenticated]
+    query_budget = 2
 
     @swagger_auto_schema(responses={200: UserSerializer()})
     def get(self, request):
@@ -30,6 +31,7 @@ class UserListCreateAPIView(generics.ListCreateAPIView):
 
     queryset = User.objects.all()
     permission_classes = [IsOwnerOrPM]
+    query_budget = {"GET": 2, "POST": 3}
 
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -59,6 +61,7 @@ class UserDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsOwnerOrPM]
+    query_budget = {"GET": 2, "PUT": 4, "PATCH": 4, "DELETE": 5}
 
     def perform_update(self, serializer):
         editor: User = self.request.user
@@ -77,12 +80,13 @@ class UserDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
         instance.delete()
 
 from .serializers import UserPasswordResetSerializer
-from drf_yasg.utils import swagger_auto_schema
+from config.swagger import swagger_auto_schema
 
 class UserPasswordResetAPIView(generics.UpdateAPIView):
     queryset = User.objects.all()
     serializer_class = UserPasswordResetSerializer
     permission_classes = [IsOwnerOrPM]
+    query_budget = 3
 
     @swagger_auto_schema(request_body=UserPasswordResetSerializer)
     def patch(self, request, pk=None):
@@ -1,5 +1,54 @@
 from django.contrib import admin
+from django.db.models import QuerySet
+
 from .models import AuditLog
+from .utils import bulk_hard_delete, count_cascade
+
+
+class BulkHardDeleteAdminMixin:
+    """
+    Admin'dagi o'chirish — haqiqiy (hard) o'chirish, cascade va audit set-based bajariladi.
+    """
+    hard_delete_chunk_size = 500
+    deleted_objects_preview = 100
+
+    def get_hard_delete_queryset(self, queryset):
+        return queryset
+
+    def get_deleted_objects(self, objs, request):
+        # Tasdiqlash sahifasi uchun NestedObjects o'rniga har bir model bo'yicha COUNT
+        if isinstance(objs, QuerySet):
+            queryset = objs
+        else:
+            queryset = self.model.all_objects.filter(pk__in=[obj.pk for obj in objs])
+
+        to_delete = [str(obj) for obj in self.get_hard_delete_queryset(queryset)[:self.deleted_objects_preview]]
+        model_count = {self.model._meta.verbose_name_plural: queryset.count()}
+        perms_needed = set()
+        for related_model, count in count_cascade(queryset).items():
+            opts = related_model._meta
+            model_count[opts.verbose_name_plural] = model_count.get(opts.verbose_name_plural, 0) + count
+            model_admin = self.admin_site._registry.get(related_model)
+            if count and model_admin and not model_admin.has_delete_permission(request):
+                perms_needed.add(opts.verbose_name)
+        if model_count[self.model._meta.verbose_name_plural] > len(to_delete):
+            to_delete.append("…")
+        return to_delete, model_count, perms_needed, []
+
+    def delete_model(self, request, obj):
+        queryset = self.model.all_objects.filter(pk=obj.pk)
+        self.delete_queryset(request, queryset)
+
+    def delete_queryset(self, request, queryset):
+        total, cascaded = bulk_hard_delete(
+            self.get_hard_delete_queryset(queryset),
+            user=request.user,
+            request=request,
+            chunk_size=self.hard_delete_chunk_size,
+        )
+        if cascaded:
+            details = ", ".join(f"{label}: {count}" for label, count in cascaded.items())
+            self.message_user(request, f"{total} ta obyekt bilan birga o'chirildi — {details}")
 
 
 @admin.register(AuditLog)
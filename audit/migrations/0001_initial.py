@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:36
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Mavjud bazalarda audit_auditlog jadvali migratsiyasiz (syncdb) yaratilgan — shu migratsiya
+# jadvalni o'zgartirmaydi: `python manage.py migrate audit --fake-initial` uni "fake" qiladi,
+# indeks esa 0002 da haqiqatan qo'shiladi.
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.CharField(choices=[('CREATE', 'Create'), ('UPDATE', 'Update'), ('SOFT_DELETE', 'Soft Delete'), ('HARD_DELETE', 'Hard Delete')], max_length=20)),
+                ('model', models.CharField(max_length=255)),
+                ('object_id', models.CharField(max_length=64)),
+                ('object_repr', models.CharField(max_length=255)),
+                ('changes', models.JSONField(blank=True, default=dict)),
+                ('path', models.CharField(blank=True, max_length=2048)),
+                ('method', models.CharField(blank=True, max_length=16)),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='audit_logs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['model', 'object_id', '-created_at'], name='audit_object_history_idx'),
+        ),
+    ]
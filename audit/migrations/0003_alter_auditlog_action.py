@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0002_auditlog_audit_object_history_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='auditlog',
+            name='action',
+            field=models.CharField(choices=[('CREATE', 'Create'), ('UPDATE', 'Update'), ('SOFT_DELETE', 'Soft Delete'), ('HARD_DELETE', 'Hard Delete'), ('RESTORE', 'Restore')], max_length=20),
+        ),
+    ]
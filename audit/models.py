@@ -8,6 +8,7 @@ class AuditLog(models.Model):
 		UPDATE = 'UPDATE', 'Update'
 		SOFT_DELETE = 'SOFT_DELETE', 'Soft Delete'
 		HARD_DELETE = 'HARD_DELETE', 'Hard Delete'
+		RESTORE = 'RESTORE', 'Restore'
 
 	user = models.ForeignKey(
 		settings.AUTH_USER_MODEL,
@@ -28,6 +29,10 @@ class AuditLog(models.Model):
 
 	class Meta:
 		ordering = ['-created_at']
+		indexes = [
+			# bitta obyekt tarixi: WHERE model=.. AND object_id=.. ORDER BY created_at DESC
+			models.Index(fields=['model', 'object_id', '-created_at'], name='audit_object_history_idx'),
+		]
 
 	def __str__(self):
 		return f"{self.action} {self.model}:{self.object_id}"
@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# bulk_hard_delete Collector'siz o'chiradi, shuning uchun pre/post_delete yuborilmaydi.
+# Har bir chunk commit bo'lgandan keyin: sender=model, pks=[root pk'lar], cascaded={label: soni}
+post_bulk_hard_delete = Signal()
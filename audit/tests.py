@@ -1,3 +1,171 @@
+from datetime import timedelta
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import User
+from audit.models import AuditLog
+from audit.utils import bulk_hard_delete, rebuild_state, write_audit
+from management.models import Project, Sprint, Task, TaskUpload
+from management.tests import APITestCase
+
+
+class AuditLogViewTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.task = Task.objects.create(sprint=self.sprint, title='Audited')
+        write_audit(AuditLog.Action.CREATE, self.task, user=self.owner)
+
+    def test_list_filters_by_model(self):
+        write_audit(AuditLog.Action.CREATE, self.project, user=self.owner)
+        response = self.client.get('/log/', {'model': 'management.Task'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([log['object_id'] for log in response.data], [str(self.task.pk)])
+
+    def test_history_is_owner_only(self):
+        url = f'/log/management.Task/{self.task.pk}/history/'
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        dev = User.objects.create_user('dev@example.com', 'secret', name='Dev', role=User.Role.DEV)
+        self.authenticate(dev)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+
+class AuditHistoryTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.dev = User.objects.create_user('dev@example.com', 'secret', name='Dev', role=User.Role.DEV)
+        response = self.client.post('/management/tasks/', {
+            'sprint': self.sprint.pk, 'title': 'Audited', 'description': 'First', 'assignees': [self.dev.pk],
+        })
+        self.assertEqual(response.status_code, 201, response.content)
+        self.task_id = response.data['id']
+        self.url = f'/log/management.Task/{self.task_id}/history/'
+
+    def backdate(self, days):
+        """Shu paytgacha yozilgan qatorlarni `days` kun orqaga suradi."""
+        for log in AuditLog.objects.filter(model='management.Task', object_id=str(self.task_id)):
+            AuditLog.objects.filter(pk=log.pk).update(created_at=log.created_at - timedelta(days=days))
+
+    def test_create_row_stores_all_fields(self):
+        state, versions = rebuild_state('management.Task', self.task_id)
+        self.assertEqual(versions, 1)
+        self.assertEqual(state['title'], 'Audited')
+        self.assertEqual(state['description'], 'First')
+        self.assertEqual(state['sprint'], self.sprint.pk)
+        self.assertEqual(state['assignees'], [self.dev.pk])
+        self.assertEqual(state['status'], Task.Status.TO_DO)
+
+    def test_state_at_keeps_fields_set_on_create(self):
+        self.backdate(2)
+        response = self.client.patch(f'/management/tasks/{self.task_id}/', {'title': 'Renamed'}, format='multipart')
+        self.assertEqual(response.status_code, 200, response.content)
+
+        response = self.client.get(self.url, {'at': (timezone.now() - timedelta(days=1)).isoformat()})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['versions'], 1)
+        self.assertEqual(response.data['state']['title'], 'Audited')
+
+        response = self.client.get(self.url, {'at': timezone.now().isoformat()})
+        self.assertEqual(response.data['versions'], 2)
+        self.assertEqual(response.data['state']['title'], 'Renamed')
+        # keyingi diff'da yo'q maydon CREATE snapshot'idan
+        self.assertEqual(response.data['state']['description'], 'First')
+
+    def test_invalid_at_is_rejected(self):
+        response = self.client.get(self.url, {'at': 'yesterday'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('at', response.data)
+
+    def test_cursor_pages_cover_history_newest_first(self):
+        task = Task.objects.get(pk=self.task_id)
+        for i in range(4):
+            write_audit(AuditLog.Action.UPDATE, task, user=self.owner, changes={'title': f'v{i}'})
+
+        ids, url, params = [], self.url, {'page_size': 2}
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['results']), 2)
+            ids += [log['id'] for log in response.data['results']]
+            url, params = response.data['next'], None
+
+        expected = AuditLog.objects.filter(model='management.Task', object_id=str(self.task_id))
+        self.assertEqual(ids, list(expected.order_by('-created_at').values_list('pk', flat=True)))
+
+
+class BulkHardDeleteTests(TestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser('admin@example.com', 'secret', name='Admin')
+        self.dev = User.objects.create_user('dev@example.com', 'secret', name='Dev', role=User.Role.DEV)
+        self.project = Project.objects.create(title='Doomed', pm=self.admin)
+        self.keep = Project.objects.create(title='Kept', pm=self.admin)
+        self.tasks = []
+        for project in (self.project, self.keep):
+            for i in range(2):
+                sprint = Sprint.objects.create(project=project, name=f'S{i}', start_date=timezone.now())
+                task = Task.objects.create(sprint=sprint, title=f'T{i}')
+                task.assignees.add(self.admin, self.dev)
+                TaskUpload.objects.create(task=task, user=self.dev, filename='a.jpg', size=1)
+                self.tasks.append(task)
+        # soft-delete qilinganlar ham ketadi
+        self.tasks[0].soft_delete()
+
+    def assert_no_orphans(self):
+        self.assertFalse(Sprint.all_objects.exclude(project_id__in=Project.all_objects.values('pk')).exists())
+        self.assertFalse(Task.all_objects.exclude(sprint_id__in=Sprint.all_objects.values('pk')).exists())
+        self.assertFalse(Task.assignees.through.objects.exclude(task_id__in=Task.all_objects.values('pk')).exists())
+        self.assertFalse(TaskUpload.objects.exclude(task_id__in=Task.all_objects.values('pk')).exists())
+        # boshqa project tegilmagan
+        self.assertEqual(Task.all_objects.filter(sprint__project=self.keep).count(), 2)
+        self.assertEqual(Task.assignees.through.objects.count(), 4)
+
+    def test_project_with_children_and_m2m_rows(self):
+        total, cascaded = bulk_hard_delete(Project.all_objects.filter(pk=self.project.pk), user=self.admin)
+
+        self.assertEqual(total, 1)
+        self.assertEqual(cascaded, {'management.Sprint': 2, 'management.Task': 2, 'management.TaskUpload': 2})
+        self.assertFalse(Project.all_objects.filter(pk=self.project.pk).exists())
+        self.assert_no_orphans()
+        # root uchun bitta, cascade bo'lgan har bir model uchun bitta (M2M jadvali — yo'q)
+        logs = AuditLog.objects.filter(action=AuditLog.Action.HARD_DELETE)
+        self.assertEqual(logs.count(), 4)
+        self.assertEqual(logs.get(model='management.Project').object_id, str(self.project.pk))
+        self.assertEqual(logs.get(model='management.Task').changes['deleted_count'], 2)
+
+    def test_summary_only_writes_one_row_per_chunk(self):
+        bulk_hard_delete(Project.all_objects.all(), user=self.admin, chunk_size=1, summary_only=True)
+        self.assertEqual(AuditLog.objects.filter(object_id='batch').count(), 2)
+        self.assertFalse(Task.all_objects.exists())
+        self.assertFalse(Task.assignees.through.objects.exists())
+
+    def test_user_delete_nulls_set_null_references(self):
+        write_audit(AuditLog.Action.UPDATE, self.keep, user=self.dev)
+        bulk_hard_delete(User.all_objects.filter(pk=self.dev.pk), user=self.admin)
+
+        self.assertEqual(Task.assignees.through.objects.count(), 4)
+        self.assertFalse(TaskUpload.objects.filter(user__isnull=False).exists())
+        self.assertFalse(AuditLog.objects.filter(user_id=self.dev.pk).exists())
+
+    def test_admin_confirmation_counts_without_loading_children(self):
+        self.client.force_login(self.admin)
+        url = f'/admin/management/project/{self.project.pk}/delete/'
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(dict(response.context['model_count']), {'projects': 1, 'sprints': 2, 'tasks': 2, 'task uploads': 2})
+        child_reads = [
+            query['sql'] for query in queries
+            if '"management_task"' in query['sql'] and 'COUNT(' not in query['sql']
+        ]
+        self.assertEqual(child_reads, [])
 
-# Create your tests here.
+        response = self.client.post(url, {'post': 'yes'})
+        self.assertEqual(response.status_code, 302)
+        self.assert_no_orphans()
+        self.assertEqual(AuditLog.objects.filter(action=AuditLog.Action.HARD_DELETE, user=self.admin).count(), 4)
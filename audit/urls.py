@@ -1,6 +1,7 @@
 from django.urls import path
-from .views import AuditLogListAPIView
+from .views import AuditLogListAPIView, AuditLogHistoryAPIView
 
 urlpatterns = [
     path('', AuditLogListAPIView.as_view(), name='audit-logs'),
+    path('<str:model>/<str:object_id>/history/', AuditLogHistoryAPIView.as_view(), name='audit-object-history'),
 ]
@@ -1,17 +1,238 @@
+import json
+import logging
+
+from django.core.files import File
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.db.models.deletion import get_candidate_relations_to_delete
+
 from .models import AuditLog
+from .signals import post_bulk_hard_delete
 
+logger = logging.getLogger(__name__)
+
+
+def model_label(model):
+    return f"{model._meta.app_label}.{model.__name__}"
+
+
+def _jsonable_changes(changes):
+    # request.data (QueryDict, yuklangan fayllar) JSONField'ga to'g'ridan-to'g'ri sig'maydi
+    if hasattr(changes, 'lists'):
+        changes = {key: values[0] if len(values) == 1 else values for key, values in changes.lists()}
+    return {
+        key: value.name if isinstance(value, File) else value
+        for key, value in (changes or {}).items()
+    }
+
+
+# CREATE snapshot'iga yozilmaydigan maydonlar
+SNAPSHOT_EXCLUDE = {'password'}
 
-def write_audit(action, instance, user=None, changes=None, request=None):
 
+def snapshot(instance):
+    """
+    Obyektning barcha maydonlari {field.name: qiymat} — FK uchun pk, M2M uchun pk'lar ro'yxati, fayl uchun nom.
+    rebuild_state CREATE qatoridan boshlab tiklaydi, shuning uchun keyingi diff'larda yo'q maydonlar ham shu yerda.
+    """
+    opts = instance._meta
+    values = {}
+    for field in opts.concrete_fields:
+        if field.primary_key or field.name in SNAPSHOT_EXCLUDE:
+            continue
+        value = field.value_from_object(instance)
+        values[field.name] = value.name if isinstance(value, File) else value
+    for field in opts.many_to_many:
+        values[field.name] = sorted(obj.pk for obj in field.value_from_object(instance))
+    # datetime/UUID/Decimal -> JSONField'ga sig'adigan ko'rinish
+    return json.loads(json.dumps(values, cls=DjangoJSONEncoder))
+
+
+def write_audit(action, instance, user=None, changes=None, request=None):
+    if action == AuditLog.Action.CREATE:
+        changes = {**snapshot(instance), **_jsonable_changes(changes)}
 
     AuditLog.objects.create(
         user=user,
         action=action,
-        model=f"{instance._meta.app_label}.{instance.__class__.__name__}",
+        model=model_label(instance.__class__),
         object_id=str(instance.pk),
         object_repr=str(instance),
-        changes=changes or {},
+        changes=_jsonable_changes(changes),
         path=request.path if request else "",
         method=request.method if request else "",
         ip_address=request.META.get("REMOTE_ADDR") if request else None,
     )
+
+
+def _fold_value(value):
+    # {"old": .., "new": ..} ko'rinishidagi diff yoki oddiy qiymat (request.data)
+    if isinstance(value, dict) and 'new' in value:
+        return value['new']
+    if isinstance(value, list) and len(value) == 1:
+        return value[0]
+    return value
+
+
+def rebuild_state(model, object_id, at=None):
+    """
+    Obyektning `at` vaqtidagi holati: CREATE snapshot'idan boshlab keyingi diff'lar ketma-ket qo'llanadi.
+    Faqat shu obyektga tegishli qatorlar o'qiladi (model, object_id, created_at indeksi).
+    """
+    qs = AuditLog.objects.filter(model=model, object_id=str(object_id))
+    if at is not None:
+        qs = qs.filter(created_at__lte=at)
+
+    state = {}
+    versions = 0
+    for action, changes in qs.order_by('created_at').values_list('action', 'changes').iterator():
+        versions += 1
+        if action == AuditLog.Action.CREATE:
+            # to'liq snapshot (write_audit) — diff emas, qiymatlar o'zgarishsiz
+            state = dict(changes) if isinstance(changes, dict) else {}
+        elif isinstance(changes, dict):
+            for field, value in changes.items():
+                state[field] = _fold_value(value)
+        if action in (AuditLog.Action.SOFT_DELETE, AuditLog.Action.HARD_DELETE):
+            state['deleted'] = True
+
+    return state, versions
+
+
+def _collect_cascade(model, pk_qs, deletes, updates, path=()):
+    """
+    `pk_qs` ga bog'langan qatorlarni subquery'lar orqali yig'adi (obyektlar yuklanmaydi).
+    `deletes` ga bolalar ota-onadan oldin tushadi; SET_NULL bog'lanishlar `updates` ga.
+    """
+    for rel in get_candidate_relations_to_delete(model._meta):
+        related_model = rel.related_model
+        on_delete = rel.on_delete
+        qs = related_model._base_manager.filter(**{f"{rel.field.name}__in": pk_qs})
+
+        if on_delete is models.CASCADE:
+            if related_model in path:
+                raise ValueError(f"Cyclic cascade through {model_label(related_model)} is not supported.")
+            _collect_cascade(
+                related_model, qs.values("pk"), deletes, updates, path + (model,)
+            )
+            deletes.append((related_model, qs))
+        elif on_delete is models.SET_NULL:
+            updates.append((qs, rel.field.name))
+        elif on_delete is not models.DO_NOTHING:
+            raise ValueError(
+                f"{model_label(related_model)}.{rel.field.name}: "
+                f"on_delete={on_delete.__name__} is not supported by bulk_hard_delete."
+            )
+
+
+def count_cascade(queryset):
+    """
+    Queryset o'chirilsa cascade bo'ladigan qatorlar soni: {model: count}, har bir model uchun bitta COUNT.
+    """
+    deletes, updates = [], []
+    _collect_cascade(queryset.model, queryset.order_by().values("pk"), deletes, updates)
+    counts = {}
+    for related_model, qs in deletes:
+        if related_model._meta.auto_created:
+            continue
+        counts[related_model] = counts.get(related_model, 0) + qs.count()
+    return counts
+
+
+def bulk_hard_delete(queryset, user=None, request=None, chunk_size=500, progress=None, summary_only=False):
+    """
+    Queryset'dagi obyektlarni cascade bilan birga set-based so'rovlar orqali butunlay o'chiradi.
+
+    Har bir chunk alohida tranzaksiyada: har bir root obyekt uchun bitta HARD_DELETE audit
+    qatori va cascade bo'lgan har bir model uchun bitta summary qatori `bulk_create` qilinadi.
+    `summary_only=True` bo'lsa, chunk uchun faqat bitta umumiy audit qatori yoziladi.
+    Django Collector ishlatilmaydi, shuning uchun pre/post_delete signallari yuborilmaydi —
+    o'rniga har bir chunk'dan keyin post_bulk_hard_delete (audit/signals.py).
+    `progress(done, total)` har bir chunkdan keyin chaqiriladi.
+    """
+    model = queryset.model
+    label = model_label(model)
+    pks = list(queryset.order_by().values_list("pk", flat=True).distinct())
+    total = len(pks)
+    done = 0
+    cascaded = {}
+
+    path = request.path if request else ""
+    method = request.method if request else ""
+    ip_address = request.META.get("REMOTE_ADDR") if request else None
+
+    for start in range(0, total, chunk_size):
+        chunk = pks[start:start + chunk_size]
+        deletes, updates = [], []
+        _collect_cascade(model, chunk, deletes, updates)
+
+        with transaction.atomic():
+            logs = [] if summary_only else [
+                AuditLog(
+                    user=user,
+                    action=AuditLog.Action.HARD_DELETE,
+                    model=label,
+                    object_id=str(obj.pk),
+                    object_repr=str(obj)[:255],
+                    changes={"deleted": {"old": obj.is_deleted, "new": True}},
+                    path=path,
+                    method=method,
+                    ip_address=ip_address,
+                )
+                for obj in queryset.filter(pk__in=chunk)
+            ]
+
+            for qs, field_name in updates:
+                qs.update(**{field_name: None})
+
+            counts = {}
+            for related_model, qs in deletes:
+                deleted = qs._raw_delete(qs.db)
+                if deleted and not related_model._meta.auto_created:
+                    key = model_label(related_model)
+                    counts[key] = counts.get(key, 0) + deleted
+            root_qs = model._base_manager.filter(pk__in=chunk)
+            root_deleted = root_qs._raw_delete(root_qs.db)
+
+            if summary_only:
+                logs.append(AuditLog(
+                    user=user,
+                    action=AuditLog.Action.HARD_DELETE,
+                    model=label,
+                    object_id="batch",
+                    object_repr=f"{root_deleted} x {label}",
+                    changes={"root_ids": chunk, "deleted_count": root_deleted, "cascade": counts},
+                    path=path,
+                    method=method,
+                    ip_address=ip_address,
+                ))
+            else:
+                logs += [
+                    AuditLog(
+                        user=user,
+                        action=AuditLog.Action.HARD_DELETE,
+                        model=key,
+                        object_id="cascade",
+                        object_repr=f"{count} x {key} ({label} cascade)",
+                        changes={"cascade_from": label, "root_ids": chunk, "deleted_count": count},
+                        path=path,
+                        method=method,
+                        ip_address=ip_address,
+                    )
+                    for key, count in counts.items()
+                ]
+            if user is not None and user.pk in chunk and model is user.__class__:
+                # o'zini o'chirgan userning FK'si endi mavjud emas
+                for log in logs:
+                    log.user = None
+            AuditLog.objects.bulk_create(logs)
+
+        post_bulk_hard_delete.send(sender=model, pks=chunk, cascaded=counts)
+        for key, count in counts.items():
+            cascaded[key] = cascaded.get(key, 0) + count
+        done += len(chunk)
+        logger.info("bulk_hard_delete %s: %d/%d deleted, cascade=%s", label, done, total, counts)
+        if progress is not None:
+            progress(done, total)
+
+    return total, cascaded
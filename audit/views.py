@@ -1,17 +1,23 @@
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
 from rest_framework import generics
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from drf_yasg.utils import swagger_auto_schema
-from drf_yasg import openapi
+from config.swagger import openapi, swagger_auto_schema
 
 from .models import AuditLog
 from .serializers import AuditLogSerializer
+from .utils import rebuild_state
 from accounts.permissions import IsOwner
 
 class AuditLogListAPIView(generics.ListAPIView):
 
     serializer_class = AuditLogSerializer
     permission_classes = [IsAuthenticated, IsOwner]
+    query_budget = 2
 
     def get_queryset(self):
         qs = AuditLog.objects.select_related("user")
@@ -19,6 +25,7 @@ class AuditLogListAPIView(generics.ListAPIView):
         action = self.request.GET.get("action")
         model = self.request.GET.get("model")
         user_id = self.request.GET.get("user_id")
+        object_id = self.request.GET.get("object_id")
 
         if action:
             qs = qs.filter(action=action)
@@ -26,6 +33,8 @@ class AuditLogListAPIView(generics.ListAPIView):
             qs = qs.filter(model=model)
         if user_id:
             qs = qs.filter(user_id=user_id)
+        if object_id:
+            qs = qs.filter(object_id=object_id)
 
         return qs.order_by("-created_at")
 
@@ -37,7 +46,7 @@ class AuditLogListAPIView(generics.ListAPIView):
                 "action",
                 openapi.IN_QUERY,
                 type=openapi.TYPE_STRING,
-                description="Action: CREATE / UPDATE / SOFT_DELETE / HARD_DELETE"
+                description="Action: CREATE / UPDATE / SOFT_DELETE / HARD_DELETE / RESTORE"
             ),
             openapi.Parameter(
                 "model",
@@ -51,9 +60,76 @@ class AuditLogListAPIView(generics.ListAPIView):
                 type=openapi.TYPE_INTEGER,
                 description="Logni qilgan user ID"
             ),
+            openapi.Parameter(
+                "object_id",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description="Obyekt ID (model bilan birga ishlatiladi)"
+            ),
         ]
     )
     def get(self, request, *args, **kwargs):
         queryset = self.get_queryset()  # 👈 MUHIM!
         serializer = AuditLogSerializer(queryset, many=True)
         return Response(serializer.data)
+
+
+class AuditLogHistoryPagination(CursorPagination):
+    # created_at bo'yicha keyset pagination — (model, object_id, created_at) indeksidan o'qiydi
+    ordering = "-created_at"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+
+class AuditLogHistoryAPIView(generics.ListAPIView):
+
+    serializer_class = AuditLogSerializer
+    permission_classes = [IsAuthenticated, IsOwner]
+    pagination_class = AuditLogHistoryPagination
+    query_budget = 2
+
+    def get_queryset(self):
+        return (
+            AuditLog.objects
+            .filter(model=self.kwargs["model"], object_id=self.kwargs["object_id"])
+            .select_related("user")
+        )
+
+    def get_at(self):
+        raw = self.request.GET.get("at")
+        if not raw:
+            return None
+        at = parse_datetime(raw)
+        if at is None:
+            raise ValidationError({"at": "ISO 8601 formatdagi vaqt kiriting."})
+        if timezone.is_naive(at):
+            at = timezone.make_aware(at)
+        return at
+
+    @swagger_auto_schema(
+        tags=["Audit"],
+        operation_summary="Bitta obyekt tarixi (faqat OWNER)",
+        manual_parameters=[
+            openapi.Parameter(
+                "at",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                format=openapi.FORMAT_DATETIME,
+                description="Berilsa, obyektning shu vaqtdagi holati qaytariladi"
+            ),
+        ]
+    )
+    def get(self, request, *args, **kwargs):
+        at = self.get_at()
+        if at is None:
+            return self.list(request, *args, **kwargs)
+
+        state, versions = rebuild_state(self.kwargs["model"], self.kwargs["object_id"], at)
+        return Response({
+            "model": self.kwargs["model"],
+            "object_id": self.kwargs["object_id"],
+            "at": at,
+            "versions": versions,
+            "state": state,
+        })
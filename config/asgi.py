@@ -10,7 +10,13 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 import os
 
 from django.core.asgi import get_asgi_application
+from django.urls import get_resolver
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# settings: ASGI'da thread'ga bog'langan persistent ulanishlar ishlatilmaydi (pool ishlatiladi)
+os.environ.setdefault('DJANGO_ASGI', '1')
 
 application = get_asgi_application()
+
+# URLconf va view modullari birinchi so'rovdan oldin (config/wsgi.py'dagi kabi)
+get_resolver().url_patterns
@@ -0,0 +1,212 @@
+"""
+Javobni siqish: klientning Accept-Encoding'i bo'yicha br / zstd / gzip.
+
+- brotli va zstandard — ixtiyoriy paketlar (pip install brotli zstandard); o'rnatilmagan bo'lsa
+  shu kodek taklif qilinmaydi, gzip (stdlib) har doim bor.
+- Teng q qiymatlarda server tartibi (COMPRESSION_ENCODINGS) hal qiladi.
+- Faqat matnli turlar (text/*, JSON, XML, JS, SVG); rasm, arxiv va Content-Encoding'i bor javoblar
+  (masalan WhiteNoise'ning .br/.gz fayllari) o'zgarmaydi. 204/206/304 va no-transform ham.
+- Oddiy javob COMPRESSION_MIN_SIZE'dan kichik bo'lsa yoki siqilgani kattaroq chiqsa — siqilmaydi.
+- Oqimli javob bo'lakma-bo'lak siqiladi va har bo'lakdan keyin flush: klient ma'lumotni kechikmasdan oladi.
+- Darajalar (COMPRESSION_LEVELS) — CPU va bayt nisbati bo'yicha tanlangan:
+  python manage.py benchmark_compression haqiqiy javoblarda solishtiradi.
+"""
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSIBLE_TYPES = {
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'application/x-ndjson',
+    'image/svg+xml',
+}
+SKIP_STATUSES = (204, 206, 304)
+
+
+class GzipStream:
+    name = 'gzip'
+
+    def __init__(self, level):
+        # wbits 16+ — zlib emas, gzip sarlavhasi
+        self.obj = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data):
+        return self.obj.compress(data)
+
+    def flush(self):
+        return self.obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self.obj.flush()
+
+
+class BrotliStream:
+    name = 'br'
+
+    def __init__(self, level):
+        self.obj = brotli.Compressor(quality=level, mode=brotli.MODE_TEXT)
+
+    def compress(self, data):
+        return self.obj.process(data)
+
+    def flush(self):
+        return self.obj.flush()
+
+    def finish(self):
+        return self.obj.finish()
+
+
+class ZstdStream:
+    name = 'zstd'
+
+    def __init__(self, level):
+        self.obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self.obj.compress(data)
+
+    def flush(self):
+        return self.obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self.obj.flush()
+
+
+CODECS = {'gzip': GzipStream}
+if brotli is not None:
+    CODECS['br'] = BrotliStream
+if zstandard is not None:
+    CODECS['zstd'] = ZstdStream
+
+
+def available_encodings():
+    """COMPRESSION_ENCODINGS tartibida, o'rnatilgan kodeklar."""
+    return [name for name in settings.COMPRESSION_ENCODINGS if name in CODECS]
+
+
+def compress(name, data, level=None):
+    """Bir martalik siqish (butun javob yoki benchmark uchun)."""
+    stream = CODECS[name](settings.COMPRESSION_LEVELS[name] if level is None else level)
+    return stream.compress(data) + stream.finish()
+
+
+def parse_accept_encoding(header):
+    """'gzip, br;q=0.8, *;q=0' -> {'gzip': 1.0, 'br': 0.8, '*': 0.0}"""
+    result = {}
+    for item in header.split(','):
+        name, _, params = item.partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        result[name] = q
+    return result
+
+
+def negotiate(header, encodings):
+    """`encodings` (server tartibida) ichidan klient eng yuqori q bergan kodek yoki None."""
+    if not header:
+        return None
+    accepted = parse_accept_encoding(header)
+    default = accepted.get('*', 0.0)
+    best, best_q = None, 0.0
+    for name in encodings:
+        q = accepted.get(name, default)
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def is_compressible(content_type):
+    mime = content_type.split(';', 1)[0].strip().lower()
+    return mime.startswith('text/') or mime in COMPRESSIBLE_TYPES or mime.endswith(('+json', '+xml'))
+
+
+def compress_stream(stream, chunks):
+    for chunk in chunks:
+        data = stream.compress(chunk) + stream.flush()
+        if data:
+            yield data
+    yield stream.finish()
+
+
+async def acompress_stream(stream, chunks):
+    async for chunk in chunks:
+        data = stream.compress(chunk) + stream.flush()
+        if data:
+            yield data
+    yield stream.finish()
+
+
+class CompressionMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not settings.COMPRESSION_ENABLED or not self.should_compress(request, response):
+            return response
+
+        # javob Accept-Encoding'ga bog'liq — qaysi kodek tanlanishidan qat'i nazar
+        patch_vary_headers(response, ('Accept-Encoding',))
+        name = negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''), available_encodings())
+        if name is None:
+            return response
+
+        stream = CODECS[name](settings.COMPRESSION_LEVELS[name])
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_stream(stream, response.streaming_content)
+            else:
+                response.streaming_content = compress_stream(stream, response.streaming_content)
+            del response.headers['Content-Length']
+        else:
+            content = stream.compress(response.content) + stream.finish()
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response.headers['Content-Length'] = str(len(content))
+
+        # baytlar boshqa — kuchli ETag endi to'g'ri emas
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = name
+        return response
+
+    def should_compress(self, request, response):
+        if response.status_code in SKIP_STATUSES or response.has_header('Content-Encoding'):
+            return False
+        if 'no-transform' in response.get('Cache-Control', ''):
+            return False
+        # BREACH: token qaytaradigan endpoint'lar siqilmaydi
+        if request.path.startswith(settings.COMPRESSION_EXCLUDE_PATHS):
+            return False
+        if not is_compressible(response.get('Content-Type', '')):
+            return False
+        if response.streaming:
+            # FileResponse hajmini oldindan biladi
+            length = response.get('Content-Length')
+            return length is None or int(length) >= settings.COMPRESSION_MIN_SIZE
+        return len(response.content) >= settings.COMPRESSION_MIN_SIZE
@@ -0,0 +1,152 @@
+"""
+Primary/replica routing.
+
+- Yozuvlar (va migratsiyalar) har doim `default` (primary) bazaga.
+- O'qishlar faqat HTTP so'rov ichida, GET/HEAD/OPTIONS bo'lsa replica'ga (DATABASE_REPLICAS).
+  So'rovdan tashqari (management command, fon thread'lari) hamma narsa primary'da.
+- Read-your-writes: muvaffaqiyatli yozuvdan keyin DB_REPLICA_STICKY_SECONDS davomida
+  shu foydalanuvchi (cache) va shu klient (cookie) o'qishlari primary'da qoladi.
+- Har doim primary'dan o'qishi kerak bo'lgan view'lar — PrimaryOnlyMixin / use_primary().
+"""
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.functional import SimpleLazyObject
+
+STICKY_CACHE_KEY = "db:primary-until:{}"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class RoutingState:
+    __slots__ = ("primary", "request", "user_checked")
+
+    def __init__(self, primary, request=None):
+        self.primary = primary
+        self.request = request
+        self.user_checked = False
+
+
+# None — so'rovdan tashqari: primary
+_state = ContextVar("db_routing_state", default=None)
+
+
+def get_replicas():
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+@contextmanager
+def use_primary():
+    """Blok ichidagi barcha o'qishlar primary'dan."""
+    token = _state.set(RoutingState(primary=True))
+    try:
+        yield
+    finally:
+        _state.reset(token)
+
+
+def _user_is_sticky(state):
+    """
+    So'rov foydalanuvchisi yaqinda yozgan bo'lsa — True.
+    Foydalanuvchi DRF autentifikatsiyasidan keyingina ma'lum (request.user almashtiriladi);
+    session'ning lazy user'i bu yerda hisoblanmaydi — bu o'zi DB so'rovi bo'lardi.
+    """
+    user = state.request.__dict__.get("user")
+    if user is None or isinstance(user, SimpleLazyObject) or not user.is_authenticated:
+        return False
+
+    state.user_checked = True
+    until = cache.get(STICKY_CACHE_KEY.format(user.pk))
+    if until is not None and until > time.time():
+        state.primary = True
+    return state.primary
+
+
+def stick_to_primary(request, response):
+    """Yozuvdan keyin: keyingi o'qishlar oynasi davomida primary'dan."""
+    window = settings.DB_REPLICA_STICKY_SECONDS
+    until = time.time() + window
+
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        cache.set(STICKY_CACHE_KEY.format(user.pk), until, window)
+
+    response.set_cookie(
+        settings.DB_REPLICA_STICKY_COOKIE,
+        str(int(until)),
+        max_age=window,
+        httponly=True,
+        samesite="Lax",
+    )
+
+
+class PrimaryReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        replicas = get_replicas()
+        if not replicas:
+            return DEFAULT_DB_ALIAS
+
+        state = _state.get()
+        if state is None or state.primary:
+            return DEFAULT_DB_ALIAS
+        # tranzaksiya ichida o'qish — o'sha tranzaksiya yozganini ko'rishi kerak
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        if not state.user_checked and _user_is_sticky(state):
+            return DEFAULT_DB_ALIAS
+
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replica'lar primary'ning nusxasi — bir xil ma'lumot
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    """
+    So'rov uchun routing holatini o'rnatadi va yozuvdan keyin stickiness'ni yozib qo'yadi.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        write = request.method not in SAFE_METHODS
+        primary = write or self.cookie_is_sticky(request)
+
+        token = _state.set(RoutingState(primary=primary, request=request))
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+
+        if write and response.status_code < 400:
+            stick_to_primary(request, response)
+        return response
+
+    @staticmethod
+    def cookie_is_sticky(request):
+        try:
+            until = int(request.COOKIES.get(settings.DB_REPLICA_STICKY_COOKIE, 0))
+        except ValueError:
+            return False
+        return until > time.time()
+
+
+class PrimaryOnlyMixin:
+    """View'ning barcha o'qishlari (GET ham) primary'dan."""
+
+    def dispatch(self, request, *args, **kwargs):
+        with use_primary():
+            return super().dispatch(request, *args, **kwargs)
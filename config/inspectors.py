@@ -0,0 +1,36 @@
+"""
+drf_yasg inspector'lari (SWAGGER_SETTINGS['DEFAULT_FIELD_INSPECTORS']).
+
+config.schema'dan alohida: drf_yasg sozlamalari shu modulni config.schema import qilinayotgan
+paytda yuklaydi.
+"""
+from django.db import connection
+from django.db.backends.base.operations import BaseDatabaseOperations
+from drf_yasg import openapi
+from drf_yasg.inspectors import FieldInspector
+from drf_yasg.inspectors.field import get_model_field, get_parent_serializer
+
+
+class PinnedIntegerRangeFilter(FieldInspector):
+    """
+    Model integer maydonlarining min/max validatorlari baza backend'idan olinadi (SQLite'da hammasi
+    64-bit). Spec qaysi bazada yig'ilganidan qat'i nazar bir xil bo'lishi uchun backend chegarasi
+    Django'ning umumiy chegarasiga (PostgreSQL bilan bir xil) almashtiriladi.
+    """
+
+    def process_result(self, result, method_name, obj, **kwargs):
+        if not isinstance(result, openapi.Schema) or result.get('type') != openapi.TYPE_INTEGER:
+            return result
+        serializer = get_parent_serializer(obj)
+        model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+        model_field = get_model_field(model, obj.source) if model is not None else None
+        internal_type = model_field.get_internal_type() if model_field is not None else None
+        if internal_type not in BaseDatabaseOperations.integer_field_ranges:
+            return result
+
+        backend = connection.ops.integer_field_range(internal_type)
+        pinned = BaseDatabaseOperations.integer_field_ranges[internal_type]
+        for key, current, value in zip(('minimum', 'maximum'), backend, pinned):
+            if current is not None and result.get(key) == current:
+                result[key] = value
+        return result
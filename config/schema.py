@@ -0,0 +1,109 @@
+"""
+OpenAPI spec: drf_yasg generatsiyasi va oldindan yig'ilgan fayldan berish.
+
+Generatsiya har bir view/serializer'ni introspect qiladi (yuzlab ms CPU), shuning uchun spec
+deploy paytida `python manage.py build_schema` bilan OPENAPI_SCHEMA_FILE ga yoziladi va
+SchemaView uni ETag bilan beradi. DEBUG yoqilgan yoki fayl yo'q bo'lsa — jonli generatsiya.
+"""
+import hashlib
+import os
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson
+from drf_yasg.generators import OpenAPISchemaGenerator
+from drf_yasg.views import get_schema_view
+from rest_framework import permissions
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from .swagger import apply_swagger_auto_schema
+
+API_INFO = openapi.Info(
+    title="BOTM API",
+    default_version="v1",
+    description="BizIT Office Task Manager (Eurosoft) uchun backend API hujjatlari",
+    terms_of_service="https://www.google.com/policies/terms/",
+    contact=openapi.Contact(email="support@bizit.uz"),
+    license=openapi.License(name="BSD License"),
+)
+
+# faylda saqlanadigan formatlar (YAML so'ralsa — jonli generatsiya)
+FILE_FORMATS = ('openapi', 'json')
+
+_loaded = {}
+
+
+class LazyOpenAPISchemaGenerator(OpenAPISchemaGenerator):
+    """View'lardagi config.swagger dekoratorlarini drf_yasg'ga o'tkazib, keyin o'qiydi."""
+
+    def get_overrides(self, view, method):
+        action = getattr(view, 'action', method.lower())
+        apply_swagger_auto_schema(getattr(view, action, None))
+        return super().get_overrides(view, method)
+
+
+def generate_schema():
+    """
+    Spec'ni anonim so'rov bilan generatsiya qiladi (view'lar self.request'ga tayanadi).
+    url='' — host/schemes yozilmaydi, UI spec'ni o'zi turgan host'ga yo'naltiradi.
+    """
+    request = APIView().initialize_request(APIRequestFactory().get('/swagger/', {'format': 'openapi'}))
+    schema = LazyOpenAPISchemaGenerator(API_INFO, url='').get_schema(request=request, public=True)
+    return OpenAPICodecJson(validators=[], pretty=True).encode(schema)
+
+
+def load_schema_file(path=None):
+    """(body, etag) yoki fayl bo'lmasa None. Fayl o'zgarmaguncha (mtime/size) xotiradan."""
+    path = os.fspath(path or settings.OPENAPI_SCHEMA_FILE)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    if _loaded.get('key') != key:
+        with open(path, 'rb') as fh:
+            body = fh.read()
+        _loaded.update(key=key, body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+    return _loaded['body'], _loaded['etag']
+
+
+def etag_matches(header, etag):
+    """
+    If-None-Match — zaif taqqoslash (RFC 9110, 13.1.2): W/ prefiksi hisobga olinmaydi. Siqilgan javob
+    ETag'i W/ bilan ketadi (config.compression), klient keyingi so'rovda shuni yuboradi.
+    """
+    tags = parse_etags(header)
+    return '*' in tags or etag.removeprefix('W/') in {tag.removeprefix('W/') for tag in tags}
+
+
+BaseSchemaView = get_schema_view(
+    API_INFO,
+    public=True,
+    generator_class=LazyOpenAPISchemaGenerator,
+    permission_classes=(permissions.AllowAny,),
+)
+
+
+class SchemaView(BaseSchemaView):
+
+    def get(self, request, version="", format=None):
+        renderer = request.accepted_renderer
+        stored = None
+        if renderer.format in FILE_FORMATS and not settings.DEBUG:
+            stored = load_schema_file()
+        if stored is None:
+            return super().get(request, version=version, format=format)
+
+        body, etag = stored
+        if etag_matches(request.headers.get('If-None-Match', ''), etag):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(body, content_type=renderer.media_type)
+        response['ETag'] = etag
+        # brauzer har safar ETag bilan tekshiradi — deploy'dan keyin eski spec qolmaydi
+        response['Cache-Control'] = 'no-cache'
+        return response
+
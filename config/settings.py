@@ -10,7 +10,10 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import copy
 import os
+import sys
+from datetime import timedelta
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -67,17 +70,23 @@ INSTALLED_APPS += [
     'accounts',
     'management',
     'audit',
+    'monitoring',
 ]
 
 MIDDLEWARE = [
+    'monitoring.metrics.MetricsMiddleware',
+    'monitoring.shedding.LoadSheddingMiddleware',
+    'config.compression.CompressionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'monitoring.queries.QueryBudgetMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # << qo'shdik
 
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'config.db_router.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -106,17 +115,84 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Ulanish rejimi (DB_CONNECTION_MODE):
+#   pool       — har bir worker jarayonida chegaralangan psycopg_pool (psycopg 3), WSGI va ASGI uchun
+#   persistent — CONN_MAX_AGE bilan thread'ga bog'langan ulanish (faqat WSGI; ASGI'da o'chiriladi)
+#   off        — har bir so'rovga yangi ulanish
+DB_CONNECTION_MODE = os.environ.get('DB_CONNECTION_MODE', 'pool')
+DB_POOL_SLOW_ACQUIRE_MS = float(os.environ.get('DB_POOL_SLOW_ACQUIRE_MS', '100'))
+RUNNING_ASGI = os.environ.get('DJANGO_ASGI') == '1'
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'monitoring.backends.postgresql',
         'NAME': os.environ.get('POSTGRES_DB', 'botm'),
         'USER': os.environ.get('POSTGRES_USER', 'postgres'),
         'PASSWORD': os.environ.get('POSTGRES_PASSWORD', 'root'),
         'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
         'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+        # pool: ulanish berilishidan oldin tekshiriladi; persistent: har so'rov boshida
+        'CONN_HEALTH_CHECKS': True,
+        'CONN_MAX_AGE': 0,
+        'OPTIONS': {},
+    }
+}
+
+if DB_CONNECTION_MODE == 'pool':
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', '2')),
+        'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '10')),
+        # bo'sh ulanish kutish chegarasi (soniya) — oshsa so'rov xato bilan tugaydi
+        'timeout': float(os.environ.get('DB_POOL_TIMEOUT', '10')),
+        # eskirgan/uzoq bo'sh turgan ulanishlarni almashtirish
+        'max_lifetime': float(os.environ.get('DB_POOL_MAX_LIFETIME', '1800')),
+        'max_idle': float(os.environ.get('DB_POOL_MAX_IDLE', '300')),
+        'name': 'default',
+    }
+elif DB_CONNECTION_MODE == 'persistent' and not RUNNING_ASGI:
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.environ.get('DB_CONN_MAX_AGE', '60'))
+
+# Read replica'lar (config/db_router.py): POSTGRES_REPLICA_HOSTS=host1,host2:5433
+# Login/parol/baza nomi primary bilan bir xil; testlarda replica primary'ning ko'zgusi.
+DATABASE_REPLICAS = []
+for index, address in enumerate(filter(None, os.environ.get('POSTGRES_REPLICA_HOSTS', '').split(',')), start=1):
+    host, _, port = address.strip().partition(':')
+    alias = f'replica{index}'
+    replica = copy.deepcopy(DATABASES['default'])
+    replica.update({'HOST': host, 'PORT': port or replica['PORT'], 'TEST': {'MIRROR': 'default'}})
+    if 'pool' in replica['OPTIONS']:
+        replica['OPTIONS']['pool']['name'] = alias
+    DATABASES[alias] = replica
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['config.db_router.PrimaryReplicaRouter']
+# yozuvdan keyin shu foydalanuvchi/klient o'qishlari primary'da qoladigan vaqt (replication lag'dan katta)
+DB_REPLICA_STICKY_SECONDS = int(os.environ.get('DB_REPLICA_STICKY_SECONDS', '10'))
+DB_REPLICA_STICKY_COOKIE = 'db_primary_until'
+
+# Cache: REDIS_URL berilsa worker'lar orasida umumiy (replica stickiness va throttle ham shunga tayanadi).
+# Berilmasa LocMem — har bir worker jarayoniga alohida: throttle limitlari worker soniga ko'payadi.
+# Backend'lar hit/miss'ni Prometheus'ga yozadi (monitoring/cache.py).
+REDIS_URL = os.environ.get('REDIS_URL', '')
+CACHES = {
+    'default': {
+        'BACKEND': 'monitoring.cache.RedisCache' if REDIS_URL else 'monitoring.cache.LocMemCache',
+        'LOCATION': REDIS_URL,
+        'ALIAS': 'default',
     }
 }
 
+# GET /metrics (Prometheus). Bo'sh bo'lsa — faqat DEBUG rejimda ochiq.
+# Ko'p worker'li gunicorn: PROMETHEUS_MULTIPROC_DIR (gunicorn.conf.py)
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+# Query budget (monitoring/queries.py): view'dagi `query_budget`dan oshish
+# testlarda xato (strict), production'da warning log
+TESTING = sys.argv[1:2] == ['test'] or 'pytest' in os.path.basename(sys.argv[0])
+QUERY_BUDGET_STRICT = os.environ.get('QUERY_BUDGET_STRICT', str(TESTING)).lower() == 'true'
+# bitta so'rovda shu marta va undan ko'p takrorlangan SQL shakli — N+1 deb log qilinadi
+QUERY_DUPLICATE_THRESHOLD = int(os.environ.get('QUERY_DUPLICATE_THRESHOLD', '5'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -156,6 +232,28 @@ STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
+# Media (task rasmlari) faqat TaskMediaView orqali, ruxsat tekshiruvi bilan beriladi.
+# Fayllar joylashuvi o'zgarmaydi (MEDIA_ROOT — loyiha ildizi, task_images/...).
+MEDIA_URL = '/media/'
+# '' — Django FileResponse; 'nginx' — X-Accel-Redirect; 'sendfile' — X-Sendfile (Apache/lighttpd)
+MEDIA_OFFLOAD = os.environ.get('MEDIA_OFFLOAD', '')
+# nginx: location /protected-media/ { internal; alias <MEDIA_ROOT>/; }
+MEDIA_OFFLOAD_PREFIX = os.environ.get('MEDIA_OFFLOAD_PREFIX', '/protected-media/')
+
+# Task rasmlari: thumbnail/WebP nusxalar (management/images.py)
+TASK_IMAGE_VARIANTS = {
+    'thumb': 160,
+    'medium': 640,
+}
+TASK_IMAGE_WORKERS = int(os.environ.get('TASK_IMAGE_WORKERS', '2'))
+TASK_IMAGE_WEBP_QUALITY = 80
+TASK_IMAGE_JPEG_QUALITY = 82
+TASK_IMAGE_PLACEHOLDER = 'management/img/task-placeholder.svg'
+# chunked/resumable upload (management/uploads.py)
+TASK_UPLOAD_MAX_SIZE = int(os.environ.get('TASK_UPLOAD_MAX_SIZE', str(100 * 1024 * 1024)))
+TASK_UPLOAD_MAX_CHUNK = 8 * 1024 * 1024
+TASK_UPLOAD_EXPIRY = timedelta(days=1)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -170,11 +268,106 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_THROTTLE_CLASSES': (
+        'monitoring.throttling.RoleRateThrottle',
+    ),
 }
 
+# Throttle (monitoring/throttling.py): rol -> endpoint sinfi -> (soniyasiga token, bucket hajmi).
+# Endpoint sinfi: GET/HEAD/OPTIONS — read, qolganlari — write; view'da `throttle_scope = 'export'`.
+# ANON — login qilmagan klientlar (IP bo'yicha).
+THROTTLE_ENABLED = os.environ.get('THROTTLE_ENABLED', str(not TESTING)).lower() == 'true'
+THROTTLE_RATES = {
+    'OWNER': {'read': (20, 200), 'write': (10, 100), 'export': (1, 10)},
+    'PM': {'read': (20, 200), 'write': (10, 100), 'export': (1, 10)},
+    'DEV': {'read': (10, 100), 'write': (5, 50), 'export': (0.5, 5)},
+    'VIEWER': {'read': (5, 50), 'write': (1, 10), 'export': (0.2, 3)},
+    'ANON': {'read': (2, 20), 'write': (0.5, 10), 'export': (0.1, 1)},
+}
+# lokal bucket'lar shu oraliqda umumiy cache bilan sinxronlanadi; hisob oynasi (soniya)
+THROTTLE_CACHE = 'default'
+THROTTLE_SYNC_INTERVAL = float(os.environ.get('THROTTLE_SYNC_INTERVAL', '1'))
+THROTTLE_SYNC_WINDOW = 60
+# worker xotirasidagi bucket'lar soni shundan oshsa, THROTTLE_IDLE_SECONDS ishlatilmaganlari o'chiriladi
+THROTTLE_MAX_KEYS = 50000
+THROTTLE_IDLE_SECONDS = 600
+
+# Load shedding (monitoring/shedding.py): worker band bo'lsa 503 + Retry-After.
+# MAX_IN_FLIGHT — bitta worker jarayonidagi parallel so'rovlar (gthread/ASGI; sync worker'da doim 1).
+# QUEUE_MS — proxy'ning X-Request-Start'idan beri navbatda kutish: shundan rad etish boshlanadi,
+# 2x da — hammasi (sync worker'lar uchun asosiy signal; nginx: proxy_set_header X-Request-Start "t=${msec}";).
+LOAD_SHED_ENABLED = os.environ.get('LOAD_SHED_ENABLED', str(not TESTING)).lower() == 'true'
+LOAD_SHED_MAX_IN_FLIGHT = int(os.environ.get('LOAD_SHED_MAX_IN_FLIGHT', '64'))
+LOAD_SHED_QUEUE_MS = float(os.environ.get('LOAD_SHED_QUEUE_MS', '1000'))
+# DB ulanish olishning yaqindagi o'rtacha vaqti: shundan rad etish boshlanadi, 2x da — hammasi
+LOAD_SHED_POOL_WAIT_MS = float(os.environ.get('LOAD_SHED_POOL_WAIT_MS', '250'))
+LOAD_SHED_DECAY_SECONDS = 5.0
+LOAD_SHED_RETRY_AFTER = int(os.environ.get('LOAD_SHED_RETRY_AFTER', '2'))
+LOAD_SHED_EXEMPT_PATHS = ('/metrics', '/monitoring/')
+
+# Javobni siqish (config/compression.py). br/zstd — ixtiyoriy paketlar: pip install brotli zstandard.
+# Darajalar: python manage.py benchmark_compression natijasi bo'yicha.
+COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'true').lower() == 'true'
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', '1024'))
+# teng q'da server tanlovi shu tartibda
+COMPRESSION_ENCODINGS = ('br', 'zstd', 'gzip')
+COMPRESSION_LEVELS = {'br': 4, 'zstd': 3, 'gzip': 5}
+COMPRESSION_EXCLUDE_PATHS = ('/auth/',)
+
 AUTH_USER_MODEL = 'accounts.User'
 
+# Soft-deleted qatorlarni tozalash (python manage.py purge_deleted)
+SOFT_DELETE_RETENTION_DAYS = int(os.environ.get('SOFT_DELETE_RETENTION_DAYS', '90'))
+SOFT_DELETE_PURGE_BATCH_SIZE = int(os.environ.get('SOFT_DELETE_PURGE_BATCH_SIZE', '500'))
+SOFT_DELETE_PURGE_SLEEP = float(os.environ.get('SOFT_DELETE_PURGE_SLEEP', '0.5'))
+# bolalar ota-onadan oldin
+SOFT_DELETE_PURGE_MODELS = [
+    'management.Task',
+    'management.Sprint',
+    'management.Project',
+    'accounts.User',
+]
+
+# GET /management/calendar/?from=&to= — eng uzun oraliq (kun)
+CALENDAR_MAX_DAYS = 366
+# GET /management/workload/ natijasi cache'da shuncha soniya (task yozuvlari project kaliti bo'yicha o'chiradi)
+WORKLOAD_CACHE_TIMEOUT = int(os.environ.get('WORKLOAD_CACHE_TIMEOUT', '300'))
+
+# GET /management/projects/<pk>/active-sprint/: javob keyingi sprint chegarasigacha, lekin shundan uzoq emas (soniya)
+ACTIVE_SPRINT_CACHE_TIMEOUT = int(os.environ.get('ACTIVE_SPRINT_CACHE_TIMEOUT', '3600'))
+
+# Board tartibi (management/board.py): kalit shundan uzun bo'lsa python manage.py rebalance_ranks ustunni qayta taqsimlaydi
+TASK_RANK_REBALANCE_LENGTH = int(os.environ.get('TASK_RANK_REBALANCE_LENGTH', '16'))
+
+# Muddat eslatmalari/overdue digest'lari (python manage.py send_due_digests, management/digests.py)
+DIGEST_LOOKAHEAD = timedelta(hours=int(os.environ.get('DIGEST_LOOKAHEAD_HOURS', '24')))
+# birinchi ishga tushishda overdue oynasi shuncha orqadan boshlanadi
+DIGEST_INITIAL_LOOKBACK = timedelta(days=7)
+# send(digest) metodli klass: management.digests.FileNotifier (lokal JSONL) yoki EmailNotifier
+DIGEST_NOTIFIER = os.environ.get('DIGEST_NOTIFIER', 'management.digests.FileNotifier')
+DIGEST_OUTBOX_DIR = os.environ.get('DIGEST_OUTBOX_DIR') or str(BASE_DIR / 'digest_outbox')
+DIGEST_BATCH_SIZE = 500
+
 SWAGGER_SETTINGS = {
+    # view'lardagi config.swagger (lazy) dekoratorlarini o'qiydi
+    'DEFAULT_GENERATOR_CLASS': 'config.schema.LazyOpenAPISchemaGenerator',
+    'DEFAULT_INFO': 'config.schema.API_INFO',
+    # drf_yasg standartlari + model integer chegaralari backend'ga bog'liq emas (config.inspectors)
+    'DEFAULT_FIELD_INSPECTORS': [
+        'config.inspectors.PinnedIntegerRangeFilter',
+        'drf_yasg.inspectors.CamelCaseJSONFilter',
+        'drf_yasg.inspectors.RecursiveFieldInspector',
+        'drf_yasg.inspectors.ReferencingSerializerInspector',
+        'drf_yasg.inspectors.ChoiceFieldInspector',
+        'drf_yasg.inspectors.FileFieldInspector',
+        'drf_yasg.inspectors.DictFieldInspector',
+        'drf_yasg.inspectors.JSONFieldInspector',
+        'drf_yasg.inspectors.HiddenFieldInspector',
+        'drf_yasg.inspectors.RelatedFieldInspector',
+        'drf_yasg.inspectors.SerializerMethodFieldInspector',
+        'drf_yasg.inspectors.SimpleFieldInspector',
+        'drf_yasg.inspectors.StringDefaultFieldInspector',
+    ],
     'USE_SESSION_AUTH': False,
     'SECURITY_DEFINITIONS': {
         'Bearer': {
@@ -183,4 +376,8 @@ SWAGGER_SETTINGS = {
             'in': 'header',
         },
     },
-}
\ No newline at end of file
+}
+
+# Oldindan yig'ilgan OpenAPI spec (python manage.py build_schema). Fayl bo'lsa va DEBUG o'chiq bo'lsa
+# /swagger/?format=openapi shu fayldan ETag bilan beriladi; aks holda drf_yasg har safar generatsiya qiladi.
+OPENAPI_SCHEMA_FILE = Path(os.environ.get('OPENAPI_SCHEMA_FILE', BASE_DIR / 'config' / 'openapi.json'))
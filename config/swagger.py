@@ -0,0 +1,97 @@
+"""
+drf_yasg'siz yengil `swagger_auto_schema` va `openapi`.
+
+drf_yasg (va u tortadigan modullar) faqat spec generatsiyasida kerak, lekin view modullaridagi
+dekoratorlar uni har bir worker startup'ida yuklatardi. Bu yerdagi dekorator argumentlarni view
+metodiga yozib qo'yadi, `openapi.Parameter(...)` kabi ifodalar esa `Deferred` sifatida saqlanadi;
+haqiqiy drf_yasg obyektlari config.schema.LazyOpenAPISchemaGenerator ichida yaratiladi.
+"""
+import threading
+from functools import cache
+from importlib import import_module
+
+from django.views.decorators.csrf import csrf_exempt
+
+LAZY_ATTR = '_lazy_swagger_auto_schema'
+
+_apply_lock = threading.Lock()
+
+
+class Deferred:
+    """`openapi.X` / `openapi.X(...)` ifodasi; `resolve()` paytida drf_yasg'dan olinadi."""
+
+    __slots__ = ('path', 'call')
+
+    def __init__(self, path, call=None):
+        self.path = path
+        self.call = call
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return Deferred(self.path + (name,))
+
+    def __call__(self, *args, **kwargs):
+        return Deferred(self.path, (args, kwargs))
+
+    def __repr__(self):
+        return f"Deferred({'.'.join(self.path)})"
+
+    def resolve(self):
+        value = import_module(self.path[0])
+        for name in self.path[1:]:
+            value = getattr(value, name)
+        if self.call is not None:
+            args, kwargs = self.call
+            value = value(*resolve(args), **resolve(kwargs))
+        return value
+
+
+openapi = Deferred(('drf_yasg.openapi',))
+
+
+def resolve(value):
+    if isinstance(value, Deferred):
+        return value.resolve()
+    if isinstance(value, (list, tuple)):
+        return type(value)(resolve(item) for item in value)
+    if isinstance(value, dict):
+        return {key: resolve(item) for key, item in value.items()}
+    return value
+
+
+def swagger_auto_schema(**kwargs):
+    """drf_yasg.utils.swagger_auto_schema bilan bir xil argumentlar; drf_yasg import qilinmaydi."""
+    def decorator(view_method):
+        # method_decorator __dict__'ni nusxalaydi — ro'yxat yangisi bilan almashtiriladi, o'zgartirilmaydi
+        setattr(view_method, LAZY_ATTR, [*getattr(view_method, LAZY_ATTR, ()), kwargs])
+        return view_method
+    return decorator
+
+
+def apply_swagger_auto_schema(view_method):
+    """Yozib qo'yilgan argumentlarni haqiqiy dekorator orqali o'tkazadi (funksiya uchun bir marta)."""
+    func = getattr(view_method, '__func__', view_method)
+    if LAZY_ATTR not in getattr(func, '__dict__', {}):
+        return
+    from drf_yasg.utils import swagger_auto_schema as decorate
+
+    with _apply_lock:
+        # atribut oxirida o'chiriladi: parallel generatsiya lock'da kutadi, yarim natijani ko'rmaydi
+        for kwargs in func.__dict__.get(LAZY_ATTR, ()):
+            decorate(**resolve(kwargs))(func)
+        func.__dict__.pop(LAZY_ATTR, None)
+
+
+def schema_ui_view(renderer):
+    """/swagger/, /redoc/ view'lari: config.schema (drf_yasg) birinchi so'rovda yuklanadi."""
+    @cache
+    def load():
+        from config.schema import SchemaView
+        return SchemaView.with_ui(renderer, cache_timeout=0)
+
+    @csrf_exempt
+    def schema_view(request, *args, **kwargs):
+        return load()(request, *args, **kwargs)
+
+    return schema_view
@@ -1,29 +1,20 @@
 # config/urls.py
 from django.contrib import admin
 from django.urls import include, path
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-from rest_framework import permissions
 
-schema_view = get_schema_view(
-    openapi.Info(
-        title="BOTM API",
-        default_version="v1",
-        description="BizIT Office Task Manager (Eurosoft) uchun backend API hujjatlari",
-        terms_of_service="https://www.google.com/policies/terms/",
-        contact=openapi.Contact(email="support@bizit.uz"),
-        license=openapi.License(name="BSD License"),
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
-)
+from config.swagger import schema_ui_view
+from management.views import TaskMediaView
+from monitoring.metrics import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('accounts.urls')),
     path('management/', include('management.urls')),
     path('log/', include('audit.urls')),
+    path('monitoring/', include('monitoring.urls')),
+    path('metrics', metrics_view, name='metrics'),
+    path('media/<path:name>', TaskMediaView.as_view(), name='task-media'),
 
-    path("swagger/", schema_view.with_ui("swagger", cache_timeout=0), name="schema-swagger-ui"),
-    path("redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"),
+    path("swagger/", schema_ui_view("swagger"), name="schema-swagger-ui"),
+    path("redoc/", schema_ui_view("redoc"), name="schema-redoc"),
 ]
@@ -10,7 +10,12 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
 import os
 
 from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+# URLconf va view modullari birinchi so'rovda emas, worker trafik olishidan oldin yuklanadi
+# (gunicorn preload_app bilan — master jarayonda bir marta, worker'lar fork orqali oladi)
+get_resolver().url_patterns
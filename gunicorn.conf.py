@@ -0,0 +1,31 @@
+# gunicorn config.wsgi -c gunicorn.conf.py
+import os
+import shutil
+
+# Prometheus multiprocess rejimi: worker'lar metrikalarni shu papkadagi mmap fayllarga yozadi.
+# O'zgaruvchi prometheus_client import qilinishidan oldin o'rnatilgan bo'lishi kerak.
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/botm-metrics')
+# preload_app: ilova (va metrikalar) on_starting'dan oldin master'da yuklanadi
+os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+from prometheus_client import multiprocess  # noqa: E402
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', '4'))
+# Django, app'lar va view'lar master'da bir marta yuklanadi; yangi worker — faqat fork.
+# Master DB'ga ulanmaydi (pool va rasm thread pool'i birinchi ishlatilganda yaratiladi).
+# Kod yangilanganda HUP yetmaydi — master qayta ishga tushiriladi.
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+
+def on_starting(server):
+    # oldingi ishga tushirishdan qolgan fayllar hisobni buzmasin (master'ning preload paytidagi
+    # fayllari ham — worker'lar fork'dan keyin o'z pid'i bilan yangisini ochadi)
+    path = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    # o'lgan worker'ning livesum gauge'lari (in-flight) yig'indidan chiqariladi
+    multiprocess.mark_process_dead(worker.pid)
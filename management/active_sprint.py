@@ -0,0 +1,62 @@
+"""
+Project'ning joriy va keyingi sprint'i — saqlangan [start_date, end_date) oynalari bo'yicha
+(sprint_project_window_idx), Python'da sana hisoblamasdan.
+
+Natija project kaliti bo'yicha cache'lanadi va keyingi chegaragacha (joriy sprint tugashi yoki
+keyingisi boshlanishi) amal qiladi: shu paytgacha javob o'zgarmaydi, chegaradan keyin qayta
+hisoblanadi. Sprint saqlansa (Sprint.save), o'chirilsa yoki tiklansa kalit o'chiriladi.
+"""
+import math
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from config.db_router import use_primary
+
+from .models import ACTIVE_SPRINT_CACHE_KEY, Project, Sprint
+
+FIELDS = ('id', 'name', 'start_date', 'end_date', 'duration_days', 'status')
+
+
+def compute(project_id, now):
+    """Project bo'lmasa (yoki o'chirilgan bo'lsa) — None."""
+    if not Project.objects.filter(pk=project_id).exists():
+        return None
+    qs = Sprint.objects.filter(project_id=project_id).exclude(status=Sprint.Status.COMPLETED)
+    # start_date <= now oralig'ini oxiridan o'qiydi: odatda birinchi qator joriy sprint
+    current = (
+        qs.filter(start_date__lte=now, end_date__gt=now)
+        .order_by('-start_date', '-pk')
+        .values(*FIELDS)
+        .first()
+    )
+    upcoming = qs.filter(start_date__gt=now).order_by('start_date', 'pk').values(*FIELDS).first()
+
+    boundaries = [value for value in (current and current['end_date'], upcoming and upcoming['start_date']) if value]
+    return {
+        'project': project_id,
+        'current': current,
+        'upcoming': upcoming,
+        'valid_until': min(boundaries) if boundaries else None,
+    }
+
+
+def resolve(project_id, now=None):
+    """{'project', 'current', 'upcoming', 'valid_until'} (sprint'lar — FIELDS bo'yicha dict yoki None); project yo'q — None."""
+    now = now or timezone.now()
+    key = ACTIVE_SPRINT_CACHE_KEY.format(project_id)
+    data = cache.get(key)
+    if data is not None and (data['valid_until'] is None or now < data['valid_until']):
+        return data
+
+    # cache'ga yoziladi — primary'dan: kechikkan replica invalidatsiyadan oldingi holatni qaytarmasin
+    with use_primary():
+        data = compute(project_id, now)
+    if data is None:
+        return None
+    timeout = settings.ACTIVE_SPRINT_CACHE_TIMEOUT
+    if data['valid_until'] is not None:
+        timeout = min(timeout, math.ceil((data['valid_until'] - now).total_seconds()))
+    cache.set(key, data, max(timeout, 1))
+    return data
@@ -0,0 +1,138 @@
+"""
+Board tartibi: task'lar (sprint, status) ustunida Task.rank bo'yicha (task_board_rank_idx).
+
+Ko'chirish qo'shnilar orasiga yangi kalit hisoblaydi (management/ranking.py) va faqat ko'chgan
+task'ni yozadi — bitta UPDATE. Kalitlar TASK_RANK_REBALANCE_LENGTH'dan uzaysa yoki ustunda
+takrorlansa (parallel ko'chirish, bulk_create'dagi bo'sh rank) — rebalance ustunni qayta taqsimlaydi:
+cron'dan python manage.py rebalance_ranks, kalit maydonga sig'masa — shu ko'chirishning o'zida.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Max, Q
+from django.db.models.functions import Length
+from django.utils import timezone
+
+from .models import Task
+from .ranking import rank_after, rank_before, rank_between, spaced_ranks
+
+RANK_MAX_LENGTH = Task._meta.get_field('rank').max_length
+REBALANCE_BATCH_SIZE = 1000
+
+
+def column(sprint_id, status):
+    return Task.objects.filter(sprint_id=sprint_id, status=status)
+
+
+def tail_rank(sprint_id, status, exclude=None):
+    """Ustun oxiridagi kalit ('' — ustun bo'sh); `exclude` — ustunga ko'chayotgan task'ning o'zi."""
+    qs = column(sprint_id, status)
+    if exclude is not None:
+        qs = qs.exclude(pk=exclude)
+    return qs.order_by('-rank').values_list('rank', flat=True).first() or ''
+
+
+def append_ranks(sprint_id, tasks):
+    """
+    `tasks` — [(pk, status)] joriy tartibda, har biri `sprint_id`dagi o'z status ustuni oxiriga
+    (ustun oxirlari bitta GROUP BY bilan). Qaytaradi: {pk: rank}.
+    """
+    statuses = {status for _, status in tasks}
+    tails = dict(
+        Task.objects.filter(sprint_id=sprint_id, status__in=statuses)
+        .values('status').annotate(last=Max('rank')).order_by()
+        .values_list('status', 'last')
+    )
+    ranks = {}
+    for pk, status in tasks:
+        tails[status] = ranks[pk] = rank_after(tails.get(status) or '')
+    return ranks
+
+
+def _bounds(qs, after, before):
+    """(pastki, yuqori) kalit: `after` task'idan keyin, `before` task'idan oldin."""
+    neighbours = dict(qs.filter(pk__in=[pk for pk in (after, before) if pk is not None]).values_list('pk', 'rank'))
+    for pk in (after, before):
+        if pk is not None and pk not in neighbours:
+            raise ValueError(f"Task {pk} is not in the target column.")
+
+    low = neighbours.get(after)
+    high = neighbours.get(before)
+    if after is None and before is None:
+        low = qs.order_by('-rank').values_list('rank', flat=True).first()
+    elif after is None:
+        low = qs.filter(rank__lt=high).order_by('-rank').values_list('rank', flat=True).first() or ''
+    elif before is None:
+        high = qs.filter(rank__gt=low).order_by('rank').values_list('rank', flat=True).first()
+    return low, high
+
+
+def next_rank(qs, after, before):
+    low, high = _bounds(qs, after, before)
+    if high is None:
+        return rank_after(low or '')
+    if not low:
+        return rank_before(high) if high else None
+    return rank_between(low, high) if low < high else None
+
+
+def move_task(task, status=None, after=None, before=None):
+    """
+    Task'ni `status` ustunida (berilmasa — o'zinikida) `after` va `before` task'lari orasiga
+    qo'yadi; ikkalasi ham None — ustun oxiriga. Qaytaradi: yangi rank. Xato — ValueError.
+    """
+    status = status or task.status
+    if task.pk in (after, before):
+        raise ValueError("A task cannot be placed next to itself.")
+    qs = column(task.sprint_id, status).exclude(pk=task.pk)
+
+    rank = next_rank(qs, after, before)
+    if rank is None or len(rank) > RANK_MAX_LENGTH:
+        # qo'shnilar kaliti bir xil (yoki bo'sh) yoki kalit maydonga sig'maydi — ustun qayta taqsimlanadi
+        rebalance_column(task.sprint_id, status)
+        rank = next_rank(qs, after, before)
+        if rank is None:
+            raise ValueError("Could not place the task between these neighbours; reload the board.")
+
+    Task.objects.filter(pk=task.pk).update(rank=rank, status=status, updated_at=timezone.now())
+    task.rank, task.status = rank, status
+    return rank
+
+
+def rebalance_column(sprint_id, status):
+    """Ustundagi kalitlarni joriy tartibni saqlab teng oraliqlarga qayta yozadi. Qaytaradi: yozilgan qatorlar."""
+    with transaction.atomic():
+        tasks = list(
+            column(sprint_id, status).select_for_update()
+            .order_by('rank', 'pk').only('pk', 'rank')
+        )
+        changed = []
+        for task, rank in zip(tasks, spaced_ranks(len(tasks))):
+            if task.rank != rank:
+                task.rank = rank
+                changed.append(task)
+        Task.objects.bulk_update(changed, ['rank'], batch_size=REBALANCE_BATCH_SIZE)
+    return len(changed)
+
+
+def columns_to_rebalance(max_length=None):
+    """Kaliti `max_length`dan uzun yoki takrorlangan (sprint_id, status) ustunlar."""
+    max_length = max_length or settings.TASK_RANK_REBALANCE_LENGTH
+    return list(
+        Task.objects.values('sprint_id', 'status')
+        .annotate(longest=Max(Length('rank')), total=Count('pk'), distinct=Count('rank', distinct=True))
+        .filter(Q(longest__gt=max_length) | Q(distinct__lt=F('total')))
+        .order_by()
+        .values_list('sprint_id', 'status')
+    )
+
+
+def rebalance(max_length=None, report=None):
+    """Qaytaradi: (ustunlar, yozilgan qatorlar). Har ustun alohida tranzaksiyada — board'lar qisqa qulflanadi."""
+    report = report or (lambda message: None)
+    columns = columns_to_rebalance(max_length)
+    rows = 0
+    for sprint_id, status in columns:
+        written = rebalance_column(sprint_id, status)
+        rows += written
+        report(f"sprint {sprint_id} {status}: {written} rank(s) rewritten")
+    return len(columns), rows
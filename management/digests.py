@@ -0,0 +1,193 @@
+"""
+Muddat eslatmalari va overdue digest'lari (python manage.py send_due_digests).
+
+Har ishga tushishda ikki oyna qayta ishlanadi:
+  overdue    — [checkpoint.overdue_until, now): shu orada muddati o'tib ketgan ochiq task'lar;
+  yaqin muddat — [checkpoint.due_soon_until, now + lookahead): muddati yaqinlashgan ochiq task'lar.
+Oynalar bir-biriga ulanib boradi, shuning uchun task har bir holat uchun bir marta chiqadi va
+qayta ishlangan vaqt oralig'i qayta o'qilmaydi.
+
+Tanlov — Task.assignees through jadvali bo'yicha bitta so'rov (task_open_due_date_idx partial
+index'i bilan due_date oralig'i), natija assignee bo'yicha guruhlanadi. Digest'lar DueDigest
+(outbox) jadvaliga checkpoint bilan bitta tranzaksiyada yoziladi, keyin DIGEST_NOTIFIER orqali
+yetkaziladi: jarayon to'xtasa ham digest yo'qolmaydi, checkpoint tufayli esa qayta yaratilmaydi.
+"""
+import json
+import logging
+import os
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.mail import send_mail
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import DigestCheckpoint, DueDigest, Task
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_NAME = 'due_dates'
+
+TASK_FIELDS = {
+    'id': 'task_id',
+    'title': 'task__title',
+    'status': 'task__status',
+    'due_date': 'task__due_date',
+    'sprint': 'task__sprint__name',
+    'project_id': 'task__sprint__project_id',
+    'project': 'task__sprint__project__title',
+}
+
+
+class FileNotifier:
+    """Lokal outbox: har bir digest DIGEST_OUTBOX_DIR/digests-YYYY-MM-DD.jsonl fayliga bitta qator."""
+
+    def __init__(self, directory=None):
+        self.directory = directory or settings.DIGEST_OUTBOX_DIR
+
+    def send(self, digest):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"digests-{timezone.now():%Y-%m-%d}.jsonl")
+        with open(path, 'a') as fh:
+            fh.write(json.dumps({'digest_id': digest.pk, **digest.payload}, cls=DjangoJSONEncoder) + '\n')
+
+
+class EmailNotifier:
+    """Django EMAIL_BACKEND orqali oddiy matnli xat."""
+
+    def send(self, digest):
+        payload = digest.payload
+        lines = []
+        for title, key in (("Overdue", 'overdue'), ("Due soon", 'due_soon')):
+            if payload[key]:
+                lines.append(f"{title}:")
+                lines.extend(f"  - {task['title']} ({task['project']} / {task['sprint']}), due {task['due_date']}"
+                             for task in payload[key])
+                lines.append('')
+        subject = f"{len(payload['overdue'])} overdue, {len(payload['due_soon'])} due soon"
+        send_mail(subject, '\n'.join(lines), None, [payload['email']])
+
+
+def get_notifier():
+    return import_string(settings.DIGEST_NOTIFIER)()
+
+
+def collect(overdue, due_soon):
+    """
+    {user_id: payload}; `overdue`, `due_soon` — (start, end) yoki None. Bitta so'rov.
+    """
+    ranges = [window for window in (overdue, due_soon) if window]
+    if not ranges:
+        return {}
+
+    in_windows = Q()
+    for start, end in ranges:
+        in_windows |= Q(task__due_date__gte=start, task__due_date__lt=end)
+
+    # through jadvali manager'siz: soft-delete va COMPLETED shartlari qo'lda (partial index sharti bilan bir xil)
+    rows = (
+        Task.assignees.through.objects
+        .filter(
+            in_windows,
+            task__is_deleted=False,
+            task__sprint__is_deleted=False,
+            task__sprint__project__is_deleted=False,
+            user__is_active=True,
+            user__is_deleted=False,
+        )
+        .exclude(task__status=Task.Status.COMPLETED)
+        .order_by('user_id', 'task__due_date', 'task_id')
+        .values('user_id', 'user__email', 'user__name', *TASK_FIELDS.values())
+    )
+
+    digests = defaultdict(lambda: {'overdue': [], 'due_soon': []})
+    for row in rows:
+        digest = digests[row['user_id']]
+        digest['email'] = row['user__email']
+        digest['name'] = row['user__name']
+        task = {key: row[column] for key, column in TASK_FIELDS.items()}
+        overdue_window = overdue and overdue[0] <= task['due_date'] < overdue[1]
+        digest['overdue' if overdue_window else 'due_soon'].append(task)
+    return dict(digests)
+
+
+def run_digests(now=None, lookahead=None, dry_run=False, report=None):
+    """
+    Scheduler hook (cron, systemd timer): checkpoint'dan keyingi oynalar bo'yicha digest'larni outbox'ga yozadi.
+    Natija — yozilgan (dry_run'da yoziladigan) digest'lar soni.
+    """
+    now = now or timezone.now()
+    lookahead = settings.DIGEST_LOOKAHEAD if lookahead is None else lookahead
+    report = report or logger.info
+
+    with transaction.atomic():
+        # bir vaqtda ishga tushgan ikkinchi jarayon shu yerda kutadi va keyin bo'sh oyna oladi
+        checkpoint, _ = DigestCheckpoint.objects.select_for_update().get_or_create(
+            name=CHECKPOINT_NAME,
+            defaults={'overdue_until': now - settings.DIGEST_INITIAL_LOOKBACK, 'due_soon_until': now},
+        )
+        overdue = (checkpoint.overdue_until, now)
+        # job uzoq ishlamagan bo'lsa, o'tib ketgan qism overdue oynasiga tushadi
+        due_soon = (max(checkpoint.due_soon_until, now), now + lookahead)
+        overdue = overdue if overdue[0] < overdue[1] else None
+        due_soon = due_soon if due_soon[0] < due_soon[1] else None
+
+        digests = collect(overdue, due_soon)
+        window_start = overdue[0] if overdue else now
+        window_end = max(checkpoint.due_soon_until, now + lookahead)
+        report(f"overdue {overdue and [w.isoformat() for w in overdue]}, "
+               f"due soon {due_soon and [w.isoformat() for w in due_soon]}: {len(digests)} digest(s)")
+        if dry_run:
+            transaction.set_rollback(True)
+            return len(digests)
+
+        DueDigest.objects.bulk_create(
+            [
+                DueDigest(
+                    user_id=user_id,
+                    payload={**payload, 'window_start': window_start, 'window_end': window_end},
+                    window_start=window_start,
+                    window_end=window_end,
+                )
+                for user_id, payload in digests.items()
+            ],
+            batch_size=settings.DIGEST_BATCH_SIZE,
+        )
+        checkpoint.overdue_until = max(checkpoint.overdue_until, now)
+        checkpoint.due_soon_until = window_end
+        checkpoint.save(update_fields=['overdue_until', 'due_soon_until', 'updated_at'])
+    return len(digests)
+
+
+def deliver(notifier=None, batch_size=None, report=None):
+    """
+    Yuborilmagan digest'larni notifier'ga beradi; har batch — bitta SELECT va bitta UPDATE.
+    Xato bo'lgan digest yuborilmagan bo'lib qoladi va keyingi ishga tushishda qayta uriniladi.
+    """
+    notifier = notifier or get_notifier()
+    batch_size = batch_size or settings.DIGEST_BATCH_SIZE
+    report = report or logger.info
+
+    sent = failed = 0
+    last_pk = 0
+    while True:
+        batch = list(DueDigest.objects.filter(sent_at__isnull=True, pk__gt=last_pk).order_by('pk')[:batch_size])
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+        delivered = []
+        for digest in batch:
+            try:
+                notifier.send(digest)
+            except Exception:
+                failed += 1
+                logger.warning("Digest %s delivery failed", digest.pk, exc_info=True)
+            else:
+                delivered.append(digest.pk)
+        DueDigest.objects.filter(pk__in=delivered).update(sent_at=timezone.now())
+        sent += len(delivered)
+        report(f"delivered {sent} digest(s), {failed} failed")
+    return sent, failed
@@ -0,0 +1,140 @@
+# management/images.py
+import io
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+
+from .storage import is_content_addressed, task_image_storage, variant_storage
+
+logger = logging.getLogger(__name__)
+
+# (format nomi, Pillow formati, fayl kengaytmasi)
+VARIANT_FORMATS = (
+    ('webp', 'WEBP', 'webp'),
+    ('jpeg', 'JPEG', 'jpg'),
+)
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.TASK_IMAGE_WORKERS,
+            thread_name_prefix='task-image',
+        )
+    return _executor
+
+
+def variant_name(image_name, size_name, ext):
+    """
+    Content-addressed rasm — xesh bo'yicha; eski (legacy) rasm — task_images/ ichidagi to'liq nisbiy
+    yo'li bo'yicha (task_images/variants/a/x.jpg_thumb.webp): turli papkalardagi yoki kengaytmasi
+    boshqa bir xil nomli fayllarning variantlari to'qnashmaydi.
+    """
+    if is_content_addressed(image_name):
+        stem = os.path.splitext(os.path.basename(image_name))[0]
+    else:
+        stem = image_name.removeprefix('task_images/')
+    return f"task_images/variants/{stem}_{size_name}.{ext}"
+
+
+def _encode(img, pil_format):
+    if pil_format == 'JPEG' and img.mode != 'RGB':
+        img = img.convert('RGB')
+    buffer = io.BytesIO()
+    if pil_format == 'WEBP':
+        img.save(buffer, 'WEBP', quality=settings.TASK_IMAGE_WEBP_QUALITY, method=4)
+    else:
+        img.save(buffer, 'JPEG', quality=settings.TASK_IMAGE_JPEG_QUALITY, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def build_variants(image_name, storage=variant_storage, overwrite=False):
+    """
+    Rasmdan TASK_IMAGE_VARIANTS o'lchamlarida WebP + JPEG nusxalar yasaydi va storage'ga yozadi.
+    Qaytaradi: {"thumb": {"webp": name, "jpeg": name}, ...}
+    """
+    from PIL import Image, ImageOps
+
+    sizes = sorted(settings.TASK_IMAGE_VARIANTS.items(), key=lambda item: item[1], reverse=True)
+    names = {
+        size_name: {key: variant_name(image_name, size_name, ext) for key, _, ext in VARIANT_FORMATS}
+        for size_name, _ in sizes
+    }
+    # bir xil fayl bir nechta task'da bo'lsa, variantlar bir marta yasaladi
+    if not overwrite and all(storage.exists(name) for group in names.values() for name in group.values()):
+        return names
+
+    largest = sizes[0][1]
+    with task_image_storage.open(image_name, 'rb') as fh:
+        img = Image.open(fh)
+        # JPEG'ni to'liq o'lchamda decode qilmaslik — katta skanlarda asosiy yutuq shu
+        img.draft('RGB', (largest, largest))
+        img = ImageOps.exif_transpose(img)
+        img.load()
+
+    if img.mode not in ('RGB', 'RGBA'):
+        img = img.convert('RGBA' if 'transparency' in img.info or img.mode in ('LA', 'PA') else 'RGB')
+
+    variants = {}
+    # kattasidan kichigiga: har bir o'lcham oldingisidan kichraytiriladi
+    for size_name, size in sizes:
+        img.thumbnail((size, size), Image.Resampling.LANCZOS)
+        variants[size_name] = {}
+        for key, pil_format, _ in VARIANT_FORMATS:
+            name = names[size_name][key]
+            variants[size_name][key] = storage.save(name, ContentFile(_encode(img, pil_format)))
+    return variants
+
+
+def process_image(image_name, overwrite=False):
+    """
+    Bitta rasm faylini qayta ishlaydi va shu faylga ishora qiluvchi barcha task'larni bitta UPDATE bilan yangilaydi.
+    """
+    from .models import Task
+
+    try:
+        variants = build_variants(image_name, overwrite=overwrite)
+        Task.all_objects.filter(image=image_name).update(image_variants=variants)
+        return True
+    except Exception:
+        logger.exception("Task image processing failed: %s", image_name)
+        return False
+
+
+def process_task_image(task_id):
+    from .models import Task
+
+    image_name = Task.all_objects.filter(pk=task_id).values_list('image', flat=True).first()
+    if not image_name:
+        return False
+    return process_image(image_name)
+
+
+def _process_in_worker(task_id):
+    # pool thread'ining o'z DB ulanishi bor
+    close_old_connections()
+    try:
+        return process_task_image(task_id)
+    finally:
+        close_old_connections()
+
+
+def enqueue_task_image(task_id):
+    """
+    Tranzaksiya commit bo'lgandan keyin rasmni fon pool'ida qayta ishlaydi (request yo'lidan tashqarida).
+    TASK_IMAGE_WORKERS=0 bo'lsa — shu joyning o'zida (testlar uchun).
+    """
+    def run():
+        if settings.TASK_IMAGE_WORKERS:
+            get_executor().submit(_process_in_worker, task_id)
+        else:
+            process_task_image(task_id)
+
+    transaction.on_commit(run)
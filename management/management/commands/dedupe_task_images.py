@@ -0,0 +1,117 @@
+import os
+import shutil
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from management.images import process_image, variant_name
+from management.models import Task
+from management.storage import (
+    content_name,
+    hash_file,
+    is_content_addressed,
+    register_blob,
+    sync_ref_counts,
+    task_image_storage,
+    variant_storage,
+)
+
+IMAGE_DIRECTORY = Task._meta.get_field('image').upload_to.rstrip('/')
+
+
+def link_or_copy(path, new_path):
+    os.makedirs(os.path.dirname(new_path), exist_ok=True)
+    try:
+        # hard link — ma'lumot ko'chirilmaydi, eski nom DB yangilanguncha ishlab turadi
+        os.link(path, new_path)
+    except OSError:
+        shutil.copy2(path, new_path)
+
+
+class Command(BaseCommand):
+    help = (
+        "Mavjud task rasmlarini content-addressed nomlarga o'tkazadi: bir xil fayllar bittaga "
+        "birlashtiriladi (joyida, nusxa ko'chirmasdan) va task'lar yangi nomga yo'naltiriladi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        names = (
+            Task.all_objects.exclude(image='').exclude(image__isnull=True)
+            .order_by('image').values_list('image', flat=True).distinct()
+        )
+
+        migrated = duplicates = saved_bytes = 0
+        seen = set()
+        for name in names.iterator():
+            if is_content_addressed(name):
+                continue
+            path = task_image_storage.path(name)
+            if not os.path.exists(path):
+                self.stderr.write(f"missing: {name}")
+                continue
+
+            # papkasidan qat'i nazar upload_to ostiga: yangi yuklamalar bilan bir joyda, variant URL'lari
+            # (media.image_lookup) xesh bo'yicha topiladi
+            new_name = content_name(IMAGE_DIRECTORY, hash_file(path), os.path.splitext(name)[1])
+            new_path = task_image_storage.path(new_name)
+            is_duplicate = new_name in seen or os.path.exists(new_path)
+            seen.add(new_name)
+            size = os.path.getsize(path)
+            self.stdout.write(f"{name} -> {new_name}{' (duplicate)' if is_duplicate else ''}")
+            if is_duplicate:
+                duplicates += 1
+                saved_bytes += size
+            migrated += 1
+            if dry_run:
+                continue
+
+            if not os.path.exists(new_path):
+                link_or_copy(path, new_path)
+            variants, superseded = self.link_variants(name, new_name)
+
+            with transaction.atomic():
+                Task.all_objects.filter(image=name).update(image=new_name, image_variants=variants)
+                register_blob(new_name, size)
+            os.unlink(path)
+            for old in superseded:
+                variant_storage.delete(old)
+            if not variants:
+                # eski variantlar yo'q yoki to'liq emas — yangi nomdan qayta yasaladi
+                process_image(new_name)
+
+        if not dry_run:
+            sync_ref_counts()
+        verb = "would be" if dry_run else "were"
+        self.stdout.write(self.style.SUCCESS(
+            f"{migrated} file(s) {verb} migrated, {duplicates} duplicate(s), {saved_bytes} bytes saved."
+        ))
+
+    def link_variants(self, name, new_name):
+        """
+        Eski rasm variantlarini yangi nomlariga bog'laydi (yangi nom bo'yicha variant allaqachon bo'lsa —
+        o'sha ishlatiladi). Qaytaradi: (yangi image_variants yoki {}, DB yangilangandan keyin o'chiriladigan
+        eski variant nomlari).
+        """
+        stored = (
+            Task.all_objects.filter(image=name).exclude(image_variants={})
+            .values_list('image_variants', flat=True).first()
+        ) or {}
+        variants, superseded = {}, []
+        for size_name, group in stored.items():
+            variants[size_name] = {}
+            for key, old in group.items():
+                new = variant_name(new_name, size_name, os.path.splitext(old)[1].lstrip('.'))
+                old_path, new_path = variant_storage.path(old), variant_storage.path(new)
+                if os.path.exists(old_path):
+                    if not os.path.exists(new_path):
+                        link_or_copy(old_path, new_path)
+                    if old != new:
+                        superseded.append(old)
+                if not os.path.exists(new_path):
+                    return {}, superseded
+                variants[size_name][key] = new
+        return variants, superseded
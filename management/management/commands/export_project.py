@@ -0,0 +1,35 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from management.transfer import ArchiveError, export_project
+
+
+class Command(BaseCommand):
+    help = (
+        "Loyihani (sprint, task, assignee, rasm va audit loglari bilan) bitta tar.gz arxivga eksport qiladi. "
+        "Misol: python manage.py export_project 12 -o project-12.tar.gz"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('project_id', type=int)
+        parser.add_argument('-o', '--output', default='-', help="Fayl yo'li yoki '-' (stdout)")
+
+    def handle(self, *args, **options):
+        to_stdout = options['output'] == '-'
+        # stdout'ga arxiv yozilsa, hisobot stderr'ga
+        report = self.stderr.write if to_stdout else self.stdout.write
+        started = time.perf_counter()
+        try:
+            if to_stdout:
+                manifest = export_project(options['project_id'], sys.stdout.buffer, report=report)
+            else:
+                with open(options['output'], 'wb') as fh:
+                    manifest = export_project(options['project_id'], fh, report=report)
+        except ArchiveError as exc:
+            raise CommandError(str(exc))
+
+        if manifest['missing_files']:
+            report(self.style.WARNING(f"{len(manifest['missing_files'])} image file(s) missing on disk, not exported."))
+        report(self.style.SUCCESS(f"Project {options['project_id']} exported in {time.perf_counter() - started:.1f}s."))
@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from management.storage import collect_garbage
+from management.uploads import cleanup_stale_uploads
+
+
+class Command(BaseCommand):
+    help = (
+        "Task rasmlari uchun ref_count'larni qayta hisoblaydi va hech bir task ishlatmaydigan "
+        "fayllarni o'chiradi (hard delete'dan keyin, masalan purge_deleted bilan birga)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace-hours', type=float, default=24,
+                            help="Shundan yosh blob'lar o'chirilmaydi")
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        removed = collect_garbage(timedelta(hours=options['grace_hours']), dry_run=options['dry_run'])
+        for name in removed:
+            self.stdout.write(name)
+        verb = "would be removed" if options['dry_run'] else "removed"
+        self.stdout.write(self.style.SUCCESS(f"{len(removed)} unreferenced file(s) {verb}."))
+
+        if not options['dry_run']:
+            uploads = cleanup_stale_uploads()
+            self.stdout.write(self.style.SUCCESS(f"{uploads} stale upload session(s) removed."))
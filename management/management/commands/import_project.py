@@ -0,0 +1,33 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from management.transfer import ArchiveError, import_project
+
+
+class Command(BaseCommand):
+    help = (
+        "export_project arxivini bitta tranzaksiyada import qiladi (yangi pk'lar bilan). "
+        "Mavjud bo'lmagan user'lar email bo'yicha faol emas holatda yaratiladi. "
+        "Misol: python manage.py import_project project-12.tar.gz"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('archive', help="Fayl yo'li yoki '-' (stdin)")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            if options['archive'] == '-':
+                project, counts = import_project(sys.stdin.buffer, report=self.stdout.write)
+            else:
+                with open(options['archive'], 'rb') as fh:
+                    project, counts = import_project(fh, report=self.stdout.write)
+        except ArchiveError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported as project {project.pk} \"{project.title}\" in {time.perf_counter() - started:.1f}s "
+            f"({counts.get('users_created', 0)} new inactive user(s))."
+        ))
@@ -0,0 +1,55 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from management.images import process_image
+from management.models import Task
+
+
+class Command(BaseCommand):
+    help = "Mavjud task rasmlari uchun thumbnail/WebP nusxalarni bir nechta CPU yadrosida yasaydi."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help="Jarayonlar soni (default: CPU yadrolari soni)")
+        parser.add_argument('--all', action='store_true',
+                            help="Variantlari bor rasmlarni ham qayta ishlash")
+        parser.add_argument('--chunk-size', type=int, default=16,
+                            help="Har bir jarayonga bir martada beriladigan rasm soni")
+
+    def handle(self, *args, **options):
+        qs = Task.all_objects.exclude(image='').exclude(image__isnull=True)
+        if not options['all']:
+            qs = qs.filter(image_variants={})
+        # har bir fayl bir marta — bir xil rasmli task'lar bitta UPDATE bilan yangilanadi
+        image_names = list(qs.order_by('image').values_list('image', flat=True).distinct())
+        total = len(image_names)
+        if not total:
+            self.stdout.write("Nothing to process.")
+            return
+
+        process = partial(process_image, overwrite=options['all'])
+        if options['workers'] <= 1:
+            self._report(map(process, image_names), total)
+            return
+
+        # fork qilingan jarayonlar ota jarayonning DB ulanishini bo'lishmasligi kerak
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=options['workers']) as executor:
+            results = executor.map(process, image_names, chunksize=options['chunk_size'])
+            self._report(results, total)
+
+    def _report(self, results, total):
+        processed = failed = 0
+        for ok in results:
+            if ok:
+                processed += 1
+            else:
+                failed += 1
+            done = processed + failed
+            if done % 100 == 0 or done == total:
+                self.stdout.write(f"{done}/{total} ({failed} failed)")
+        self.stdout.write(self.style.SUCCESS(f"{processed} image(s) processed, {failed} failed."))
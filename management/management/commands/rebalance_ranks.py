@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from management.board import columns_to_rebalance, rebalance
+
+
+class Command(BaseCommand):
+    help = (
+        "Board kalitlari (Task.rank) uzaygan yoki takrorlangan ustunlarni joriy tartibni saqlab teng "
+        "oraliqlarga qayta yozadi. Cron misol: */30 * * * * python manage.py rebalance_ranks"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-length', type=int, default=None,
+                            help="Kalit shundan uzun bo'lsa ustun qayta taqsimlanadi (default: TASK_RANK_REBALANCE_LENGTH)")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Hech narsa yozmasdan, qaysi ustunlar qayta taqsimlanishini ko'rsatadi")
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            columns = columns_to_rebalance(options['max_length'])
+            for sprint_id, status in columns:
+                self.stdout.write(f"sprint {sprint_id} {status}")
+            self.stdout.write(self.style.SUCCESS(f"{len(columns)} column(s) would be rebalanced."))
+            return
+
+        columns, rows = rebalance(max_length=options['max_length'], report=self.stdout.write)
+        self.stdout.write(self.style.SUCCESS(f"{columns} column(s) rebalanced, {rows} rank(s) rewritten."))
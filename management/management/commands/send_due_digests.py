@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from management.digests import deliver, run_digests
+
+
+class Command(BaseCommand):
+    help = (
+        "Muddati yaqinlashgan va o'tib ketgan ochiq task'lar bo'yicha har bir assignee'ga bitta digest "
+        "yaratadi va DIGEST_NOTIFIER orqali yuboradi. Cron misol: */15 * * * * python manage.py send_due_digests"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lookahead-hours', type=float, default=None,
+                            help="Yaqin muddat oynasi (default: DIGEST_LOOKAHEAD)")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Checkpoint'ni surmasdan va yubormasdan, nechta digest chiqishini ko'rsatadi")
+        parser.add_argument('--no-deliver', action='store_true',
+                            help="Faqat outbox'ga yozadi; yuborish keyingi ishga tushishda")
+
+    def handle(self, *args, **options):
+        lookahead = options['lookahead_hours']
+        created = run_digests(
+            lookahead=None if lookahead is None else timedelta(hours=lookahead),
+            dry_run=options['dry_run'],
+            report=self.stdout.write,
+        )
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"{created} digest(s) would be created."))
+            return
+
+        sent = failed = 0
+        if not options['no_deliver']:
+            sent, failed = deliver(report=self.stdout.write)
+        self.stdout.write(self.style.SUCCESS(f"{created} digest(s) created, {sent} delivered, {failed} failed."))
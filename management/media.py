@@ -0,0 +1,147 @@
+# management/media.py
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.db.models import Q
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import http_date
+
+from .storage import HASH_CHUNK_SIZE, is_content_addressed
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+HEX64_RE = re.compile(r'^[0-9a-f]{64}$')
+
+# ruxsat tekshiriladi, shuning uchun faqat brauzer keshi (private)
+IMMUTABLE_CACHE = 'private, max-age=31536000, immutable'
+REVALIDATE_CACHE = 'private, max-age=86400'
+
+
+def clean_media_name(name):
+    name = os.path.normpath(name).replace('\\', '/')
+    if name.startswith(('/', '../')) or name == '..' or not name.startswith('task_images/'):
+        return None
+    if name.startswith('task_images/uploads/'):
+        return None
+    return name
+
+
+def image_lookup(name):
+    """
+    Media nomidan Task.image bo'yicha filtr: variant bo'lsa — u yasalgan asl rasm.
+    """
+    sizes = '|'.join(re.escape(size) for size in settings.TASK_IMAGE_VARIANTS)
+    match = re.match(rf'^task_images/variants/(?P<stem>.+)_(?:{sizes})\.[a-z0-9]+$', name)
+    if not match:
+        return Q(image=name)
+    stem = match.group('stem')
+    if HEX64_RE.match(stem):
+        return Q(image__startswith=f"task_images/{stem[:2]}/{stem}.")
+    # legacy rasm — variant nomida to'liq nisbiy yo'li (images.variant_name)
+    lookup = Q(image=f"task_images/{stem}")
+    if '/' not in stem and '.' not in stem:
+        # eski ko'rinish (faqat stem) — process_task_images --all qayta yasaguncha
+        lookup |= Q(image__startswith=f"task_images/{stem}.")
+    return lookup
+
+
+def etag_for(name, stat):
+    stem = os.path.splitext(os.path.basename(name))[0]
+    if is_content_addressed(name):
+        return f'"{stem}"'
+    return f'"{stat.st_size:x}-{int(stat.st_mtime):x}"'
+
+
+def parse_range(header, size):
+    match = RANGE_RE.match(header.strip())
+    if not match or size == 0:
+        return None
+    start, end = match.groups()
+    if start == '':
+        if end == '':
+            return None
+        # bytes=-N — oxirgi N bayt
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        start = int(start)
+        end = min(int(end), size - 1) if end else size - 1
+    if start > end or start >= size:
+        return False
+    return start, end
+
+
+def _read_range(path, start, length):
+    with open(path, 'rb') as fh:
+        fh.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = fh.read(min(HASH_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def serve(request, name, path):
+    """
+    Faylni yuboradi: X-Accel-Redirect / X-Sendfile (MEDIA_OFFLOAD) yoki FileResponse.
+    ETag/If-None-Match, Range (bitta oraliq) va uzoq kesh sarlavhalari bilan.
+    """
+    stat = os.stat(path)
+    etag = etag_for(name, stat)
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(stat.st_mtime),
+        'Cache-Control': IMMUTABLE_CACHE if is_content_addressed(name) else REVALIDATE_CACHE,
+        'Accept-Ranges': 'bytes',
+    }
+
+    if_none_match = request.headers.get('If-None-Match', '')
+    if etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*':
+        response = HttpResponseNotModified()
+        for key, value in headers.items():
+            response[key] = value
+        return response
+
+    offload = settings.MEDIA_OFFLOAD
+    if offload:
+        # Range va sendfile'ni web-server o'zi bajaradi
+        response = HttpResponse(content_type=content_type)
+        if offload == 'nginx':
+            response['X-Accel-Redirect'] = settings.MEDIA_OFFLOAD_PREFIX.rstrip('/') + '/' + name
+        else:
+            response['X-Sendfile'] = path
+        for key, value in headers.items():
+            response[key] = value
+        return response
+
+    byte_range = None
+    range_header = request.headers.get('Range')
+    if_range = request.headers.get('If-Range')
+    if range_header and (not if_range or if_range == etag):
+        byte_range = parse_range(range_header, stat.st_size)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            return response
+
+    if byte_range is None:
+        response = FileResponse(open(path, 'rb'), content_type=content_type)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        if end == stat.st_size - 1:
+            # oxirigacha: fayl seek qilinadi, gunicorn baribir sendfile() bilan yuboradi
+            fh = open(path, 'rb')
+            fh.seek(start)
+            response = FileResponse(fh, content_type=content_type, status=206)
+        else:
+            response = StreamingHttpResponse(_read_range(path, start, length), content_type=content_type, status=206)
+        response['Content-Length'] = str(length)
+        response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+
+    for key, value in headers.items():
+        response[key] = value
+    return response
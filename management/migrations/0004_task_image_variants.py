@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0003_project_deleted_at_project_deleted_batch_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:44
+
+import management.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0004_task_image_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskImageBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('size', models.PositiveBigIntegerField(default=0)),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=management.storage.get_task_image_storage, upload_to='task_images/'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:48
+
+import management.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0006_taskupload'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='task',
+            name='image',
+            field=models.ImageField(blank=True, db_index=True, null=True, storage=management.storage.get_task_image_storage, upload_to='task_images/'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def fill_end_date(apps, schema_editor):
+    Sprint = apps.get_model('management', 'Sprint')
+    # integer * interval SQLite'da yo'q — batch'lab Python'da
+    sprints = Sprint._base_manager.only('pk', 'start_date', 'duration_days').order_by('pk')
+    batch = []
+    for sprint in sprints.iterator(chunk_size=2000):
+        sprint.end_date = sprint.start_date + timedelta(days=sprint.duration_days)
+        batch.append(sprint)
+        if len(batch) == 2000:
+            Sprint._base_manager.bulk_update(batch, ['end_date'])
+            batch = []
+    Sprint._base_manager.bulk_update(batch, ['end_date'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0008_due_digests'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sprint',
+            name='end_date',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(fill_end_date, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='sprint',
+            name='end_date',
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='sprint',
+            index=models.Index(fields=['start_date', 'end_date'], name='sprint_interval_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['start_date', 'due_date'], name='task_interval_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0009_sprint_end_date'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='sprint',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['project', 'start_date', 'end_date'], name='sprint_project_window_idx'),
+        ),
+    ]
@@ -0,0 +1,66 @@
+from django.db import migrations, models
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+
+def spaced_ranks(count):
+    # management.ranking.spaced_ranks nusxasi: migratsiya keyingi o'zgarishlarga bog'lanmasin
+    length = 4
+    while 36 ** length < (count + 1) * 36:
+        length += 1
+    ranks = []
+    for i in range(count):
+        value = (i + 1) * 36 ** length // (count + 1)
+        digits = []
+        for _ in range(length):
+            value, digit = divmod(value, 36)
+            digits.append(DIGITS[digit])
+        ranks.append(''.join(reversed(digits)).rstrip('0'))
+    return ranks
+
+
+def fill_rank(apps, schema_editor):
+    Task = apps.get_model('management', 'Task')
+    # mavjud tartib: ustun ichida yaratilish bo'yicha
+    rows = (
+        Task._base_manager.order_by('sprint_id', 'status', 'created_at', 'pk')
+        .values_list('pk', 'sprint_id', 'status')
+    )
+    # kalit faqat o'rin va ustun hajmiga bog'liq — ko'p ustunda takrorlanadi: har kalitga bitta UPDATE
+    by_rank = {}
+    column, group = None, []
+
+    def assign(group):
+        for pk, rank in zip(group, spaced_ranks(len(group))):
+            by_rank.setdefault(rank, []).append(pk)
+
+    for pk, sprint_id, status in rows.iterator(chunk_size=2000):
+        if (sprint_id, status) != column:
+            assign(group)
+            column, group = (sprint_id, status), []
+        group.append(pk)
+    assign(group)
+
+    for rank, pks in by_rank.items():
+        for start in range(0, len(pks), 2000):
+            Task._base_manager.filter(pk__in=pks[start:start + 2000]).update(rank=rank)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0010_sprint_project_window_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='rank',
+            field=models.CharField(default='', editable=False, max_length=64),
+        ),
+        migrations.RunPython(fill_rank, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['sprint', 'status', 'rank'], name='task_board_rank_idx'),
+        ),
+    ]
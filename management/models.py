@@ -1,6 +1,13 @@
-from django.db import models
+import uuid
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import models, transaction
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from accounts.models import SoftDeleteModel
+from .ranking import rank_after
+from .storage import get_task_image_storage
 User = settings.AUTH_USER_MODEL
 
 
@@ -22,6 +29,29 @@ class Project(SoftDeleteModel):
 	def __str__(self):
 		return self.title
 
+	def get_cascade_querysets(self):
+		return [
+			Sprint.all_objects.filter(project=self),
+			Task.all_objects.filter(sprint__project=self),
+		]
+
+	@classmethod
+	def get_cascade_models(cls):
+		return [Project, Sprint, Task]
+
+
+def sprint_end_date(start_date, duration_days):
+	return start_date + timedelta(days=duration_days)
+
+
+ACTIVE_SPRINT_CACHE_KEY = 'active_sprint:{}'
+
+
+def invalidate_active_sprint(project_id):
+	# commit'dan keyin: parallel so'rov eski holatni cache'ga qayta yozib qo'ymasin
+	key = ACTIVE_SPRINT_CACHE_KEY.format(project_id)
+	transaction.on_commit(lambda: cache.delete(key))
+
 
 class Sprint(SoftDeleteModel):
 	class Status(models.TextChoices):
@@ -33,14 +63,43 @@ class Sprint(SoftDeleteModel):
 	name = models.CharField(max_length=100)
 	start_date = models.DateTimeField()
 	duration_days = models.PositiveIntegerField(default=7)
+	# start_date + duration_days; oraliq (overlap) so'rovlari index'dan o'qishi uchun saqlanadi.
+	# save() hisoblaydi, bulk_create/update'da qo'lda beriladi (sprint_end_date)
+	end_date = models.DateTimeField(editable=False)
 	status = models.CharField(max_length=20, choices=Status.choices, default=Status.OPEN)
 
 	created_at = models.DateTimeField(auto_now_add=True)
 	updated_at = models.DateTimeField(auto_now=True)
 
+	class Meta:
+		indexes = [
+			models.Index(fields=['start_date', 'end_date'], name='sprint_interval_idx'),
+			# joriy/keyingi sprint (management/active_sprint.py)
+			models.Index(
+				fields=['project', 'start_date', 'end_date'],
+				name='sprint_project_window_idx',
+				condition=models.Q(is_deleted=False),
+			),
+		]
+
 	def __str__(self):
 		return f"{self.project.title} - {self.name}"
 
+	def save(self, *args, **kwargs):
+		self.end_date = sprint_end_date(self.start_date, self.duration_days)
+		update_fields = kwargs.get('update_fields')
+		if update_fields is not None and {'start_date', 'duration_days'} & set(update_fields):
+			kwargs['update_fields'] = {*update_fields, 'end_date'}
+		super().save(*args, **kwargs)
+		invalidate_active_sprint(self.project_id)
+
+	def get_cascade_querysets(self):
+		return [Task.all_objects.filter(sprint=self)]
+
+	@classmethod
+	def get_cascade_models(cls):
+		return [Sprint, Task]
+
 
 class Task(SoftDeleteModel):
 	class Status(models.TextChoices):
@@ -58,10 +117,108 @@ class Task(SoftDeleteModel):
 	start_date = models.DateTimeField(null=True, blank=True)
 	due_date = models.DateTimeField(null=True, blank=True)
 	status = models.CharField(max_length=20, choices=Status.choices, default=Status.TO_DO)
-	image = models.ImageField(upload_to='task_images/', null=True, blank=True)
+	image = models.ImageField(upload_to='task_images/', storage=get_task_image_storage, null=True, blank=True, db_index=True)
+	# fon pool'ida yasalgan thumbnail/WebP nusxalar: {"thumb": {"webp": name, "jpeg": name}, ...}
+	image_variants = models.JSONField(default=dict, blank=True)
+	# board tartibi (sprint, status) ustunida: kasr kalit (management/ranking.py), ko'chirish — management/board.py
+	rank = models.CharField(max_length=64, default='', editable=False)
 
 	created_at = models.DateTimeField(auto_now_add=True)
 	updated_at = models.DateTimeField(auto_now=True)
 
+	class Meta:
+		indexes = [
+			# kalendar: start_date < to AND due_date >= from (yoki bittasi NULL — IS NULL sharti ham index'da)
+			models.Index(fields=['start_date', 'due_date'], name='task_interval_idx'),
+			# muddat digest'lari (management/digests.py): faqat ochiq task'lar bo'yicha due_date oralig'i
+			models.Index(
+				fields=['due_date'],
+				name='task_open_due_date_idx',
+				condition=models.Q(is_deleted=False, due_date__isnull=False) & ~models.Q(status='COMPLETED'),
+			),
+			# board: ustun rank bo'yicha tartibda, ustun oxiri — index'dan bitta qator
+			models.Index(
+				fields=['sprint', 'status', 'rank'],
+				name='task_board_rank_idx',
+				condition=models.Q(is_deleted=False),
+			),
+		]
+
 	def __str__(self):
 		return self.title
+
+	def save(self, *args, **kwargs):
+		# yangi task ustun oxiriga; bulk_create'da rank bo'sh qoladi (rebalance_ranks joylaydi)
+		if self._state.adding and not self.rank:
+			last = (
+				Task.objects.filter(sprint_id=self.sprint_id, status=self.status)
+				.order_by('-rank').values_list('rank', flat=True).first()
+			)
+			self.rank = rank_after(last or '')
+		super().save(*args, **kwargs)
+
+
+class TaskImageBlob(models.Model):
+	# content-addressed fayl (management.storage); ref_count — unga ishora qiluvchi task'lar soni
+	name = models.CharField(max_length=255, unique=True)
+	size = models.PositiveBigIntegerField(default=0)
+	ref_count = models.PositiveIntegerField(default=0)
+
+	created_at = models.DateTimeField(auto_now_add=True)
+	updated_at = models.DateTimeField(auto_now=True)
+
+	def __str__(self):
+		return f"{self.name} ({self.ref_count})"
+
+
+class TaskUpload(models.Model):
+	# chunked/resumable upload sessiyasi; qismlar storage ichidagi .part faylga yoziladi
+	id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+	task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='uploads')
+	user = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL, related_name='task_uploads')
+	filename = models.CharField(max_length=255)
+	size = models.PositiveBigIntegerField()
+	offset = models.PositiveBigIntegerField(default=0)
+	sha256 = models.CharField(max_length=64, blank=True)
+
+	created_at = models.DateTimeField(auto_now_add=True)
+	updated_at = models.DateTimeField(auto_now=True)
+	completed_at = models.DateTimeField(null=True, blank=True)
+
+	def __str__(self):
+		return f"{self.filename} ({self.offset}/{self.size})"
+
+	@property
+	def part_name(self):
+		return f"task_images/uploads/{self.id}.part"
+
+
+class DigestCheckpoint(models.Model):
+	# digest oynalari shu nuqtalargacha qayta ishlangan: overdue — [.., overdue_until), yaqin muddat — [.., due_soon_until)
+	name = models.CharField(max_length=50, unique=True)
+	overdue_until = models.DateTimeField()
+	due_soon_until = models.DateTimeField()
+
+	updated_at = models.DateTimeField(auto_now=True)
+
+	def __str__(self):
+		return f"{self.name}: {self.overdue_until} / {self.due_soon_until}"
+
+
+class DueDigest(models.Model):
+	# outbox: checkpoint bilan bitta tranzaksiyada yoziladi, notifier'ga yetkazilgach sent_at qo'yiladi
+	user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='due_digests')
+	payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+	window_start = models.DateTimeField()
+	window_end = models.DateTimeField()
+
+	created_at = models.DateTimeField(auto_now_add=True)
+	sent_at = models.DateTimeField(null=True, blank=True)
+
+	class Meta:
+		indexes = [
+			models.Index(fields=['id'], name='duedigest_unsent_idx', condition=models.Q(sent_at__isnull=True)),
+		]
+
+	def __str__(self):
+		return f"{self.user_id} {self.window_start} - {self.window_end}"
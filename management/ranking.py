@@ -0,0 +1,70 @@
+"""
+Leksikografik kasr kalitlar (Task.rank): kalit — 0-9a-z alifbosidagi 36-lik kasr 0.d1d2d3...
+
+Kalitlar oxirida '0' bo'lmaydi (kanonik ko'rinish), shuning uchun satr tartibi son tartibi bilan bir
+xil va ikki kalit orasiga har doim yangisi sig'adi — task'ni ko'chirish faqat o'zini yozadi.
+Alifbo faqat raqam va kichik harflar: locale collation'lar ham ASCII tartibida solishtiradi.
+
+Ustun oxiri/boshiga qo'yish oxirgi xonani (kamida RANK_DIGITS xona) bittaga o'zgartiradi — kalit
+uzunligi o'smaydi; bir oraliqqa qayta-qayta qo'yish esa taxminan har 5 marta bitta xona qo'shadi.
+Uzun kalitlarni management/board.py'dagi rebalance qayta taqsimlaydi (spaced_ranks).
+"""
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+RANK_DIGITS = 4
+
+
+def _to_int(key, length):
+    return int(key.ljust(length, '0'), BASE) if key else 0
+
+
+def _to_key(value, length):
+    digits = []
+    for _ in range(length):
+        value, digit = divmod(value, BASE)
+        digits.append(DIGITS[digit])
+    return ''.join(reversed(digits)).rstrip('0')
+
+
+def rank_between(low, high):
+    """low < kalit < high; low='' — ustun boshi, high=None — oxiri. Eng qisqa mos kalitlarning o'rtasi."""
+    if high is not None and low >= high:
+        raise ValueError(f"Rank {low!r} is not below {high!r}.")
+    length = 1
+    while True:
+        # low'ning pastga, high'ning yuqoriga yaxlitlangan `length` xonali qiymati
+        a = _to_int(low[:length], length)
+        b = BASE ** length if high is None else _to_int(high[:length], length) + (len(high) > length)
+        if b - a >= 2:
+            return _to_key((a + b) // 2, length)
+        length += 1
+
+
+def rank_after(key):
+    """Ustun oxiriga: `key`dan keyingi eng yaqin kalit (uzunlik o'smaydi, oxirgi xonaga +1)."""
+    if not key:
+        # bo'sh ustun — o'rtadan: ikki tomonga ham joy
+        return rank_between('', None)
+    length = max(len(key), RANK_DIGITS)
+    value = _to_int(key, length) + 1
+    if value < BASE ** length:
+        return _to_key(value, length)
+    return rank_between(key, None)
+
+
+def rank_before(key):
+    """Ustun boshiga: `key`dan oldingi eng yaqin kalit."""
+    length = max(len(key), RANK_DIGITS)
+    value = _to_int(key, length) - 1
+    if value > 0:
+        return _to_key(value, length)
+    return rank_between('', key)
+
+
+def spaced_ranks(count):
+    """`count` ta teng oraliqli kalit: har oraliqqa kamida BASE ta ko'chirish uzunliksiz sig'adi."""
+    length = RANK_DIGITS
+    while BASE ** length < (count + 1) * BASE:
+        length += 1
+    step = BASE ** length
+    return [_to_key((i + 1) * step // (count + 1), length) for i in range(count)]
@@ -0,0 +1,133 @@
+"""
+Sprint yopish (rollover): COMPLETED bo'lmagan task'lar keyingi sprint'ga bitta UPDATE bilan
+ko'chiriladi, eski sprint COMPLETED bo'ladi — hammasi bitta tranzaksiyada. Board'da ko'chgan
+task'lar yangi sprint ustunlari oxiriga, eski tartibida qo'yiladi (rank — o'sha UPDATE'da, CASE bilan).
+
+Assignee'lar through jadvalida task'ga bog'langan, shuning uchun ko'chirishda o'zgarmaydi.
+Audit: sprint uchun bitta summary qatori va har bir task uchun ixcham {"sprint": {"old", "new"}}
+qatori (rebuild_state shu diff'ni qo'llay oladi) — hammasi bitta bulk_create.
+"""
+import re
+
+from django.db import transaction
+from django.db.models import Case, CharField, Value, When
+from django.utils import timezone
+
+from audit.models import AuditLog
+from audit.utils import model_label, write_audit
+
+from .board import append_ranks
+from .models import Sprint, Task
+
+AUDIT_BATCH_SIZE = 1000
+
+
+def next_sprint_name(name):
+    """'Sprint 8' -> 'Sprint 9'; oxirida raqam bo'lmasa — '<name> 2'."""
+    match = re.search(r'(\d+)$', name)
+    if match:
+        return f"{name[:match.start()]}{int(match.group(1)) + 1}"
+    return f"{name} 2"
+
+
+def pick_next_sprint(sprint):
+    """Shu project'dagi keyinroq boshlanadigan, yopilmagan birinchi sprint (yoki None)."""
+    return (
+        Sprint.objects
+        .select_for_update()
+        .filter(project_id=sprint.project_id, start_date__gt=sprint.start_date)
+        .exclude(status=Sprint.Status.COMPLETED)
+        .exclude(pk=sprint.pk)
+        .order_by('start_date', 'pk')
+        .first()
+    )
+
+
+def close_sprint(sprint_id, next_sprint_id=None, name=None, user=None, request=None):
+    """
+    Qaytaradi: (eski sprint, keyingi sprint, yangi yaratildimi, ko'chirilgan task'lar soni).
+    `next_sprint_id` berilmasa keyingi sprint tanlanadi, bo'lmasa eski sprint tugagan paytdan
+    boshlanadigan (xuddi shu davomiylikdagi) yangi sprint yaratiladi. Xato — ValueError.
+    """
+    with transaction.atomic():
+        # parallel yopish (yoki shu sprint'ga task qo'shish) shu qatorda kutadi
+        sprint = Sprint.objects.select_for_update(of=('self',)).select_related('project').get(pk=sprint_id)
+        if sprint.status == Sprint.Status.COMPLETED:
+            raise ValueError("Sprint is already completed.")
+
+        created = False
+        if next_sprint_id is not None:
+            target = Sprint.objects.select_for_update().filter(pk=next_sprint_id).first()
+            if target is None or target.project_id != sprint.project_id:
+                raise ValueError("Next sprint must belong to the same project.")
+            if target.pk == sprint.pk or target.status == Sprint.Status.COMPLETED:
+                raise ValueError("Next sprint must be another sprint that is not completed.")
+        else:
+            target = pick_next_sprint(sprint)
+        if target is None:
+            target = Sprint.objects.create(
+                project=sprint.project,
+                name=name or next_sprint_name(sprint.name),
+                start_date=sprint.end_date,
+                duration_days=sprint.duration_days,
+            )
+            created = True
+            write_audit(action=AuditLog.Action.CREATE, instance=target, user=user, request=request)
+
+        # qatorlar qulflanadi: shu orada COMPLETED bo'lgan task ko'chib ketmaydi
+        tasks = list(
+            Task.objects.select_for_update()
+            .filter(sprint=sprint)
+            .exclude(status=Task.Status.COMPLETED)
+            .order_by('rank', 'pk')
+            .values_list('pk', 'title', 'status')
+        )
+        now = timezone.now()
+        moved = 0
+        if tasks:
+            ranks = append_ranks(target.pk, [(pk, status) for pk, _, status in tasks])
+            moved = Task.objects.filter(pk__in=ranks).update(
+                sprint=target,
+                rank=Case(*(When(pk=pk, then=Value(rank)) for pk, rank in ranks.items()), output_field=CharField()),
+                updated_at=now,
+            )
+
+        old_status = sprint.status
+        sprint.status = Sprint.Status.COMPLETED
+        sprint.save(update_fields=['status', 'updated_at'])
+
+        path = request.path if request else ""
+        method = request.method if request else ""
+        ip_address = request.META.get("REMOTE_ADDR") if request else None
+        label = model_label(Task)
+        logs = [AuditLog(
+            user=user,
+            action=AuditLog.Action.UPDATE,
+            model=model_label(Sprint),
+            object_id=str(sprint.pk),
+            object_repr=str(sprint)[:255],
+            changes={
+                "status": {"old": old_status, "new": sprint.status},
+                "rollover": {"next_sprint": target.pk, "created": created, "moved": moved},
+            },
+            path=path,
+            method=method,
+            ip_address=ip_address,
+        )]
+        logs += [
+            AuditLog(
+                user=user,
+                action=AuditLog.Action.UPDATE,
+                model=label,
+                object_id=str(pk),
+                object_repr=title[:255],
+                changes={"sprint": {"old": sprint.pk, "new": target.pk}},
+                path=path,
+                method=method,
+                ip_address=ip_address,
+            )
+            for pk, title, _ in tasks
+        ]
+        AuditLog.objects.bulk_create(logs, batch_size=AUDIT_BATCH_SIZE)
+
+    return sprint, target, created, moved
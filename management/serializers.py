@@ -1,5 +1,11 @@
+from django.conf import settings
+from django.templatetags.static import static
 from rest_framework import serializers
-from .models import Project, Sprint, Task
+from rest_framework.relations import MANY_RELATION_KWARGS
+from .models import Project, Sprint, Task, TaskUpload
+from .images import VARIANT_FORMATS
+from .storage import variant_storage
+from .uploads import ALLOWED_EXTENSIONS
 from accounts.models import User
 
 class ProjectSerializer(serializers.ModelSerializer):
@@ -28,6 +34,7 @@ class SprintSerializer(serializers.ModelSerializer):
             'name',
             'start_date',
             'duration_days',
+            'end_date',
             'status',
             'task_count',
             'created_at',
@@ -36,11 +43,52 @@ class SprintSerializer(serializers.ModelSerializer):
 
 
 
+class SprintCloseSerializer(serializers.Serializer):
+    next_sprint = serializers.IntegerField(required=False, help_text="Berilmasa keyingi sprint tanlanadi yoki yaratiladi")
+    name = serializers.CharField(required=False, max_length=100, help_text="Yangi sprint yaratilsa uning nomi")
+
+
+class BulkManyRelatedField(serializers.ManyRelatedField):
+    """many=True PK maydoni: har bir pk uchun alohida .get() o'rniga bitta IN so'rov."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+
+        child = self.child_relation
+        try:
+            found = {str(obj.pk): obj for obj in child.get_queryset().filter(pk__in=data)}
+        except (TypeError, ValueError):
+            # xato bo'lgan pk uchun odatdagi xabar
+            for pk in data:
+                child.to_internal_value(pk)
+            raise
+
+        for pk in data:
+            if str(pk) not in found:
+                child.fail('does_not_exist', pk_value=pk)
+        return [found[str(pk)] for pk in data]
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkManyRelatedField(**list_kwargs)
+
+
 class TaskSerializer(serializers.ModelSerializer):
-    assignees = serializers.PrimaryKeyRelatedField(
+    assignees = BulkPrimaryKeyRelatedField(
         many=True,
         queryset=User.objects.all()
     )
+    image_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Task
@@ -53,10 +101,63 @@ class TaskSerializer(serializers.ModelSerializer):
             'start_date',
             'due_date',
             'status',
+            'rank',
             'image',
+            'image_variants',
             'created_at',
             'updated_at',
         ]
 
+    def _absolute(self, url):
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+    def get_image_variants(self, obj):
+        # rasm hali qayta ishlanmagan bo'lsa — placeholder
+        if not obj.image:
+            return None
+        ready = bool(obj.image_variants)
+        placeholder = None if ready else self._absolute(static(settings.TASK_IMAGE_PLACEHOLDER))
+
+        variants = {'ready': ready}
+        for size_name in settings.TASK_IMAGE_VARIANTS:
+            names = obj.image_variants.get(size_name, {})
+            variants[size_name] = {
+                key: self._absolute(variant_storage.url(names[key])) if key in names else placeholder
+                for key, _, _ in VARIANT_FORMATS
+            }
+        return variants
+
 class TaskStatusUpdateSerializer(serializers.Serializer):
-    status = serializers.ChoiceField(choices=Task.Status.choices)
\ No newline at end of file
+    status = serializers.ChoiceField(choices=Task.Status.choices)
+
+
+class TaskMoveSerializer(serializers.Serializer):
+    status = serializers.ChoiceField(choices=Task.Status.choices, required=False,
+                                     help_text="Berilmasa task o'z ustunida qoladi")
+    after = serializers.IntegerField(required=False, allow_null=True, help_text="Shu task'dan keyin")
+    before = serializers.IntegerField(required=False, allow_null=True,
+                                      help_text="Shu task'dan oldin (ikkalasi ham bo'lmasa — ustun oxiriga)")
+
+
+class TaskUploadSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TaskUpload
+        fields = ['id', 'task', 'filename', 'size', 'sha256', 'offset', 'created_at', 'completed_at']
+        read_only_fields = ['id', 'task', 'offset', 'created_at', 'completed_at']
+
+    def validate_filename(self, value):
+        if not value.lower().endswith(ALLOWED_EXTENSIONS):
+            raise serializers.ValidationError(f"Allowed extensions: {', '.join(ALLOWED_EXTENSIONS)}.")
+        return value
+
+    def validate_size(self, value):
+        if value <= 0 or value > settings.TASK_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(f"Size must be between 1 and {settings.TASK_UPLOAD_MAX_SIZE} bytes.")
+        return value
+
+    def validate_sha256(self, value):
+        value = value.lower()
+        if value and (len(value) != 64 or any(c not in '0123456789abcdef' for c in value)):
+            raise serializers.ValidationError("Must be a hex encoded sha256 digest.")
+        return value
@@ -0,0 +1,82 @@
+"""
+Workload cache'ini (management/workload.py) API'dan tashqari yozuvlarda ham eskirtirish:
+admin, rollover (Sprint.save), shell, user roli/faolligi o'zgarishi, admin'dagi hard delete.
+
+Queryset.update() signal yubormaydi — bunday yo'llar (soft delete, restore, board ko'chirish)
+invalidate_workload'ni o'zlari chaqiradi.
+"""
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from accounts.models import User
+from audit.signals import post_bulk_hard_delete
+
+from .models import Project, Sprint, Task
+from .workload import invalidate_workload
+
+TaskAssignee = Task.assignees.through
+
+
+def _project_of_sprint(sprint_id):
+    return Sprint.all_objects.filter(pk=sprint_id).values_list('project_id', flat=True).first()
+
+
+@receiver(post_init, sender=Task)
+@receiver(post_init, sender=Sprint)
+def remember_parent(sender, instance, **kwargs):
+    # __dict__ orqali: deferred maydon bo'lsa so'rov qilinmaydi
+    parent = 'sprint_id' if sender is Task else 'project_id'
+    instance._workload_parent = instance.__dict__.get(parent)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def task_changed(sender, instance, **kwargs):
+    sprint = instance._state.fields_cache.get('sprint')
+    project_ids = [sprint.project_id if sprint is not None else _project_of_sprint(instance.sprint_id)]
+    old_sprint = getattr(instance, '_workload_parent', None)
+    if old_sprint is not None and old_sprint != instance.sprint_id:
+        project_ids.append(_project_of_sprint(old_sprint))
+    instance._workload_parent = instance.sprint_id
+    invalidate_workload(*project_ids)
+
+
+@receiver(post_save, sender=Sprint)
+@receiver(post_delete, sender=Sprint)
+def sprint_changed(sender, instance, **kwargs):
+    invalidate_workload(instance.project_id, getattr(instance, '_workload_parent', None))
+    instance._workload_parent = instance.project_id
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def project_changed(sender, instance, **kwargs):
+    invalidate_workload(instance.pk)
+
+
+@receiver(m2m_changed, sender=TaskAssignee)
+def assignees_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        task_changed(Task, instance)
+        return
+    # user.tasks.add(...) — pk_set task'lar (clear'da None: user'ning barcha project'lari eskiradi)
+    tasks = Task.all_objects.filter(pk__in=pk_set) if pk_set is not None else Task.all_objects.all()
+    invalidate_workload(*tasks.values_list('sprint__project_id', flat=True).distinct())
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    # umumiy javobdagi user ro'yxati (rol, faollik, ism); login vaqti bunga kirmaydi
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    invalidate_workload()
+
+
+@receiver(post_bulk_hard_delete)
+def hard_deleted(sender, **kwargs):
+    if sender not in (Project, Sprint, Task, User):
+        return
+    # o'chgan qatorlarning project'i endi aniqlanmaydi — barcha project kalitlari
+    invalidate_workload(*Project.all_objects.values_list('pk', flat=True))
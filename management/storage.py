@@ -0,0 +1,193 @@
+# management/storage.py
+import hashlib
+import os
+import re
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.functional import LazyObject
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+# task_images/ab/<sha256>.jpg — shu ko'rinishdagi fayllar hech qachon o'zgarmaydi
+CONTENT_ADDRESSED_RE = re.compile(r'(^|/)[0-9a-f]{2}/[0-9a-f]{64}(\.[a-z0-9]+)?$')
+
+
+def is_content_addressed(name):
+    return bool(CONTENT_ADDRESSED_RE.search(name or ''))
+
+
+def content_name(directory, digest, ext):
+    return os.path.join(directory, digest[:2], f"{digest}{ext.lower()}").replace('\\', '/')
+
+
+def hash_file(path):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(HASH_CHUNK_SIZE), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Fayl nomi — tarkibining sha256 xeshi. Yuklash oqim ko'rinishida vaqtinchalik faylga
+    yoziladi va shu paytda xesh hisoblanadi; bunday fayl allaqachon bo'lsa, nusxa tashlab
+    yuboriladi va mavjud nom qaytariladi (dedup).
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # nom _save ichida tarkibdan aniqlanadi
+        return name
+
+    def _save(self, name, content):
+        directory = os.path.dirname(name)
+        full_dir = self.path(directory)
+        os.makedirs(full_dir, exist_ok=True)
+
+        sha = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=full_dir, prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks(HASH_CHUNK_SIZE):
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode()
+                    sha.update(chunk)
+                    tmp.write(chunk)
+            return self.adopt(tmp_path, directory, os.path.splitext(name)[1], sha.hexdigest())
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def adopt(self, tmp_path, directory, ext, digest=None):
+        """
+        Storage ichidagi tayyor faylni (masalan, chunked upload) nusxalamasdan o'z nomiga ko'chiradi.
+        """
+        digest = digest or hash_file(tmp_path)
+        final_name = content_name(directory, digest, ext)
+        final_path = self.path(final_name)
+        if os.path.exists(final_path):
+            os.unlink(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(final_path), exist_ok=True)
+            if self.file_permissions_mode is not None:
+                os.chmod(tmp_path, self.file_permissions_mode)
+            os.replace(tmp_path, final_path)
+
+        register_blob(final_name, self.size(final_name))
+        return final_name
+
+
+def register_blob(name, size):
+    from django.utils import timezone
+
+    from .models import TaskImageBlob
+
+    blob, created = TaskImageBlob.objects.get_or_create(name=name, defaults={'size': size})
+    if not created:
+        # qayta yuklangan nusxa — GC grace davri yangidan boshlanadi
+        TaskImageBlob.objects.filter(pk=blob.pk).update(updated_at=timezone.now())
+
+
+class VariantStorage(FileSystemStorage):
+    """
+    Aniq nom bilan yozadi: vaqtinchalik fayl + os.replace, shuning uchun parallel yozuvchilar
+    nusxa (`_abc123`) yaratmaydi va o'quvchi yarim yozilgan faylni ko'rmaydi.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def _save(self, name, content):
+        full_path = self.path(name)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(full_path), prefix='.variant-')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                for chunk in content.chunks():
+                    tmp.write(chunk)
+            if self.file_permissions_mode is not None:
+                os.chmod(tmp_path, self.file_permissions_mode)
+            os.replace(tmp_path, full_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return name
+
+
+class TaskImageStorage(LazyObject):
+    def _setup(self):
+        self._wrapped = ContentAddressedStorage()
+
+
+class TaskImageVariantStorage(LazyObject):
+    def _setup(self):
+        self._wrapped = VariantStorage()
+
+
+task_image_storage = TaskImageStorage()
+variant_storage = TaskImageVariantStorage()
+
+
+def get_task_image_storage():
+    return task_image_storage
+
+
+def sync_ref_counts(names=None):
+    """
+    TaskImageBlob.ref_count ni Task jadvalidan qayta hisoblaydi: bitta GROUP BY + o'zgarganlar uchun UPDATE.
+    `names` berilmasa — barcha blob'lar.
+    """
+    from django.db.models import Count
+
+    from .models import Task, TaskImageBlob
+
+    blobs = TaskImageBlob.objects.all()
+    refs = Task.all_objects.exclude(image='').exclude(image__isnull=True)
+    if names is not None:
+        names = [name for name in names if name]
+        if not names:
+            return 0
+        blobs = blobs.filter(name__in=names)
+        refs = refs.filter(image__in=names)
+
+    counts = dict(refs.order_by().values('image').annotate(n=Count('pk')).values_list('image', 'n'))
+    changed = []
+    for blob in blobs.only('pk', 'name', 'ref_count'):
+        count = counts.get(blob.name, 0)
+        if blob.ref_count != count:
+            blob.ref_count = count
+            changed.append(blob)
+    TaskImageBlob.objects.bulk_update(changed, ['ref_count'], batch_size=1000)
+    return len(changed)
+
+
+def collect_garbage(grace, dry_run=False):
+    """
+    Hech bir task (soft-deleted'lar ham) ishora qilmaydigan blob'larni fayli va variantlari bilan o'chiradi.
+    `grace` dan yosh blob'lar tegilmaydi — yuklangan, lekin hali task'ga biriktirilmagan bo'lishi mumkin.
+    """
+    from django.conf import settings
+    from django.utils import timezone
+
+    from .images import VARIANT_FORMATS, variant_name
+    from .models import TaskImageBlob
+
+    sync_ref_counts()
+    garbage = TaskImageBlob.objects.filter(ref_count=0, updated_at__lt=timezone.now() - grace)
+    removed = []
+    for blob in garbage.iterator():
+        removed.append(blob.name)
+        if dry_run:
+            continue
+        task_image_storage.delete(blob.name)
+        for size_name in settings.TASK_IMAGE_VARIANTS:
+            for _, _, ext in VARIANT_FORMATS:
+                variant_storage.delete(variant_name(blob.name, size_name, ext))
+    if not dry_run and removed:
+        TaskImageBlob.objects.filter(name__in=removed, ref_count=0).delete()
+    return removed
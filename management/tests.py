@@ -1,3 +1,797 @@
-from django.test import TestCase
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from audit.models import AuditLog
+from audit.utils import bulk_hard_delete
+from config.db_router import PrimaryReplicaRouter, ReplicaRoutingMiddleware
+from management.active_sprint import resolve as resolve_active_sprint
+from management.board import columns_to_rebalance
+from management.digests import deliver, run_digests
+from management.images import build_variants, process_image, variant_name
+from management.media import image_lookup
+from management.models import DueDigest, Project, Sprint, Task
+from management.ranking import rank_before
+from management.serializers import ProjectSerializer, SprintSerializer
+from management.transfer import export_project, import_project
+from management.workload import get_workload
+
+
+def make_image(color='red', size=(400, 300), fmt='JPEG'):
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, fmt)
+    return buffer.getvalue()
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+class APITestCase(TestCase):
+    """
+    View testlari QueryBudgetMiddleware'ning strict rejimida: view o'z query_budget'idan oshsa,
+    so'rov QueryBudgetExceeded bilan yiqiladi.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user('owner@example.com', 'secret', name='Owner', role=User.Role.OWNER)
+        self.project = Project.objects.create(title='Project', pm=self.owner, start_date=timezone.now())
+        self.sprint = Sprint.objects.create(project=self.project, name='Sprint 1', start_date=timezone.now())
+        self.client = APIClient()
+        self.authenticate(self.owner)
+
+    def authenticate(self, user):
+        # force_authenticate emas: JWTAuthentication'ning user so'rovi ham budget'ga kirsin
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+
+    def make_tasks(self, sprint, status, count):
+        return [Task.objects.create(sprint=sprint, title=f'{status} {i}', status=status) for i in range(count)]
+
+    def column(self, sprint, status):
+        return list(Task.objects.filter(sprint=sprint, status=status).order_by('rank').values_list('pk', 'rank'))
+
+
+class MediaTestCase(APITestCase):
+    """MEDIA_ROOT — har bir test uchun vaqtinchalik papka; rasmlar shu joyda qayta ishlanadi."""
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp(prefix='task-media-')
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media_root, TASK_IMAGE_WORKERS=0)
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def write_media(self, name, data):
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as fh:
+            fh.write(data)
+        return path
+
+    def media_exists(self, name):
+        return os.path.exists(os.path.join(self.media_root, name))
+
+
+class VariantNameTests(MediaTestCase):
+
+    def test_legacy_files_with_same_stem_get_separate_variants(self):
+        names = ['task_images/a/logo.jpg', 'task_images/b/logo.jpg', 'task_images/logo.png']
+        self.write_media(names[0], make_image('red'))
+        self.write_media(names[1], make_image('blue'))
+        self.write_media(names[2], make_image('green', fmt='PNG'))
+
+        variants = [build_variants(name)['thumb']['webp'] for name in names]
+        self.assertEqual(len(set(variants)), 3)
+        for name, variant in zip(names, variants):
+            self.assertTrue(self.media_exists(variant))
+            Task.objects.create(sprint=self.sprint, title=name, image=name)
+            self.assertEqual(list(Task.objects.filter(image_lookup(variant)).values_list('image', flat=True)), [name])
+
+    def test_content_addressed_variant_is_named_by_hash(self):
+        digest = 'ab' * 32
+        name = f'task_images/ab/{digest}.jpg'
+        self.assertEqual(variant_name(name, 'thumb', 'webp'), f'task_images/variants/{digest}_thumb.webp')
+        Task.objects.create(sprint=self.sprint, title='CA', image=name)
+        self.assertTrue(Task.objects.filter(image_lookup(variant_name(name, 'thumb', 'jpg'))).exists())
+
+
+class DedupeTaskImagesTests(MediaTestCase):
+
+    def test_migrated_task_variants_follow_the_new_name(self):
+        data = make_image('red')
+        self.write_media('task_images/a/logo.jpg', data)
+        self.write_media('task_images/b/copy.jpg', data)
+        first = Task.objects.create(sprint=self.sprint, title='A', image='task_images/a/logo.jpg')
+        second = Task.objects.create(sprint=self.sprint, title='B', image='task_images/b/copy.jpg')
+        for task in (first, second):
+            process_image(task.image.name)
+        old_variants = [
+            name for task in Task.objects.order_by('pk')
+            for group in task.image_variants.values() for name in group.values()
+        ]
+
+        call_command('dedupe_task_images', stdout=io.StringIO())
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertEqual(first.image_variants, second.image_variants)
+        for name in old_variants:
+            self.assertFalse(self.media_exists(name), name)
+
+        url = first.image_variants['thumb']['webp']
+        self.assertTrue(url.startswith('task_images/variants/'))
+        response = self.client.get(f'/media/{url}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/webp')
+
+
+class ChunkedUploadTests(MediaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.task = Task.objects.create(sprint=self.sprint, title='Upload')
+
+    def upload(self, data, filename='photo.jpg', chunk_size=1024):
+        response = self.client.post(
+            f'/management/tasks/{self.task.pk}/uploads/', {'filename': filename, 'size': len(data)}, format='json',
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        upload_id = response.data['id']
+        for offset in range(0, len(data), chunk_size):
+            chunk = data[offset:offset + chunk_size]
+            response = self.client.put(
+                f'/management/uploads/{upload_id}/', chunk,
+                content_type='application/octet-stream', HTTP_UPLOAD_OFFSET=str(offset),
+            )
+            self.assertEqual(response.status_code, 200, response.content)
+        # variantlar commit'dan keyin yasaladi (TASK_IMAGE_WORKERS=0 — shu joyda)
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(f'/management/uploads/{upload_id}/finalize/')
+
+    def test_finalize_attaches_image_with_detected_extension(self):
+        data = make_image('blue', fmt='PNG')
+        response = self.upload(data, filename='photo.jpg')
+        self.assertEqual(response.status_code, 200, response.content)
+
+        self.task.refresh_from_db()
+        self.assertTrue(self.task.image.name.startswith('task_images/'))
+        self.assertTrue(self.task.image.name.endswith('.png'))
+        self.assertTrue(self.media_exists(self.task.image.name))
+        self.assertIn('thumb', self.task.image_variants)
+
+    def test_finalize_rejects_file_that_is_not_an_image(self):
+        response = self.upload(b'<?php echo 1; ?>' * 100)
+        self.assertEqual(response.status_code, 400)
+        self.task.refresh_from_db()
+        self.assertFalse(self.task.image)
+
+    def test_create_rejects_disallowed_extension(self):
+        response = self.client.post(
+            f'/management/tasks/{self.task.pk}/uploads/', {'filename': 'shell.php', 'size': 10}, format='json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('filename', response.data)
+
+
+class TaskMediaViewTests(MediaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.data = make_image('green')
+        self.name = 'task_images/photo.jpg'
+        self.write_media(self.name, self.data)
+        self.task = Task.objects.create(sprint=self.sprint, title='Photo', image=self.name)
+        self.url = f'/media/{self.name}'
+
+    def body(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_access_follows_task_visibility(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        dev = User.objects.create_user('dev@example.com', 'secret', name='Dev', role=User.Role.DEV)
+        self.authenticate(dev)
+        # boshqa birovning task'i — mavjudligi ham oshkor qilinmaydi
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.task.assignees.add(dev)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        viewer = User.objects.create_user('viewer@example.com', 'secret', name='Viewer', role=User.Role.VIEWER)
+        self.authenticate(viewer)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_unknown_and_unsafe_names_are_not_found(self):
+        self.write_media('task_images/orphan.jpg', self.data)
+        self.assertEqual(self.client.get('/media/task_images/orphan.jpg').status_code, 404)
+        self.assertEqual(self.client.get('/media/task_images/../secret.txt').status_code, 404)
+        self.assertEqual(self.client.get('/media/task_images/uploads/part').status_code, 404)
+
+    def test_etag_revalidation(self):
+        response = self.client.get(self.url)
+        self.assertEqual(self.body(response), self.data)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Cache-Control'], 'private, max-age=86400')
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_ranges(self):
+        size = len(self.data)
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 0-9/{size}')
+        self.assertEqual(self.body(response), self.data[:10])
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-5')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(self.body(response), self.data[-5:])
+
+        response = self.client.get(self.url, HTTP_RANGE=f'bytes={size}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{size}')
+
+        # If-Range eski ETag bilan — butun fayl
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), self.data)
+
+
+class ProjectTreeTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.task = Task.objects.create(sprint=self.sprint, title='T1', due_date=timezone.now())
+        self.task.assignees.add(self.owner)
+
+    def test_tree_uses_serializer_field_names_and_formats(self):
+        response = self.client.get(f'/management/projects/{self.project.pk}/tree/')
+        self.assertEqual(response.status_code, 200)
+        tree = json.loads(b''.join(response.streaming_content))
+
+        project = ProjectSerializer(self.project).data
+        self.assertEqual(tree['pm'], project['pm'])
+        self.assertNotIn('pm_id', tree)
+        self.assertEqual(tree['start_date'], project['start_date'])
+        sprint, = tree['sprints']
+        self.assertEqual(sprint['start_date'], SprintSerializer(self.sprint).data['start_date'])
+        task, = sprint['tasks']
+        self.assertEqual(task['due_date'], serializers.DateTimeField().to_representation(self.task.due_date))
+        self.assertEqual([user['id'] for user in task['assignees']], [self.owner.pk])
+
+
+class ViewQueryBudgetTests(MediaTestCase):
+    """Budget'lar metod bo'yicha: har bir so'rov strict rejimda, haqiqiy JWT bilan."""
+
+    def setUp(self):
+        super().setUp()
+        self.dev = User.objects.create_user('dev@example.com', 'secret', name='Dev', role=User.Role.DEV)
+        self.tasks = self.make_tasks(self.sprint, Task.Status.TO_DO, 3)
+        for task in self.tasks:
+            task.assignees.add(self.owner, self.dev)
+
+    def test_project_list_and_create(self):
+        Project.objects.create(title='Other', pm=self.owner)
+        response = self.client.get('/management/projects/')
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.post('/management/projects/', {'title': 'New', 'pm': self.owner.pk}, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+
+    def test_task_list_and_create_with_image(self):
+        response = self.client.get('/management/tasks/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/management/tasks/', {
+                'sprint': self.sprint.pk, 'title': 'With image', 'assignees': [self.dev.pk],
+                'image': SimpleUploadedFile('photo.png', make_image(fmt='PNG'), content_type='image/png'),
+            })
+        self.assertEqual(response.status_code, 201, response.content)
+
+    def test_task_detail_get_and_patch(self):
+        task = self.tasks[0]
+        response = self.client.get(f'/management/tasks/{task.pk}/')
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.patch(
+            f'/management/tasks/{task.pk}/', {'status': Task.Status.IN_PROGRESS}, format='multipart',
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def test_dev_changes_status_of_own_task(self):
+        self.authenticate(self.dev)
+        response = self.client.patch(
+            f'/management/tasks/{self.tasks[0].pk}/change-status/', {'status': Task.Status.IN_PROGRESS}, format='json',
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data['status'], Task.Status.IN_PROGRESS)
+
+    def test_board_and_tree_as_dev(self):
+        self.authenticate(self.dev)
+        response = self.client.get(f'/management/sprints/{self.sprint.pk}/board/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['columns'][Task.Status.TO_DO]), 3)
+
+        response = self.client.get(f'/management/projects/{self.project.pk}/tree/')
+        self.assertEqual(response.status_code, 200)
+        tree = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(len(tree['sprints'][0]['tasks']), 3)
+
+    def test_project_delete(self):
+        response = self.client.delete(f'/management/projects/{self.project.pk}/')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertIn('deleted_batch', response.data)
+
+
+class SoftDeleteTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tasks = self.make_tasks(self.sprint, Task.Status.TO_DO, 2)
+
+    def delete(self, url):
+        response = self.client.delete(url)
+        # 204 emas: restore uchun batch javobda
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.data['deleted_batch']
+
+    def test_delete_cascades_with_one_batch_and_keeps_earlier_deletions(self):
+        earlier = self.tasks[1].soft_delete()
+        batch = self.delete(f'/management/projects/{self.project.pk}/')
+
+        self.assertFalse(Project.objects.filter(pk=self.project.pk).exists())
+        self.assertEqual(Sprint.all_objects.get(pk=self.sprint.pk).deleted_batch, batch)
+        self.assertEqual(Task.all_objects.get(pk=self.tasks[0].pk).deleted_batch, batch)
+        self.assertEqual(Task.all_objects.get(pk=self.tasks[1].pk).deleted_batch, earlier)
+        self.assertTrue(AuditLog.objects.filter(
+            action=AuditLog.Action.SOFT_DELETE, model='management.Project', object_id=str(self.project.pk),
+        ).exists())
+
+    def test_restore_batch_restores_only_its_rows(self):
+        earlier = self.tasks[1].soft_delete()
+        batch = self.project.soft_delete()
+
+        self.assertEqual(Project.restore_batch(batch), 3)
+        self.assertTrue(Task.objects.filter(pk=self.tasks[0].pk).exists())
+        self.assertEqual(Task.all_objects.get(pk=self.tasks[1].pk).deleted_batch, earlier)
+
+    def test_restore_view(self):
+        batch = self.delete(f'/management/sprints/{self.sprint.pk}/')
+
+        response = self.client.post(f'/management/restore/{batch}/')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data, {'model': 'management.Sprint', 'id': self.sprint.pk, 'restored': 3})
+        self.assertEqual(Task.objects.filter(sprint=self.sprint).count(), 2)
+        self.assertTrue(AuditLog.objects.filter(action=AuditLog.Action.RESTORE, object_id=str(self.sprint.pk)).exists())
+
+        response = self.client.post(f'/management/restore/{batch}/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_sprint_under_deleted_project_needs_project_restored_first(self):
+        sprint_batch = self.delete(f'/management/sprints/{self.sprint.pk}/')
+        project_batch = self.delete(f'/management/projects/{self.project.pk}/')
+
+        response = self.client.post(f'/management/restore/{sprint_batch}/')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('detail', response.data)
+        self.assertTrue(Sprint.all_objects.get(pk=self.sprint.pk).is_deleted)
+
+        response = self.client.post(f'/management/restore/{project_batch}/')
+        self.assertEqual(response.data['restored'], 1)
+        response = self.client.post(f'/management/restore/{sprint_batch}/')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(Task.objects.filter(sprint__project=self.project).count(), 2)
+
+
+class WorkloadInvalidationTests(APITestCase):
+    """API'dan tashqari yozuvlar (admin, rollover, shell) ham workload cache'ini eskirtiradi."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.dev = User.objects.create_user('dev@example.com', 'secret', name='Dev', role=User.Role.DEV)
+        self.task, = self.make_tasks(self.sprint, Task.Status.TO_DO, 1)
+
+    def open_tasks(self, user, project=None):
+        rows = {row['user']: row for row in get_workload(project)['users']}
+        return rows[user.pk]['open'] if user.pk in rows else None
+
+    def test_orm_writes_invalidate_cached_workload(self):
+        self.assertEqual(self.open_tasks(self.dev), 0)
+        self.assertEqual(self.open_tasks(self.dev, self.project.pk), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.assignees.add(self.dev)
+        self.assertEqual(self.open_tasks(self.dev), 1)
+        self.assertEqual(self.open_tasks(self.dev, self.project.pk), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.status = Task.Status.COMPLETED
+            self.task.save()
+        self.assertEqual(self.open_tasks(self.dev), 0)
+
+    def test_task_moved_to_other_project_leaves_old_project(self):
+        self.task.assignees.add(self.dev)
+        other = Project.objects.create(title='Other', pm=self.owner)
+        other_sprint = Sprint.objects.create(project=other, name='Other 1', start_date=timezone.now())
+        self.assertEqual(self.open_tasks(self.dev, self.project.pk), 1)
+
+        task = Task.objects.get(pk=self.task.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            task.sprint = other_sprint
+            task.save()
+        self.assertEqual(self.open_tasks(self.dev, self.project.pk), 0)
+        self.assertEqual(self.open_tasks(self.dev, other.pk), 1)
+
+    def test_role_change_and_hard_delete(self):
+        self.task.assignees.add(self.dev)
+        self.assertEqual(self.open_tasks(self.dev), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_hard_delete(Task.all_objects.filter(pk=self.task.pk))
+        self.assertEqual(self.open_tasks(self.dev), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dev.role = User.Role.VIEWER
+            self.dev.save()
+        self.assertIsNone(self.open_tasks(self.dev))
+
+
+class SprintCloseTests(APITestCase):
+
+    def close(self, sprint, **data):
+        return self.client.post(f'/management/sprints/{sprint.pk}/close/', data, format='json')
+
+    def test_creates_next_sprint_and_moves_unfinished_tasks(self):
+        dev = User.objects.create_user('dev@example.com', 'secret', name='Dev', role=User.Role.DEV)
+        todo = self.make_tasks(self.sprint, Task.Status.TO_DO, 2)
+        done = self.make_tasks(self.sprint, Task.Status.COMPLETED, 1)
+        todo[0].assignees.add(dev)
+
+        response = self.close(self.sprint)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertTrue(response.data['created'])
+        self.assertEqual(response.data['moved'], 2)
+
+        target = Sprint.objects.get(pk=response.data['next_sprint']['id'])
+        self.assertEqual(target.name, 'Sprint 2')
+        self.assertEqual(target.start_date, self.sprint.end_date)
+        self.sprint.refresh_from_db()
+        self.assertEqual(self.sprint.status, Sprint.Status.COMPLETED)
+        self.assertEqual(set(target.tasks.values_list('pk', flat=True)), {task.pk for task in todo})
+        self.assertEqual(Task.objects.get(pk=done[0].pk).sprint_id, self.sprint.pk)
+        self.assertEqual(list(todo[0].assignees.all()), [dev])
+
+        # sprint summary + yangi sprint CREATE + har bir task uchun sprint diff'i
+        logs = AuditLog.objects.filter(model='management.Task').values_list('object_id', 'changes')
+        self.assertEqual(
+            sorted(logs), sorted((str(task.pk), {'sprint': {'old': self.sprint.pk, 'new': target.pk}}) for task in todo),
+        )
+        summary = AuditLog.objects.get(model='management.Sprint', object_id=str(self.sprint.pk))
+        self.assertEqual(summary.changes['rollover'], {'next_sprint': target.pk, 'created': True, 'moved': 2})
+        self.assertTrue(AuditLog.objects.filter(
+            model='management.Sprint', object_id=str(target.pk), action=AuditLog.Action.CREATE,
+        ).exists())
+
+    def test_keeps_each_column_order_in_target(self):
+        target = Sprint.objects.create(
+            project=self.project, name='Sprint 2', start_date=self.sprint.start_date + timedelta(days=7),
+        )
+        todo = self.make_tasks(self.sprint, Task.Status.TO_DO, 3)
+        review = self.make_tasks(self.sprint, Task.Status.PM_REVIEW, 2)
+        # manba ustunidagi tartib pk tartibidan farq qiladi
+        Task.objects.filter(pk=todo[2].pk).update(rank=rank_before(todo[0].rank))
+        Task.objects.filter(pk=review[1].pk).update(rank=rank_before(review[0].rank))
+
+        response = self.close(self.sprint, next_sprint=target.pk)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertFalse(response.data['created'])
+
+        self.assertEqual(
+            [pk for pk, _ in self.column(target, Task.Status.TO_DO)], [todo[2].pk, todo[0].pk, todo[1].pk],
+        )
+        self.assertEqual([pk for pk, _ in self.column(target, Task.Status.PM_REVIEW)], [review[1].pk, review[0].pk])
+
+    def test_rejects_completed_or_foreign_target(self):
+        other = Project.objects.create(title='Other', pm=self.owner, start_date=timezone.now())
+        foreign = Sprint.objects.create(project=other, name='Sprint 1', start_date=timezone.now())
+
+        response = self.close(self.sprint, next_sprint=foreign.pk)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Sprint.objects.get(pk=self.sprint.pk).status, self.sprint.status)
+
+        Sprint.objects.filter(pk=self.sprint.pk).update(status=Sprint.Status.COMPLETED)
+        response = self.close(self.sprint)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Sprint.objects.filter(project=self.project).count(), 1)
+
+    def test_developer_cannot_close(self):
+        dev = User.objects.create_user('dev@example.com', 'secret', name='Dev', role=User.Role.DEV)
+        self.authenticate(dev)
+
+        self.assertEqual(self.close(self.sprint).status_code, 403)
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaCacheFillTests(TransactionTestCase):
+    """
+    Cache'ga yoziladigan qiymatlar GET so'rovi replica'ga yo'naltirilganda ham primary'dan hisoblanadi.
+    TransactionTestCase: tranzaksiya ichidagi o'qishlarni router baribir primary'ga yuboradi.
+    """
+
+    def setUp(self):
+        cache.clear()
+        owner = User.objects.create_user('owner@example.com', 'secret', name='Owner', role=User.Role.OWNER)
+        self.project = Project.objects.create(title='Project', pm=owner, start_date=timezone.now())
+        sprint = Sprint.objects.create(project=self.project, name='Sprint 1', start_date=timezone.now())
+        Task.objects.create(sprint=sprint, title='Task').assignees.add(owner)
+
+    def reads(self, fill):
+        """GET so'rovi ichida `fill()`; qaytadi: [(model, router tanlagan alias)]."""
+        seen = []
+        route = PrimaryReplicaRouter.db_for_read
+
+        def record(router, model, **hints):
+            seen.append((model._meta.label, route(router, model, **hints)))
+            # 'replica' alias'i testda yo'q — so'rov baribir primary'da bajariladi
+            return DEFAULT_DB_ALIAS
+
+        def view(request):
+            fill()
+            return HttpResponse()
+
+        with mock.patch.object(PrimaryReplicaRouter, 'db_for_read', record):
+            ReplicaRoutingMiddleware(view)(RequestFactory().get('/'))
+        return seen
+
+    def test_active_sprint_fill_reads_primary(self):
+        seen = self.reads(lambda: resolve_active_sprint(self.project.pk))
+
+        self.assertTrue(seen)
+        self.assertEqual({alias for _, alias in seen}, {DEFAULT_DB_ALIAS})
+        # cache'dan — bazaga umuman borilmaydi
+        self.assertEqual(self.reads(lambda: resolve_active_sprint(self.project.pk)), [])
+
+    def test_workload_fill_reads_primary(self):
+        seen = self.reads(lambda: get_workload(self.project.pk))
+
+        # cache'lanmaydigan user ro'yxati replica'dan, project yozuvi esa primary'dan
+        self.assertEqual({label for label, alias in seen if alias == 'replica'}, {'accounts.User'})
+        self.assertIn(DEFAULT_DB_ALIAS, {alias for label, alias in seen if label != 'accounts.User'})
+
+        seen = self.reads(get_workload)
+        self.assertTrue(seen)
+        self.assertEqual({alias for _, alias in seen}, {DEFAULT_DB_ALIAS})
+
+
+class BoardRankTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.next_sprint = Sprint.objects.create(
+            project=self.project, name='Sprint 2', start_date=self.sprint.start_date + timedelta(days=7),
+        )
+
+    def assert_unique_ranks(self, sprint, status):
+        ranks = [rank for _, rank in self.column(sprint, status)]
+        self.assertEqual(len(ranks), len(set(ranks)), ranks)
+        self.assertNotIn('', ranks)
+
+    def test_status_change_appends_to_destination_column(self):
+        todo = self.make_tasks(self.sprint, Task.Status.TO_DO, 2)
+        done = self.make_tasks(self.sprint, Task.Status.IN_PROGRESS, 2)
+
+        response = self.client.patch(
+            f'/management/tasks/{todo[0].pk}/change-status/', {'status': Task.Status.IN_PROGRESS}, format='json',
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            [pk for pk, _ in self.column(self.sprint, Task.Status.IN_PROGRESS)], [done[0].pk, done[1].pk, todo[0].pk],
+        )
+        self.assert_unique_ranks(self.sprint, Task.Status.IN_PROGRESS)
+
+    def test_detail_patch_to_other_sprint_appends_to_its_column(self):
+        task, = self.make_tasks(self.sprint, Task.Status.TO_DO, 1)
+        existing = self.make_tasks(self.next_sprint, Task.Status.TO_DO, 2)
+
+        response = self.client.patch(
+            f'/management/tasks/{task.pk}/', {'sprint': self.next_sprint.pk}, format='multipart',
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            [pk for pk, _ in self.column(self.next_sprint, Task.Status.TO_DO)], [existing[0].pk, existing[1].pk, task.pk],
+        )
+
+    def test_close_sprint_appends_after_target_tail(self):
+        moved = self.make_tasks(self.sprint, Task.Status.TO_DO, 3)
+        self.make_tasks(self.sprint, Task.Status.IN_PROGRESS, 1)
+        existing = self.make_tasks(self.next_sprint, Task.Status.TO_DO, 2)
+
+        response = self.client.post(f'/management/sprints/{self.sprint.pk}/close/', {}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data['moved'], 4)
+
+        self.assertEqual(
+            [pk for pk, _ in self.column(self.next_sprint, Task.Status.TO_DO)],
+            [task.pk for task in existing + moved],
+        )
+        for status in (Task.Status.TO_DO, Task.Status.IN_PROGRESS):
+            self.assert_unique_ranks(self.next_sprint, status)
+
+    def test_board_view_returns_columns_in_rank_order(self):
+        todo = self.make_tasks(self.sprint, Task.Status.TO_DO, 3)
+        # oxirgisi boshiga
+        Task.objects.filter(pk=todo[2].pk).update(rank=rank_before(todo[0].rank))
+
+        response = self.client.get(f'/management/sprints/{self.sprint.pk}/board/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.data['columns']), Task.Status.values)
+        self.assertEqual(
+            [item['id'] for item in response.data['columns'][Task.Status.TO_DO]], [todo[2].pk, todo[0].pk, todo[1].pk],
+        )
+
+    def test_move_between_neighbours_and_to_other_column(self):
+        a, b, c = self.make_tasks(self.sprint, Task.Status.TO_DO, 3)
+        doing, = self.make_tasks(self.sprint, Task.Status.IN_PROGRESS, 1)
+
+        response = self.client.post(f'/management/tasks/{c.pk}/move/', {'after': a.pk, 'before': b.pk}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual([pk for pk, _ in self.column(self.sprint, Task.Status.TO_DO)], [a.pk, c.pk, b.pk])
+
+        response = self.client.post(
+            f'/management/tasks/{a.pk}/move/', {'status': Task.Status.IN_PROGRESS, 'before': doing.pk}, format='json',
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual([pk for pk, _ in self.column(self.sprint, Task.Status.IN_PROGRESS)], [a.pk, doing.pk])
+
+        response = self.client.post(f'/management/tasks/{b.pk}/move/', {'after': doing.pk}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_move_between_equal_ranks_rebalances_the_column(self):
+        a, b, c = self.make_tasks(self.sprint, Task.Status.TO_DO, 3)
+        # parallel ko'chirishlar natijasi: qo'shnilar kaliti bir xil
+        Task.objects.filter(pk__in=[a.pk, b.pk]).update(rank='k')
+
+        response = self.client.post(f'/management/tasks/{c.pk}/move/', {'after': a.pk, 'before': b.pk}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual([pk for pk, _ in self.column(self.sprint, Task.Status.TO_DO)], [a.pk, c.pk, b.pk])
+        self.assert_unique_ranks(self.sprint, Task.Status.TO_DO)
+
+    def test_rebalance_ranks_command_fixes_bulk_created_and_long_keys(self):
+        Task.objects.bulk_create([Task(sprint=self.sprint, title=f'bulk {i}') for i in range(3)])
+        long_key, = self.make_tasks(self.next_sprint, Task.Status.TO_DO, 1)
+        Task.objects.filter(pk=long_key.pk).update(rank='i' * 40)
+
+        call_command('rebalance_ranks', max_length=16, stdout=io.StringIO())
+        self.assert_unique_ranks(self.sprint, Task.Status.TO_DO)
+        self.assertLessEqual(len(self.column(self.next_sprint, Task.Status.TO_DO)[0][1]), 16)
+        self.assertEqual(columns_to_rebalance(16), [])
+
+class ProjectTransferTests(MediaTestCase):
+
+    def test_export_import_round_trip(self):
+        dev = User.objects.create_user('dev@example.com', 'secret', name='Dev', role=User.Role.DEV)
+        tasks = self.make_tasks(self.sprint, Task.Status.TO_DO, 3)
+        tasks[0].assignees.add(dev)
+        self.write_media('task_images/legacy.jpg', make_image('red'))
+        Task.objects.filter(pk=tasks[1].pk).update(image='task_images/legacy.jpg')
+        deleted = Sprint.objects.create(project=self.project, name='Old', start_date=timezone.now())
+        deleted.soft_delete()
+
+        archive = io.BytesIO()
+        manifest = export_project(self.project.pk, archive)
+        self.assertEqual(manifest['missing_files'], [])
+        archive.seek(0)
+        with self.captureOnCommitCallbacks(execute=True):
+            project, counts = import_project(archive)
+
+        self.assertNotEqual(project.pk, self.project.pk)
+        self.assertEqual(project.title, self.project.title)
+        self.assertEqual(project.pm_id, self.owner.pk)
+        copied = list(Task.objects.filter(sprint__project=project).order_by('rank'))
+        self.assertEqual([task.title for task in copied], [task.title for task in tasks])
+        self.assertEqual([task.rank for task in copied], [task.rank for task in tasks])
+        self.assertEqual(list(copied[0].assignees.values_list('pk', flat=True)), [dev.pk])
+        self.assertTrue(copied[1].image and self.media_exists(copied[1].image.name))
+        self.assertTrue(Sprint.all_objects.filter(project=project, name='Old', is_deleted=True).exists())
+
+    def test_reimported_deleted_rows_get_their_own_batch(self):
+        deleted = Sprint.objects.create(project=self.project, name='Old', start_date=timezone.now())
+        self.make_tasks(deleted, Task.Status.TO_DO, 2)
+        batch = deleted.soft_delete()
+
+        archive = io.BytesIO()
+        export_project(self.project.pk, archive)
+        archive.seek(0)
+        with self.captureOnCommitCallbacks(execute=True):
+            project, counts = import_project(archive)
+
+        copy = Sprint.all_objects.get(project=project, name='Old')
+        self.assertNotEqual(copy.deleted_batch, batch)
+        self.assertEqual(
+            set(Task.all_objects.filter(sprint=copy).values_list('deleted_batch', flat=True)), {copy.deleted_batch},
+        )
+        # nusxani tiklash asl loyihaga tegmaydi
+        Sprint.restore_batch(copy.deleted_batch)
+        self.assertTrue(Sprint.all_objects.get(pk=deleted.pk).is_deleted)
+        self.assertFalse(Task.all_objects.filter(sprint=copy, is_deleted=True).exists())
+
+
+class RecordingNotifier:
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, digest):
+        self.sent.append(digest.payload)
+
+
+class DueDigestTests(APITestCase):
+
+    def test_each_task_is_reported_once_per_state(self):
+        now = timezone.now()
+        dev = User.objects.create_user('dev@example.com', 'secret', name='Dev', role=User.Role.DEV)
+        overdue = Task.objects.create(sprint=self.sprint, title='Overdue', due_date=now - timedelta(hours=2))
+        soon = Task.objects.create(sprint=self.sprint, title='Soon', due_date=now + timedelta(hours=3))
+        done = Task.objects.create(
+            sprint=self.sprint, title='Done', due_date=now + timedelta(hours=1), status=Task.Status.COMPLETED,
+        )
+        for task in (overdue, soon, done):
+            task.assignees.add(dev)
+
+        self.assertEqual(run_digests(now=now), 1)
+        notifier = RecordingNotifier()
+        self.assertEqual(deliver(notifier=notifier), (1, 0))
+        payload, = notifier.sent
+        self.assertEqual(payload['email'], dev.email)
+        self.assertEqual([task['id'] for task in payload['overdue']], [overdue.pk])
+        self.assertEqual([task['id'] for task in payload['due_soon']], [soon.pk])
+
+        # keyingi ishga tushish: oynalar davom etadi, yangi holat bo'lmasa digest yo'q
+        self.assertEqual(run_digests(now=now + timedelta(minutes=15)), 0)
+        # yaqin muddatli task muddati o'tdi — endi overdue sifatida bir marta
+        later = now + timedelta(hours=4)
+        self.assertEqual(run_digests(now=later), 1)
+        self.assertEqual(deliver(notifier=notifier), (1, 0))
+        self.assertEqual([task['id'] for task in notifier.sent[1]['overdue']], [soon.pk])
+        self.assertEqual(DueDigest.objects.filter(sent_at__isnull=True).count(), 0)
+
+
+class CalendarTests(APITestCase):
+
+    def test_calendar_returns_overlapping_sprints_and_tasks(self):
+        now = self.sprint.start_date
+        inside = Task.objects.create(sprint=self.sprint, title='Inside', start_date=now, due_date=now + timedelta(days=2))
+        Task.objects.create(sprint=self.sprint, title='Later', due_date=now + timedelta(days=60))
+
+        response = self.client.get('/management/calendar/', {
+            'from': (now - timedelta(days=1)).isoformat(), 'to': (now + timedelta(days=3)).isoformat(),
+        })
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual([sprint['id'] for sprint in response.data['sprints']], [self.sprint.pk])
+        self.assertEqual([task['id'] for task in response.data['tasks']], [inside.pk])
+
+    def test_calendar_rejects_too_long_range(self):
+        now = self.sprint.start_date
+        response = self.client.get('/management/calendar/', {
+            'from': now.isoformat(), 'to': (now + timedelta(days=400)).isoformat(),
+        })
+        self.assertEqual(response.status_code, 400)
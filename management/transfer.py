@@ -0,0 +1,444 @@
+# management/transfer.py
+"""
+Project -> Sprint -> Task daraxtini bitta arxivga eksport / arxivdan import.
+
+Arxiv — oqimli tar.gz (seek talab qilinmaydi, stdout/stdin bilan ishlaydi), a'zolar tartibi qat'iy:
+
+    manifest.json           format, versiya, qator soni, fayllar ro'yxati
+    data/users.jsonl        daraxtda ishora qilingan user'lar (email bo'yicha moslanadi)
+    data/projects.jsonl
+    data/sprints.jsonl
+    images/<nom>            task rasmlari (bir xil fayl bir marta)
+    data/tasks.jsonl
+    data/task_assignees.jsonl
+    data/audit_logs.jsonl   loyiha, sprint va task'larga tegishli audit yozuvlari
+
+Soft-deleted qatorlar ham ko'chadi; har bir deleted_batch import paytida yangi UUID oladi (bitta
+batch'dagi qatorlar birga qoladi, lekin asl loyiha batch'lari bilan aralashmaydi). Import bitta
+tranzaksiyada, yangi pk'lar bilan; eski -> yangi pk xaritasi faqat butun son juftliklari, qatorlar
+esa batch'lab o'qiladi.
+
+PostgreSQL'da qatorlar COPY bilan o'qiladi/yoziladi (ORM obyektlarisiz); yangi pk'lar sequence'dan
+oldindan olinadi, shuning uchun parallel yozuvlar bilan ham xarita to'g'ri. Boshqa bazalarda — ORM.
+"""
+import gzip
+import json
+import posixpath
+import shutil
+import tarfile
+import tempfile
+import uuid
+from contextlib import contextmanager
+from io import BytesIO
+
+from django.core.files import File
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import CharField, Q
+from django.db.models.functions import Cast
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from accounts.models import User
+from audit.models import AuditLog
+
+from .images import enqueue_task_image
+from .media import clean_media_name
+from .models import Project, Sprint, Task, sprint_end_date
+from .storage import HASH_CHUNK_SIZE, sync_ref_counts, task_image_storage
+from .workload import invalidate_workload
+
+FORMAT = 'botm-project'
+VERSION = 1
+BATCH_SIZE = 2000
+COMPRESS_LEVEL = 6
+# JSONL a'zolari shu hajmgacha xotirada, undan keyin vaqtinchalik faylda yig'iladi
+SPOOL_SIZE = 8 * 1024 * 1024
+
+TaskAssignee = Task.assignees.through
+
+USER_FIELDS = ('id', 'email', 'name', 'role', 'is_active')
+PROJECT_FIELDS = ('id', 'title', 'start_date', 'end_date', 'status', 'pm_id',
+                  'is_deleted', 'deleted_at', 'deleted_batch', 'created_at', 'updated_at')
+SPRINT_FIELDS = ('id', 'project_id', 'name', 'start_date', 'duration_days', 'status',
+                 'is_deleted', 'deleted_at', 'deleted_batch', 'created_at', 'updated_at')
+TASK_FIELDS = ('id', 'sprint_id', 'title', 'description', 'start_date', 'due_date', 'status', 'image', 'rank',
+               'is_deleted', 'deleted_at', 'deleted_batch', 'created_at', 'updated_at')
+ASSIGNEE_FIELDS = ('task_id', 'user_id')
+AUDIT_FIELDS = ('user_id', 'action', 'model', 'object_id', 'object_repr', 'changes',
+                'path', 'method', 'ip_address', 'created_at')
+
+# audit yozuvidagi model -> import paytidagi pk xaritasi
+AUDIT_MODELS = {
+    Project._meta.label: 'projects',
+    Sprint._meta.label: 'sprints',
+    Task._meta.label: 'tasks',
+}
+
+
+class ArchiveError(Exception):
+    pass
+
+
+# ============================
+#           Export
+# ============================
+
+def _as_text(queryset):
+    # AuditLog.object_id — matn
+    return queryset.annotate(pk_text=Cast('pk', CharField())).values('pk_text')
+
+
+def project_querysets(project_id):
+    sprints = Sprint.all_objects.filter(project_id=project_id)
+    tasks = Task.all_objects.filter(sprint__project_id=project_id)
+    assignees = TaskAssignee.objects.filter(task__sprint__project_id=project_id)
+    audit_logs = AuditLog.objects.filter(
+        Q(model=Project._meta.label, object_id=str(project_id))
+        | Q(model=Sprint._meta.label, object_id__in=_as_text(sprints))
+        | Q(model=Task._meta.label, object_id__in=_as_text(tasks))
+    )
+    users = User.all_objects.filter(
+        Q(managed_projects__id=project_id)
+        | Q(pk__in=assignees.values('user_id'))
+        | Q(pk__in=audit_logs.exclude(user_id=None).values('user_id'))
+    ).distinct()
+    return {
+        'users': users,
+        'projects': Project.all_objects.filter(pk=project_id),
+        'sprints': sprints,
+        'tasks': tasks,
+        'task_assignees': assignees,
+        'audit_logs': audit_logs,
+    }
+
+
+EXPORT_MEMBERS = (
+    ('users', USER_FIELDS),
+    ('projects', PROJECT_FIELDS),
+    ('sprints', SPRINT_FIELDS),
+    ('images', None),
+    ('tasks', TASK_FIELDS),
+    ('task_assignees', ASSIGNEE_FIELDS),
+    ('audit_logs', AUDIT_FIELDS),
+)
+
+
+def _add_bytes(tar, name, data):
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mtime = int(timezone.now().timestamp())
+    tar.addfile(info, BytesIO(data))
+
+
+def _json_lines(queryset, fields):
+    """Har bir qator — bitta JSON satr (str)."""
+    if connection.vendor == 'postgresql':
+        # JSON'ni bazaning o'zi yasaydi: Python'da datetime/UUID konvertatsiyasi yo'q
+        sql, params = queryset.values(*fields).query.sql_with_params()
+        with connection.cursor() as cursor:
+            # DEBUG'dagi CursorDebugWrapper.copy() parametr qabul qilmaydi — psycopg kursorining o'zi
+            with cursor.cursor.copy(f"COPY (SELECT row_to_json(r)::text FROM ({sql}) r) TO STDOUT", params) as copy:
+                copy.set_types(['text'])
+                for (line,) in copy.rows():
+                    yield line
+        return
+
+    encoder = DjangoJSONEncoder(separators=(',', ':'), ensure_ascii=False)
+    for row in queryset.values(*fields).iterator(chunk_size=BATCH_SIZE):
+        yield encoder.encode(row)
+
+
+def _add_jsonl(tar, name, lines):
+    # tar sarlavhasiga hajm kerak — avval spool'ga yoziladi
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE) as spool:
+        for line in lines:
+            spool.write(line.encode())
+            spool.write(b'\n')
+        info = tarfile.TarInfo(name)
+        info.size = spool.tell()
+        info.mtime = int(timezone.now().timestamp())
+        spool.seek(0)
+        tar.addfile(info, spool)
+
+
+def export_project(project_id, fileobj, report=None):
+    """
+    Loyihani `fileobj`ga (yozish uchun ochilgan, seek shart emas) tar.gz sifatida yozadi.
+    Qaytadi: manifest.
+    """
+    report = report or (lambda message: None)
+    if not Project.all_objects.filter(pk=project_id).exists():
+        raise ArchiveError(f"Project {project_id} does not exist.")
+
+    querysets = project_querysets(project_id)
+    image_names = list(
+        querysets['tasks'].exclude(image='').exclude(image__isnull=True)
+        .order_by('image').values_list('image', flat=True).distinct()
+    )
+    files = []
+    for name in image_names:
+        if task_image_storage.exists(name):
+            files.append({'name': name, 'size': task_image_storage.size(name)})
+
+    manifest = {
+        'format': FORMAT,
+        'version': VERSION,
+        'exported_at': timezone.now(),
+        'project': project_id,
+        'counts': {key: qs.count() for key, qs in querysets.items()},
+        'files': files,
+        'missing_files': sorted(set(image_names) - {f['name'] for f in files}),
+    }
+
+    # tarfile'ning 'w|gz' rejimi har doim 9-daraja siqadi — gzip alohida, tezroq darajada
+    with gzip.GzipFile(fileobj=fileobj, mode='wb', compresslevel=COMPRESS_LEVEL) as gz, \
+            tarfile.open(fileobj=gz, mode='w|') as tar:
+        _add_bytes(tar, 'manifest.json', json.dumps(manifest, cls=DjangoJSONEncoder, indent=2).encode())
+        for key, fields in EXPORT_MEMBERS:
+            if key == 'images':
+                for item in files:
+                    tar.add(task_image_storage.path(item['name']), arcname=f"images/{item['name']}")
+                report(f"images: {len(files)}")
+                continue
+            rows = querysets[key].order_by(*(['pk'] if key != 'task_assignees' else ['task_id', 'user_id']))
+            _add_jsonl(tar, f"data/{key}.jsonl", _json_lines(rows, fields))
+            report(f"{key}: {manifest['counts'][key]}")
+    return manifest
+
+
+# ============================
+#           Import
+# ============================
+
+@contextmanager
+def preserve_timestamps(*models):
+    """auto_now/auto_now_add vaqtincha o'chiriladi — arxivdagi created_at/updated_at saqlanadi."""
+    saved = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                saved.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _read_jsonl(fileobj):
+    for line in fileobj:
+        if line.strip():
+            yield json.loads(line)
+
+
+def _batched(rows, size=BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _instance(model, row, fields, **overrides):
+    values = {}
+    for name in fields:
+        if name == 'id' or name in overrides:
+            continue
+        field = model._meta.get_field(name[:-3] if name.endswith('_id') else name)
+        values[name] = field.to_python(row[name]) if row[name] is not None else None
+    values.update(overrides)
+    return model(**values)
+
+
+class ProjectImporter:
+
+    def __init__(self, report=None):
+        self.report = report or (lambda message: None)
+        self.maps = {'users': {}, 'projects': {}, 'sprints': {}, 'tasks': {}}
+        # eski deleted_batch -> yangi; butun import uchun bitta (cascade batch'i project/sprint/task'da bir xil)
+        self.batches = {}
+        self.images = {}
+        self.counts = {}
+        self.manifest = None
+
+    def handle(self, member, fileobj):
+        name = member.name
+        if name == 'manifest.json':
+            return self.read_manifest(fileobj)
+        if self.manifest is None:
+            raise ArchiveError("manifest.json must be the first archive member.")
+        if name.startswith('images/'):
+            return self.import_image(name[len('images/'):], fileobj)
+
+        key = name[len('data/'):-len('.jsonl')] if name.startswith('data/') and name.endswith('.jsonl') else None
+        handler = getattr(self, f"import_{key}", None) if key else None
+        if handler is None:
+            raise ArchiveError(f"Unexpected archive member: {name}")
+        count = handler(_read_jsonl(fileobj))
+        self.counts[key] = count
+        self.report(f"{key}: {count}")
+
+    def read_manifest(self, fileobj):
+        manifest = json.load(fileobj)
+        if manifest.get('format') != FORMAT or manifest.get('version') != VERSION:
+            raise ArchiveError(f"Unsupported archive: {manifest.get('format')} v{manifest.get('version')}")
+        self.manifest = manifest
+
+    def import_users(self, rows):
+        rows = list(rows)
+        existing = dict(
+            User.all_objects.filter(email__in=[row['email'] for row in rows]).values_list('email', 'pk')
+        )
+        missing = []
+        for row in rows:
+            if row['email'] not in existing:
+                # boshqa instansiyada yo'q user — faol emas, paroli yo'q (admin faollashtiradi)
+                user = User(email=row['email'], name=row['name'], role=row['role'], is_active=False)
+                user.set_unusable_password()
+                missing.append(user)
+        for user in User.all_objects.bulk_create(missing, batch_size=BATCH_SIZE):
+            existing[user.email] = user.pk
+        self.maps['users'] = {row['id']: existing[row['email']] for row in rows}
+        self.counts['users_created'] = len(missing)
+        return len(rows)
+
+    def _import(self, model, key, rows, fields, remap):
+        mapping = self.maps.get(key)
+        insert = self._copy_batch if connection.vendor == 'postgresql' else self._orm_batch
+        total = 0
+        for batch in _batched(rows):
+            pks = insert(model, batch, fields, [remap(row) for row in batch])
+            if mapping is not None:
+                mapping.update((row['id'], pk) for row, pk in zip(batch, pks))
+            total += len(batch)
+        return total
+
+    def _orm_batch(self, model, batch, fields, overrides):
+        objs = [_instance(model, row, fields, **extra) for row, extra in zip(batch, overrides)]
+        model._base_manager.bulk_create(objs, batch_size=BATCH_SIZE)
+        return [obj.pk for obj in objs]
+
+    def _copy_batch(self, model, batch, fields, overrides):
+        opts = model._meta
+        names = [name for name in fields if name != 'id'] + [name for name in overrides[0] if name not in fields]
+        json_fields = {name for name in names if opts.get_field(name).get_internal_type() == 'JSONField'}
+        quote = connection.ops.quote_name
+        columns = ', '.join(quote(opts.get_field(name).column) for name in ['id'] + names)
+
+        with connection.cursor() as cursor:
+            # pk'lar sequence'dan oldindan — COPY tartibiga yoki boshqa yozuvchilarga bog'liq emas
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)",
+                [opts.db_table, opts.pk.column, len(batch)],
+            )
+            pks = [pk for (pk,) in cursor.fetchall()]
+            with cursor.copy(f"COPY {quote(opts.db_table)} ({columns}) FROM STDIN") as copy:
+                for pk, row, extra in zip(pks, batch, overrides):
+                    values = [pk]
+                    for name in names:
+                        value = extra[name] if name in extra else row[name]
+                        if name in json_fields and value is not None:
+                            value = json.dumps(value)
+                        values.append(value)
+                    copy.write_row(values)
+        return pks
+
+    def remap_batch(self, batch):
+        if batch is None:
+            return None
+        if batch not in self.batches:
+            self.batches[batch] = str(uuid.uuid4())
+        return self.batches[batch]
+
+    def import_projects(self, rows):
+        return self._import(Project, 'projects', rows, PROJECT_FIELDS, lambda row: {
+            'pm_id': self.maps['users'][row['pm_id']],
+            'deleted_batch': self.remap_batch(row['deleted_batch']),
+        })
+
+    def import_sprints(self, rows):
+        # end_date arxivda yo'q (hosila maydon) — bulk_create/COPY save()'dan o'tmaydi
+        return self._import(Sprint, 'sprints', rows, SPRINT_FIELDS, lambda row: {
+            'project_id': self.maps['projects'][row['project_id']],
+            'end_date': sprint_end_date(parse_datetime(row['start_date']), row['duration_days']),
+            'deleted_batch': self.remap_batch(row['deleted_batch']),
+        })
+
+    def import_image(self, name, fileobj):
+        if clean_media_name(name) != name:
+            raise ArchiveError(f"Invalid image name: {name}")
+        # tar oqimi seek qilinmaydi — storage uchun spool'ga ko'chiriladi;
+        # ContentAddressedStorage xesh bo'yicha nom beradi, mavjud bo'lsa dedup
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE) as spool:
+            shutil.copyfileobj(fileobj, spool, HASH_CHUNK_SIZE)
+            # arxivdagi nom allaqachon "task_images/<xx>/<xesh>" — katalog upload_to'dan olinadi
+            target = Task._meta.get_field('image').generate_filename(None, posixpath.basename(name))
+            self.images[name] = task_image_storage.save(target, File(spool, name=name))
+
+    def import_tasks(self, rows):
+        def remap(row):
+            image = row['image'] or ''
+            return {
+                'sprint_id': self.maps['sprints'][row['sprint_id']],
+                'deleted_batch': self.remap_batch(row['deleted_batch']),
+                'image': self.images.get(image, image),
+                'image_variants': {},
+                # rank'siz eski arxivlar: bo'sh, rebalance_ranks joylaydi
+                'rank': row.get('rank', ''),
+            }
+        return self._import(Task, 'tasks', rows, TASK_FIELDS, remap)
+
+    def import_task_assignees(self, rows):
+        return self._import(TaskAssignee, None, rows, ASSIGNEE_FIELDS, lambda row: {
+            'task_id': self.maps['tasks'][row['task_id']],
+            'user_id': self.maps['users'][row['user_id']],
+        })
+
+    def import_audit_logs(self, rows):
+        def remap(row):
+            mapping = self.maps[AUDIT_MODELS[row['model']]]
+            changes = row['changes']
+            if isinstance(changes, dict) and changes.get('deleted_batch') in self.batches:
+                changes = {**changes, 'deleted_batch': self.batches[changes['deleted_batch']]}
+            return {
+                'object_id': str(mapping.get(int(row['object_id']), row['object_id'])),
+                'user_id': self.maps['users'].get(row['user_id']),
+                'changes': changes,
+            }
+        return self._import(AuditLog, None, rows, AUDIT_FIELDS, remap)
+
+    def finish(self):
+        names = set(self.images.values())
+        sync_ref_counts(names)
+        # variantlar commit'dan keyin fon pool'ida: har bir fayl uchun bitta task yetarli
+        for name in names:
+            task_id = Task.all_objects.filter(image=name).values_list('pk', flat=True).first()
+            if task_id:
+                enqueue_task_image(task_id)
+
+
+def import_project(fileobj, report=None):
+    """
+    `fileobj`dagi arxivni bitta tranzaksiyada import qiladi. Qaytadi: (yangi Project, qator soni).
+    Xato bo'lsa hech narsa yozilmaydi; allaqachon saqlangan rasm fayllari ref_count=0 bo'lib
+    qoladi va gc_task_images ularni grace davridan keyin o'chiradi.
+    """
+    importer = ProjectImporter(report=report)
+    with tarfile.open(fileobj=fileobj, mode='r|gz') as tar, transaction.atomic(), \
+            preserve_timestamps(Project, Sprint, Task, AuditLog):
+        for member in tar:
+            if not member.isfile():
+                continue
+            importer.handle(member, tar.extractfile(member))
+        if not importer.maps['projects']:
+            raise ArchiveError("Archive contains no project.")
+        importer.finish()
+
+    project = Project.all_objects.get(pk=next(iter(importer.maps['projects'].values())))
+    invalidate_workload(project.pk)
+    return project, importer.counts
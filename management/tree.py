@@ -0,0 +1,100 @@
+"""
+Project daraxti (GET /management/projects/<pk>/tree/): project -> sprint'lar -> task'lar -> assignee'lar.
+
+Har bir daraja — bitta so'rov (Prefetch, is_deleted=False — SoftDeleteManager orqali). JSON butun
+javob sifatida yig'ilmaydi: obyektlar birma-bir kodlanib, CHUNK_SIZE'lik bo'laklarda yuboriladi.
+Project sarlavhasi sprint/task so'rovlaridan oldin chiqadi — katta project'da ham birinchi bayt darhol.
+"""
+import datetime
+
+from django.db.models import Prefetch, prefetch_related_objects
+from rest_framework import serializers
+from rest_framework.utils.encoders import JSONEncoder
+
+from accounts.models import User
+
+from .models import Sprint, Task
+
+CHUNK_SIZE = 64 * 1024
+
+PROJECT_FIELDS = ('id', 'title', 'start_date', 'end_date', 'status', 'pm_id')
+SPRINT_FIELDS = ('id', 'name', 'start_date', 'end_date', 'duration_days', 'status')
+TASK_FIELDS = ('id', 'title', 'description', 'start_date', 'due_date', 'status')
+USER_FIELDS = ('id', 'email', 'name')
+
+
+class TreeJSONEncoder(JSONEncoder):
+    """Sanalar serializer'lardagidek: DRF DateTimeField (TIME_ZONE, mikrosekund, UTC — 'Z')."""
+    datetime_field = serializers.DateTimeField()
+
+    def default(self, obj):
+        if isinstance(obj, datetime.datetime):
+            return self.datetime_field.to_representation(obj)
+        return super().default(obj)
+
+
+def tree_prefetches(tasks=None, using=None):
+    """`tasks` — task'lar uchun boshlang'ich queryset (masalan DEV uchun faqat o'ziniki)."""
+    tasks = Task.objects.all() if tasks is None else tasks
+    return [
+        Prefetch(
+            'sprints',
+            queryset=Sprint.objects.using(using).only('project_id', *SPRINT_FIELDS).order_by('start_date', 'pk'),
+            to_attr='tree_sprints',
+        ),
+        Prefetch(
+            'tree_sprints__tasks',
+            queryset=tasks.using(using).only('sprint_id', 'image', *TASK_FIELDS).order_by('pk'),
+            to_attr='tree_tasks',
+        ),
+        Prefetch(
+            'tree_sprints__tree_tasks__assignees',
+            queryset=User.objects.using(using).only(*USER_FIELDS).order_by('pk'),
+            to_attr='tree_assignees',
+        ),
+    ]
+
+
+def _open(encoder, values, key):
+    """{"a":1,"b":2} -> '{"a":1,"b":2,"<key>":[' — bolalar alohida yoziladi."""
+    return f"{encoder.encode(values)[:-1]},{encoder.encode(key)}:["
+
+
+def _pieces(project, prefetches, encoder):
+    values = {field: getattr(project, field) for field in PROJECT_FIELDS}
+    # ProjectSerializer nomi
+    values['pm'] = values.pop('pm_id')
+    yield _open(encoder, values, 'sprints')
+
+    prefetch_related_objects([project], *prefetches)
+    for i, sprint in enumerate(project.tree_sprints):
+        if i:
+            yield ','
+        yield _open(encoder, {field: getattr(sprint, field) for field in SPRINT_FIELDS}, 'tasks')
+        for j, task in enumerate(sprint.tree_tasks):
+            values = {field: getattr(task, field) for field in TASK_FIELDS}
+            values['image'] = task.image.url if task.image else None
+            values['assignees'] = [
+                {field: getattr(user, field) for field in USER_FIELDS} for user in task.tree_assignees
+            ]
+            yield encoder.encode(values) if not j else ',' + encoder.encode(values)
+        yield ']}'
+    yield ']}'
+
+
+def iter_project_tree(project, tasks=None, using=None, chunk_size=CHUNK_SIZE):
+    """Daraxt JSON'i — bytes bo'laklari (StreamingHttpResponse uchun)."""
+    encoder = TreeJSONEncoder(separators=(',', ':'), ensure_ascii=False)
+    pieces = _pieces(project, tree_prefetches(tasks, using), encoder)
+
+    # sarlavha kutmasdan ketadi
+    yield next(pieces).encode()
+    buffer, size = [], 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield ''.join(buffer).encode()
+            buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer).encode()
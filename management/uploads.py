@@ -0,0 +1,130 @@
+# management/uploads.py
+import hashlib
+import os
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import TaskUpload
+from .storage import HASH_CHUNK_SIZE, task_image_storage
+
+
+# Pillow formati -> saqlanadigan kengaytma; fayl nomidagi kengaytma faqat shu ro'yxatdan bo'lishi mumkin,
+# saqlanadigan kengaytma esa tarkibdan aniqlangan formatdan olinadi
+IMAGE_FORMATS = {
+    'JPEG': '.jpg',
+    'PNG': '.png',
+    'GIF': '.gif',
+    'WEBP': '.webp',
+}
+ALLOWED_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+
+
+class UploadConflict(Exception):
+    def __init__(self, offset):
+        super().__init__(offset)
+        self.offset = offset
+
+
+def write_chunk(upload, stream, offset, length):
+    """
+    So'rov tanasini xotirada ushlamasdan .part faylga `offset` dan boshlab yozadi.
+    Ulanish uzilsa, qabul qilingan baytlar saqlanadi va offset shunga siljiydi.
+    """
+    if offset != upload.offset:
+        raise UploadConflict(upload.offset)
+
+    path = task_image_storage.path(upload.part_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o600)
+    received = 0
+    try:
+        os.lseek(fd, offset, os.SEEK_SET)
+        while received < length:
+            chunk = stream.read(min(HASH_CHUNK_SIZE, length - received))
+            if not chunk:
+                break
+            os.write(fd, chunk)
+            received += len(chunk)
+    finally:
+        os.close(fd)
+
+    new_offset = offset + received
+    # parallel PUT'lar: faqat kutilgan offset'dan davom etgani yutadi
+    if not TaskUpload.objects.filter(pk=upload.pk, offset=offset).update(
+        offset=new_offset, updated_at=timezone.now()
+    ):
+        raise UploadConflict(TaskUpload.objects.values_list('offset', flat=True).get(pk=upload.pk))
+    upload.offset = new_offset
+    return received
+
+
+def verify(upload):
+    """
+    Yakuniy tekshiruv: hajm va (berilgan bo'lsa) sha256. Qaytaradi: hisoblangan sha256.
+    """
+    path = task_image_storage.path(upload.part_name)
+    if upload.offset != upload.size or os.path.getsize(path) != upload.size:
+        raise ValueError(f"Upload is incomplete: {upload.offset}/{upload.size} bytes.")
+
+    sha = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(HASH_CHUNK_SIZE), b''):
+            sha.update(chunk)
+    digest = sha.hexdigest()
+    if upload.sha256 and upload.sha256 != digest:
+        raise ValueError("Checksum mismatch.")
+    return digest
+
+
+def detect_image_format(path):
+    """
+    Faylni Pillow bilan ochib tekshiradi (verify — piksellarni decode qilmasdan tuzilishini). Qaytaradi:
+    saqlanadigan kengaytma. Rasm emas yoki ruxsat etilmagan format — ValueError.
+    """
+    from PIL import Image
+
+    try:
+        with Image.open(path) as img:
+            image_format = img.format
+            img.verify()
+    except Exception:
+        raise ValueError("Uploaded file is not a valid image.")
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(f"Unsupported image format: {image_format}.")
+    return IMAGE_FORMATS[image_format]
+
+
+def finalize(upload):
+    """
+    Tekshirilgan .part faylni content-addressed nomiga ko'chiradi (nusxa olinmaydi). Qaytaradi: storage nomi.
+    """
+    digest = verify(upload)
+    ext = detect_image_format(task_image_storage.path(upload.part_name))
+    return task_image_storage.adopt(
+        task_image_storage.path(upload.part_name), 'task_images', ext, digest
+    )
+
+
+def discard(upload):
+    path = task_image_storage.path(upload.part_name)
+    if os.path.exists(path):
+        os.unlink(path)
+
+
+def cleanup_stale_uploads(max_age=None):
+    """
+    Uzoq vaqt harakatsiz qolgan (yoki ancha oldin yakunlangan) sessiyalarni .part fayllari bilan o'chiradi.
+    """
+    max_age = max_age or settings.TASK_UPLOAD_EXPIRY
+    cutoff = timezone.now() - max_age
+    stale = TaskUpload.objects.filter(
+        Q(completed_at__isnull=True, updated_at__lt=cutoff) | Q(completed_at__lt=cutoff)
+    )
+    removed = 0
+    for upload in stale.iterator():
+        discard(upload)
+        removed += 1
+    stale.delete()
+    return removed
@@ -2,23 +2,48 @@ from django.urls import path
 from .views import (
     ProjectListCreateAPIView,
     ProjectDetailAPIView,
+    ProjectActiveSprintAPIView,
+    ProjectTreeAPIView,
     SprintListCreateAPIView,
     SprintDetailAPIView,
+    SprintCloseAPIView,
+    SprintBoardAPIView,
     TaskListCreateAPIView,
     TaskDetailAPIView,
     MyTasksAPIView,
     TaskStatusUpdateAPIView,
+    TaskMoveAPIView,
+    SoftDeleteRestoreAPIView,
+    CalendarAPIView,
+    WorkloadAPIView,
+    TaskUploadCreateAPIView,
+    TaskUploadDetailAPIView,
+    TaskUploadFinalizeAPIView,
 )
 
 urlpatterns = [
     path('projects/', ProjectListCreateAPIView.as_view(), name='project-list-create'),
     path('projects/<int:pk>/', ProjectDetailAPIView.as_view(), name='project-detail'),
+    path('projects/<int:pk>/active-sprint/', ProjectActiveSprintAPIView.as_view(), name='project-active-sprint'),
+    path('projects/<int:pk>/tree/', ProjectTreeAPIView.as_view(), name='project-tree'),
 
     path('sprints/', SprintListCreateAPIView.as_view(), name='sprint-list-create'),
     path('sprints/<int:pk>/', SprintDetailAPIView.as_view(), name='sprint-detail'),
+    path('sprints/<int:pk>/close/', SprintCloseAPIView.as_view(), name='sprint-close'),
+    path('sprints/<int:pk>/board/', SprintBoardAPIView.as_view(), name='sprint-board'),
 
     path('tasks/', TaskListCreateAPIView.as_view(), name='task-list-create'),
     path('tasks/<int:pk>/', TaskDetailAPIView.as_view(), name='task-detail'),
     path('tasks/my/', MyTasksAPIView.as_view(), name='my-tasks'),
     path('tasks/<int:pk>/change-status/', TaskStatusUpdateAPIView.as_view(), name='task-change-status'),
+    path('tasks/<int:pk>/move/', TaskMoveAPIView.as_view(), name='task-move'),
+
+    path('tasks/<int:pk>/uploads/', TaskUploadCreateAPIView.as_view(), name='task-upload-create'),
+    path('uploads/<uuid:upload_id>/', TaskUploadDetailAPIView.as_view(), name='task-upload-detail'),
+    path('uploads/<uuid:upload_id>/finalize/', TaskUploadFinalizeAPIView.as_view(), name='task-upload-finalize'),
+
+    path('calendar/', CalendarAPIView.as_view(), name='calendar'),
+    path('workload/', WorkloadAPIView.as_view(), name='workload'),
+
+    path('restore/<uuid:batch>/', SoftDeleteRestoreAPIView.as_view(), name='soft-delete-restore'),
 ]
\ No newline at end of file
@@ -1,38 +1,85 @@
+import os
 from datetime import timedelta
 
-from django.db.models import Count
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Coalesce
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.utils.decorators import method_decorator
 
 from rest_framework import generics, status
-from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from drf_yasg.utils import swagger_auto_schema
-
 from accounts.models import User
 from accounts.permissions import IsOwnerOrPM, IsNotViewer
 from audit.utils import write_audit
 from audit.models import AuditLog
-
-from .models import Project, Sprint, Task
+from config.db_router import PrimaryOnlyMixin
+from config.swagger import openapi, swagger_auto_schema
+
+from .active_sprint import resolve as resolve_active_sprint
+from .board import move_task, tail_rank
+from .images import enqueue_task_image
+from .media import clean_media_name, image_lookup, serve
+from .ranking import rank_after
+from .storage import sync_ref_counts, task_image_storage
+from .tree import iter_project_tree
+from .models import Project, Sprint, Task, TaskUpload, invalidate_active_sprint
 from .serializers import (
     ProjectSerializer,
+    SprintCloseSerializer,
+    TaskMoveSerializer,
     SprintSerializer,
     TaskSerializer,
-    TaskStatusUpdateSerializer
+    TaskStatusUpdateSerializer,
+    TaskUploadSerializer,
 )
+from .rollover import close_sprint
+from .uploads import UploadConflict, discard, finalize, write_chunk
+from .workload import get_workload, invalidate_workload, project_id_of
 
 from rest_framework.parsers import MultiPartParser, FormParser
 
 
+class SoftDeleteDestroyMixin:
+    """
+    DELETE — obyekt va uning bolalari (sprint/task) bitta batch bilan soft delete bo'ladi.
+    Javobda restore uchun kerak bo'ladigan `deleted_batch` qaytariladi.
+    """
+
+    def destroy(self, request, *args, **kwargs):
+        instance = self.get_object()
+        batch = self.perform_destroy(instance)
+        return Response({"deleted_batch": batch}, status=status.HTTP_200_OK)
+
+    def perform_destroy(self, instance):
+        batch = instance.soft_delete()
+        invalidate_workload(project_id_of(instance))
+        invalidate_active_sprint(project_id_of(instance))
+
+        write_audit(
+            action=AuditLog.Action.SOFT_DELETE,
+            instance=instance,
+            user=self.request.user,
+            changes={"deleted": True, "deleted_batch": str(batch)},
+            request=self.request
+        )
+        return batch
+
+
 @method_decorator(name='get', decorator=swagger_auto_schema(tags=['Projects']))
 @method_decorator(name='post', decorator=swagger_auto_schema(tags=['Projects']))
 class ProjectListCreateAPIView(generics.ListCreateAPIView):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
+    query_budget = {"GET": 2, "POST": 4}
 
     def get_permissions(self):
         if self.request.method == "POST":
@@ -61,9 +108,10 @@ class ProjectListCreateAPIView(generics.ListCreateAPIView):
 @method_decorator(name='put', decorator=swagger_auto_schema(tags=['Projects']))
 @method_decorator(name='patch', decorator=swagger_auto_schema(tags=['Projects']))
 @method_decorator(name='delete', decorator=swagger_auto_schema(tags=['Projects']))
-class ProjectDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
+class ProjectDetailAPIView(SoftDeleteDestroyMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
+    query_budget = {"GET": 2, "PUT": 4, "PATCH": 4, "DELETE": 8}
 
     def get_permissions(self):
         if self.request.method in ("PATCH", "PUT", "DELETE"):
@@ -82,27 +130,87 @@ class ProjectDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
         )
         return instance
 
-    def perform_destroy(self, instance):
-        instance.is_deleted = True
-        instance.save(update_fields=["is_deleted"])
 
-        write_audit(
-            action=AuditLog.Action.SOFT_DELETE,
-            instance=instance,
-            user=self.request.user,
-            changes={"deleted": True},
-            request=self.request
+class ProjectActiveSprintAPIView(APIView):
+    """Joriy va keyingi sprint (management/active_sprint.py); takroriy so'rovlar cache'dan, so'rovsiz."""
+    permission_classes = [IsAuthenticated, IsNotViewer]
+    # cache'da yo'q bo'lsa: user, project, joriy, keyingi
+    query_budget = 4
+
+    @swagger_auto_schema(
+        operation_summary="Project'ning joriy va keyingi sprint'i",
+        tags=['Sprints']
+    )
+    def get(self, request, pk):
+        data = resolve_active_sprint(pk)
+        if data is None:
+            raise NotFound("Project not found.")
+        return Response(data)
+
+
+class ProjectTreeAPIView(APIView):
+    """
+    Project, uning sprint'lari, task'lari va assignee'lari bitta javobda (management/tree.py).
+    DEV faqat o'ziga biriktirilgan task'larni ko'radi (TaskListCreateAPIView bilan bir xil).
+    """
+    permission_classes = [IsAuthenticated, IsNotViewer]
+    throttle_scope = 'export'
+    # user, project; daraxtning 3 ta so'rovi javob oqimida (middleware oqim tugaguncha sanaydi)
+    query_budget = 5
+
+    @swagger_auto_schema(
+        operation_summary="Project daraxti: sprint'lar, task'lar, assignee'lar (oqimli JSON)",
+        responses={200: openapi.Response("Project -> sprints -> tasks -> assignees")},
+        tags=['Projects']
+    )
+    def get(self, request, pk):
+        project = get_object_or_404(Project, pk=pk)
+        tasks = None
+        if request.user.role not in (User.Role.OWNER, User.Role.PM):
+            tasks = Task.objects.filter(assignees=request.user)
+        # oqim so'rovdan keyin o'qiladi — routing holati tugagan bo'ladi, shuning uchun project o'qilgan baza
+        return StreamingHttpResponse(
+            iter_project_tree(project, tasks=tasks, using=project._state.db),
+            content_type='application/json',
         )
 
 
+class SprintBoardAPIView(APIView):
+    """
+    Sprint board'i: Task.Status tartibidagi ustunlar, har biri rank bo'yicha (task_board_rank_idx).
+    DEV faqat o'ziga biriktirilgan task'larni ko'radi (TaskListCreateAPIView bilan bir xil).
+    """
+    permission_classes = [IsAuthenticated, IsNotViewer]
+    query_budget = 4
+
+    @swagger_auto_schema(
+        operation_summary="Sprint board'i: status ustunlari rank tartibida",
+        tags=['Sprints']
+    )
+    def get(self, request, pk):
+        if not Sprint.objects.filter(pk=pk).exists():
+            raise NotFound("Sprint not found.")
+        qs = Task.objects.filter(sprint_id=pk).prefetch_related("assignees").order_by("status", "rank", "id")
+        if request.user.role not in (User.Role.OWNER, User.Role.PM):
+            qs = qs.filter(assignees=request.user)
+
+        columns = {value: [] for value in Task.Status.values}
+        for item in TaskSerializer(qs, many=True, context={"request": request}).data:
+            columns[item["status"]].append(item)
+        return Response({"sprint": pk, "columns": columns})
+
+
 @method_decorator(name='get', decorator=swagger_auto_schema(tags=['Sprints']))
 @method_decorator(name='post', decorator=swagger_auto_schema(tags=['Sprints']))
 class SprintListCreateAPIView(generics.ListCreateAPIView):
     serializer_class = SprintSerializer
+    query_budget = {"GET": 2, "POST": 4}
 
     def get_queryset(self):
         return (
-            Sprint.objects.annotate(task_count=Count("tasks")).select_related("project")
+            Sprint.objects.annotate(
+                task_count=Count("tasks", filter=Q(tasks__is_deleted=False))
+            ).select_related("project")
         )
 
     def get_permissions(self):
@@ -125,12 +233,15 @@ class SprintListCreateAPIView(generics.ListCreateAPIView):
 @method_decorator(name='put', decorator=swagger_auto_schema(tags=['Sprints']))
 @method_decorator(name='patch', decorator=swagger_auto_schema(tags=['Sprints']))
 @method_decorator(name='delete', decorator=swagger_auto_schema(tags=['Sprints']))
-class SprintDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
+class SprintDetailAPIView(SoftDeleteDestroyMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = SprintSerializer
+    query_budget = {"GET": 2, "PUT": 4, "PATCH": 4, "DELETE": 7}
 
     def get_queryset(self):
         return (
-            Sprint.objects.annotate(task_count=Count("tasks")).select_related("project")
+            Sprint.objects.annotate(
+                task_count=Count("tasks", filter=Q(tasks__is_deleted=False))
+            ).select_related("project")
         )
 
     def get_permissions(self):
@@ -139,7 +250,12 @@ class SprintDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
         return [IsAuthenticated(), IsNotViewer()]
 
     def perform_update(self, serializer):
+        old_project = serializer.instance.project_id
         sprint = serializer.save()
+        # yangi project'niki Sprint.save'da
+        if sprint.project_id != old_project:
+            # workload — management/signals.py
+            invalidate_active_sprint(old_project)
 
 
         write_audit(
@@ -152,24 +268,15 @@ class SprintDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
 
         return sprint
 
-    def perform_destroy(self, instance):
-        instance.is_deleted = True
-        instance.save(update_fields=["is_deleted"])
-
-        write_audit(
-            action=AuditLog.Action.SOFT_DELETE,
-            instance=instance,
-            user=self.request.user,
-            changes={"deleted": True},
-            request=self.request
-        )
-
 
 @method_decorator(name='get', decorator=swagger_auto_schema(tags=['Tasks']))
 @method_decorator(name='post', decorator=swagger_auto_schema(tags=['Tasks']))
 class TaskListCreateAPIView(generics.ListCreateAPIView):
     serializer_class = TaskSerializer
     parser_classes = [MultiPartParser, FormParser]
+    # rasm bilan: blob, ref_count, TASK_IMAGE_WORKERS=0 da variantlar ham shu so'rovda;
+    # assignees: m2m_changed uchun mavjudlari, CREATE audit snapshot'i
+    query_budget = {"GET": 3, "POST": 18}
     def get_queryset(self):
         user = self.request.user
         qs = Task.objects.select_related("sprint", "sprint__project").prefetch_related("assignees")
@@ -185,6 +292,9 @@ class TaskListCreateAPIView(generics.ListCreateAPIView):
 
     def perform_create(self, serializer):
         instance = serializer.save()
+        if instance.image:
+            sync_ref_counts([instance.image.name])
+            enqueue_task_image(instance.pk)
 
         write_audit(
             action=AuditLog.Action.CREATE,
@@ -199,10 +309,12 @@ class TaskListCreateAPIView(generics.ListCreateAPIView):
 @method_decorator(name='put', decorator=swagger_auto_schema(tags=['Tasks']))
 @method_decorator(name='patch', decorator=swagger_auto_schema(tags=['Tasks']))
 @method_decorator(name='delete', decorator=swagger_auto_schema(tags=['Tasks']))
-class TaskDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
+class TaskDetailAPIView(SoftDeleteDestroyMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = TaskSerializer
     queryset = Task.objects.select_related("sprint", "sprint__project").prefetch_related("assignees")
     parser_classes = [MultiPartParser, FormParser]
+    # rasm bilan: blob, ref_count, TASK_IMAGE_WORKERS=0 da variantlar ham shu so'rovda
+    query_budget = {"GET": 3, "PUT": 13, "PATCH": 13, "DELETE": 7}
     def get_permissions(self):
         if self.request.method in ("PATCH", "PUT", "DELETE"):
             return [IsOwnerOrPM()]
@@ -212,13 +324,28 @@ class TaskDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
         obj = super().get_object()
         user = self.request.user
 
-        if user.role == User.Role.DEV and not obj.assignees.filter(id=user.id).exists():
+        # prefetch qilingan assignees — qo'shimcha so'rovsiz
+        if user.role == User.Role.DEV and user not in obj.assignees.all():
             raise PermissionDenied("You cannot access tasks not assigned to you.")
 
         return obj
 
     def perform_update(self, serializer):
-        instance = serializer.save()
+        extra = {}
+        sprint = serializer.validated_data.get('sprint', serializer.instance.sprint)
+        task_status = serializer.validated_data.get('status', serializer.instance.status)
+        if (sprint.pk, task_status) != (serializer.instance.sprint_id, serializer.instance.status):
+            # boshqa board ustuni — uning oxiriga
+            extra['rank'] = rank_after(tail_rank(sprint.pk, task_status, exclude=serializer.instance.pk))
+        if 'image' in serializer.validated_data:
+            old_image = serializer.instance.image.name
+            # yangi rasm — eski variantlar yaroqsiz
+            instance = serializer.save(image_variants={}, **extra)
+            sync_ref_counts([old_image, instance.image.name])
+            if instance.image:
+                enqueue_task_image(instance.pk)
+        else:
+            instance = serializer.save(**extra)
 
         write_audit(
             action=AuditLog.Action.UPDATE,
@@ -229,24 +356,12 @@ class TaskDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
         )
         return instance
 
-    def perform_destroy(self, instance):
-        instance.is_deleted = True
-        instance.save(update_fields=["is_deleted"])
-
-        write_audit(
-            action=AuditLog.Action.SOFT_DELETE,
-            instance=instance,
-            user=self.request.user,
-            changes={"deleted": True},
-            request=self.request
-        )
-
-
 
 @method_decorator(name='get', decorator=swagger_auto_schema(tags=['Tasks']))
 class MyTasksAPIView(generics.ListAPIView):
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated, IsNotViewer]
+    query_budget = 3
 
     def get_queryset(self):
         return (
@@ -257,9 +372,9 @@ class MyTasksAPIView(generics.ListAPIView):
         )
 
 
-
-class TaskStatusUpdateAPIView(APIView):
+class TaskStatusUpdateAPIView(PrimaryOnlyMixin, APIView):
     permission_classes = [IsAuthenticated, IsNotViewer]
+    query_budget = 6
 
     @swagger_auto_schema(
         request_body=TaskStatusUpdateSerializer,
@@ -267,7 +382,8 @@ class TaskStatusUpdateAPIView(APIView):
         tags=['Tasks']
     )
     def patch(self, request, pk):
-        task = get_object_or_404(Task, pk=pk)
+        # assignees bir marta yuklanadi: ruxsat tekshiruvi ham, javob serializer'i ham shundan foydalanadi
+        task = get_object_or_404(Task.objects.select_related("sprint").prefetch_related("assignees"), pk=pk)
         user = request.user
         new_status = request.data.get("status")
         old_status = task.status
@@ -276,7 +392,7 @@ class TaskStatusUpdateAPIView(APIView):
             raise ValidationError({"status": "This field is required."})
 
         if user.role == User.Role.DEV:
-            if not task.assignees.filter(id=user.id).exists():
+            if user not in task.assignees.all():
                 raise PermissionDenied("You can only change status of your own tasks.")
 
             allowed = {
@@ -307,16 +423,415 @@ class TaskStatusUpdateAPIView(APIView):
         else:
             raise PermissionDenied("You are not allowed to change task status.")
 
+        changes = {"status": {"old": old_status, "new": new_status}}
+        update_fields = ["status", "updated_at"]
+        if new_status != old_status:
+            # boshqa board ustuni — uning oxiriga
+            new_rank = rank_after(tail_rank(task.sprint_id, new_status, exclude=task.pk))
+            changes["rank"] = {"old": task.rank, "new": new_rank}
+            task.rank = new_rank
+            update_fields.append("rank")
         task.status = new_status
-        task.save(update_fields=["status", "updated_at"])
+        task.save(update_fields=update_fields)
 
         write_audit(
             action=AuditLog.Action.UPDATE,
             instance=task,
             user=request.user,
-            changes={"status": {"old": old_status, "new": new_status}},
+            changes=changes,
             request=request
         )
 
         serializer = TaskSerializer(task)
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class TaskMoveAPIView(PrimaryOnlyMixin, APIView):
+    """Board'da ko'chirish (management/board.py): yangi rank qo'shnilardan, faqat shu task yoziladi."""
+    permission_classes = [IsOwnerOrPM]
+    # task, assignees, qo'shnilar, ustun chegarasi, UPDATE, audit; kalitlar to'qnashsa — ustun rebalance
+    query_budget = 12
+
+    @swagger_auto_schema(
+        request_body=TaskMoveSerializer,
+        responses={200: TaskSerializer()},
+        tags=['Tasks']
+    )
+    def post(self, request, pk):
+        serializer = TaskMoveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        task = get_object_or_404(Task.objects.select_related("sprint").prefetch_related("assignees"), pk=pk)
+        old_status, old_rank = task.status, task.rank
+        try:
+            move_task(task, status=data.get("status"), after=data.get("after"), before=data.get("before"))
+        except ValueError as exc:
+            raise ValidationError({"detail": str(exc)})
+
+        changes = {"rank": {"old": old_rank, "new": task.rank}}
+        if task.status != old_status:
+            changes["status"] = {"old": old_status, "new": task.status}
+            invalidate_workload(task.sprint.project_id)
+
+        write_audit(
+            action=AuditLog.Action.UPDATE,
+            instance=task,
+            user=request.user,
+            changes=changes,
+            request=request
+        )
+        return Response(TaskSerializer(task).data, status=status.HTTP_200_OK)
+
+
+class SoftDeleteRestoreAPIView(PrimaryOnlyMixin, APIView):
+    permission_classes = [IsOwnerOrPM]
+    query_budget = 8
+
+    # batch ichidagi eng yuqori daraja — restore shu modeldan boshlab cascade qiladi
+    restore_roots = (
+        (Project, ()),
+        (Sprint, ("project",)),
+        (Task, ("sprint",)),
+    )
+
+    def get_root(self, batch):
+        for model, parents in self.restore_roots:
+            root = model.all_objects.select_related(*parents).filter(deleted_batch=batch).first()
+            if root is not None:
+                return root, parents
+        raise NotFound("Deletion batch not found.")
+
+    @swagger_auto_schema(
+        operation_summary="Soft delete qilingan obyektni (bolalari bilan) tiklash",
+        tags=['Projects']
+    )
+    def post(self, request, batch):
+        root, parents = self.get_root(batch)
+
+        for parent in parents:
+            if getattr(root, parent).is_deleted:
+                raise ValidationError({"detail": f"Parent {parent} is deleted; restore it first."})
+
+        restored = type(root).restore_batch(batch)
+        invalidate_workload(project_id_of(root))
+        invalidate_active_sprint(project_id_of(root))
+
+        write_audit(
+            action=AuditLog.Action.RESTORE,
+            instance=root,
+            user=request.user,
+            changes={"deleted": {"old": True, "new": False}, "deleted_batch": str(batch), "restored": restored},
+            request=request
+        )
+
+        return Response({
+            "model": root._meta.label,
+            "id": root.pk,
+            "restored": restored,
+        }, status=status.HTTP_200_OK)
+
+
+class SprintCloseAPIView(PrimaryOnlyMixin, APIView):
+    """
+    Sprint'ni yopish: tugallanmagan task'lar keyingi sprint'ga ko'chadi (management/rollover.py).
+    """
+    permission_classes = [IsOwnerOrPM]
+    # sprint + keyingi sprint (yoki yaratish + audit), task'lar, ustun oxirlari, UPDATE, sprint save, audit bulk_create
+    query_budget = 12
+
+    @swagger_auto_schema(
+        operation_summary="Sprint'ni yopish va tugallanmagan task'larni keyingi sprint'ga o'tkazish",
+        request_body=SprintCloseSerializer,
+        tags=['Sprints']
+    )
+    def post(self, request, pk):
+        serializer = SprintCloseSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            sprint, target, created, moved = close_sprint(
+                pk,
+                next_sprint_id=serializer.validated_data.get("next_sprint"),
+                name=serializer.validated_data.get("name"),
+                user=request.user,
+                request=request,
+            )
+        except Sprint.DoesNotExist:
+            raise NotFound("Sprint not found.")
+        except ValueError as exc:
+            raise ValidationError({"detail": str(exc)})
+
+        return Response({
+            "sprint": SprintSerializer(sprint).data,
+            "next_sprint": SprintSerializer(target).data,
+            "created": created,
+            "moved": moved,
+        }, status=status.HTTP_200_OK)
+
+
+# ============================
+#       Kalendar / timeline
+# ============================
+
+def parse_query_datetime(request, name):
+    raw = request.GET.get(name)
+    if not raw:
+        raise ValidationError({name: "This field is required."})
+    value = parse_datetime(raw)
+    if value is None:
+        raise ValidationError({name: "ISO 8601 formatdagi sana yoki vaqt kiriting."})
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+def parse_query_project(request):
+    project = request.GET.get("project")
+    if not project:
+        return None
+    if not project.isdigit():
+        raise ValidationError({"project": "A valid integer is required."})
+    return int(project)
+
+
+project_query_param = openapi.Parameter(
+    "project", openapi.IN_QUERY, type=openapi.TYPE_INTEGER, description="Faqat shu project"
+)
+
+
+class CalendarAPIView(APIView):
+    """
+    [from, to) oralig'i bilan kesishadigan sprint va task'lar — ikki so'rov.
+    Sprint: start_date < to AND end_date > from (sprint_interval_idx).
+    Task: [start_date, due_date] oralig'i; sanalardan biri bo'lmasa — bor sana oraliq ichida (task_interval_idx).
+    DEV faqat o'ziga biriktirilgan task'larni ko'radi (TaskListCreateAPIView bilan bir xil).
+    """
+    permission_classes = [IsAuthenticated, IsNotViewer]
+    query_budget = 3
+
+    def get_range(self):
+        start = parse_query_datetime(self.request, "from")
+        end = parse_query_datetime(self.request, "to")
+        if end <= start:
+            raise ValidationError({"to": "Must be later than 'from'."})
+        if end - start > timedelta(days=settings.CALENDAR_MAX_DAYS):
+            raise ValidationError({"to": f"Range cannot exceed {settings.CALENDAR_MAX_DAYS} days."})
+        return start, end
+
+    def get_sprints(self, start, end, project):
+        qs = Sprint.objects.filter(start_date__lt=end, end_date__gt=start)
+        if project is not None:
+            qs = qs.filter(project_id=project)
+        return qs.order_by("start_date", "id").values(
+            "id", "name", "project", "start_date", "end_date", "status",
+            project_title=F("project__title"),
+        )
+
+    def get_tasks(self, start, end, project):
+        qs = Task.objects.filter(
+            Q(start_date__lt=end, due_date__gte=start)
+            | Q(start_date__isnull=True, due_date__gte=start, due_date__lt=end)
+            | Q(due_date__isnull=True, start_date__gte=start, start_date__lt=end)
+        )
+        if project is not None:
+            qs = qs.filter(sprint__project_id=project)
+        if self.request.user.role not in (User.Role.OWNER, User.Role.PM):
+            qs = qs.filter(assignees=self.request.user)
+        return qs.order_by(Coalesce("start_date", "due_date"), "id").values(
+            "id", "title", "sprint", "status", "start_date", "due_date",
+            project=F("sprint__project"),
+        )
+
+    @swagger_auto_schema(
+        operation_summary="Kalendar: oraliq bilan kesishadigan sprint va task'lar",
+        manual_parameters=[
+            openapi.Parameter("from", openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              format=openapi.FORMAT_DATETIME, required=True, description="Oraliq boshi (kiradi)"),
+            openapi.Parameter("to", openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              format=openapi.FORMAT_DATETIME, required=True, description="Oraliq oxiri (kirmaydi)"),
+            project_query_param,
+        ],
+        tags=['Calendar']
+    )
+    def get(self, request):
+        start, end = self.get_range()
+        project = parse_query_project(request)
+        return Response({
+            "from": start,
+            "to": end,
+            "sprints": list(self.get_sprints(start, end, project)),
+            "tasks": list(self.get_tasks(start, end, project)),
+        })
+
+
+class WorkloadAPIView(APIView):
+    """User'lar bo'yicha ochiq/overdue/shu hafta task'lar soni (management/workload.py, cache'dan)."""
+    permission_classes = [IsOwnerOrPM]
+    # user, project id'lar, cache'da yo'q project'lar uchun GROUP BY, user'lar
+    query_budget = 4
+
+    @swagger_auto_schema(
+        operation_summary="Jamoa yuklamasi: user bo'yicha task'lar soni",
+        manual_parameters=[project_query_param],
+        tags=['Workload']
+    )
+    def get(self, request):
+        return Response(get_workload(parse_query_project(request)))
+
+
+# ============================
+#   Chunked / resumable upload
+# ============================
+#
+# 1. POST   tasks/<pk>/uploads/           {filename, size, sha256?} -> sessiya
+# 2. PUT    uploads/<id>/  (Upload-Offset) tana — fayl bo'lagi (application/octet-stream)
+#    HEAD/GET uploads/<id>/                 uzilishdan keyin qayerdan davom etishni bilish
+# 3. POST   uploads/<id>/finalize/          tekshiruv + task'ga biriktirish
+
+upload_offset_header = openapi.Parameter(
+    "Upload-Offset",
+    openapi.IN_HEADER,
+    type=openapi.TYPE_INTEGER,
+    required=True,
+    description="Bo'lak fayldagi qaysi baytdan boshlanadi (joriy offset bilan teng bo'lishi kerak)"
+)
+
+
+@method_decorator(name='post', decorator=swagger_auto_schema(tags=['Uploads']))
+class TaskUploadCreateAPIView(generics.CreateAPIView):
+    serializer_class = TaskUploadSerializer
+    permission_classes = [IsOwnerOrPM]
+    query_budget = 3
+
+    def get_queryset(self):
+        # URL'dagi pk — task'niki (sxema generatori path parametr turini shundan oladi)
+        if getattr(self, "swagger_fake_view", False):
+            return Task.objects.none()
+        return Task.objects.all()
+
+    def perform_create(self, serializer):
+        task = get_object_or_404(self.get_queryset(), pk=self.kwargs["pk"])
+        serializer.save(task=task, user=self.request.user)
+
+
+class TaskUploadDetailAPIView(PrimaryOnlyMixin, APIView):
+    permission_classes = [IsOwnerOrPM]
+    query_budget = 3
+
+    def get_object(self, upload_id):
+        return get_object_or_404(TaskUpload, pk=upload_id, completed_at__isnull=True)
+
+    def offset_response(self, upload, status_code=status.HTTP_200_OK):
+        return Response(
+            TaskUploadSerializer(upload).data,
+            status=status_code,
+            headers={"Upload-Offset": str(upload.offset)},
+        )
+
+    @swagger_auto_schema(responses={200: TaskUploadSerializer()}, tags=['Uploads'])
+    def get(self, request, upload_id):
+        return self.offset_response(self.get_object(upload_id))
+
+    @swagger_auto_schema(
+        manual_parameters=[upload_offset_header],
+        responses={200: TaskUploadSerializer()},
+        tags=['Uploads']
+    )
+    def put(self, request, upload_id):
+        upload = self.get_object(upload_id)
+
+        try:
+            offset = int(request.META["HTTP_UPLOAD_OFFSET"])
+            length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except (KeyError, ValueError):
+            raise ValidationError({"detail": "Upload-Offset and Content-Length headers are required."})
+
+        if length <= 0 or length > settings.TASK_UPLOAD_MAX_CHUNK:
+            raise ValidationError({"detail": f"Chunk must be 1..{settings.TASK_UPLOAD_MAX_CHUNK} bytes."})
+        if offset + length > upload.size:
+            raise ValidationError({"detail": "Chunk exceeds declared upload size."})
+
+        try:
+            # request.data ishlatilmaydi — tana parser'siz, bo'lak-bo'lak diskka oqadi
+            write_chunk(upload, request.stream, offset, length)
+        except UploadConflict as exc:
+            upload.offset = exc.offset
+            return self.offset_response(upload, status.HTTP_409_CONFLICT)
+
+        return self.offset_response(upload)
+
+    @swagger_auto_schema(tags=['Uploads'])
+    def delete(self, request, upload_id):
+        upload = self.get_object(upload_id)
+        discard(upload)
+        upload.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class TaskUploadFinalizeAPIView(PrimaryOnlyMixin, APIView):
+    permission_classes = [IsOwnerOrPM]
+    # rasm bilan: blob, ref_count, TASK_IMAGE_WORKERS=0 da variantlar ham shu so'rovda
+    query_budget = 16
+
+    @swagger_auto_schema(responses={200: TaskSerializer()}, tags=['Uploads'])
+    def post(self, request, upload_id):
+        with transaction.atomic():
+            upload = get_object_or_404(
+                TaskUpload.objects.select_for_update(), pk=upload_id, completed_at__isnull=True
+            )
+            task = get_object_or_404(
+                Task.objects.select_related("sprint").prefetch_related("assignees"), pk=upload.task_id
+            )
+
+            try:
+                name = finalize(upload)
+            except ValueError as exc:
+                raise ValidationError({"detail": str(exc)})
+
+            old_image = task.image.name
+            task.image = name
+            task.image_variants = {}
+            task.save(update_fields=["image", "image_variants", "updated_at"])
+
+            upload.completed_at = timezone.now()
+            upload.save(update_fields=["completed_at", "updated_at"])
+
+            sync_ref_counts([old_image, name])
+            enqueue_task_image(task.pk)
+
+        write_audit(
+            action=AuditLog.Action.UPDATE,
+            instance=task,
+            user=request.user,
+            changes={"image": {"old": old_image, "new": name}},
+            request=request
+        )
+
+        serializer = TaskSerializer(task, context={"request": request})
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class TaskMediaView(APIView):
+    """
+    Task rasmlari (asl nusxa va variantlar) — TaskDetailAPIView bilan bir xil ko'rinish qoidalari.
+    Ruxsat bitta EXISTS so'rov bilan tekshiriladi, task obyekti yuklanmaydi.
+    """
+    permission_classes = [IsAuthenticated, IsNotViewer]
+    query_budget = 2
+
+    @swagger_auto_schema(tags=['Tasks'], operation_summary="Task rasmini yuklab olish (Range, ETag)")
+    def get(self, request, name):
+        name = clean_media_name(name)
+        if name is None:
+            raise NotFound()
+
+        tasks = Task.objects.filter(image_lookup(name))
+        if request.user.role == User.Role.DEV:
+            tasks = tasks.filter(assignees=request.user)
+        if not tasks.exists():
+            raise NotFound()
+
+        path = task_image_storage.path(name)
+        if not os.path.isfile(path):
+            raise NotFound()
+        return serve(request, name, path)
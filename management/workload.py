@@ -0,0 +1,151 @@
+"""
+Jamoa yuklamasi (GET /management/workload/): har bir user bo'yicha task'lar soni — status,
+ochiq, overdue va shu hafta muddati tugaydiganlar.
+
+Hisob — Task.assignees through jadvali bo'yicha bitta GROUP BY (project, user) so'rov (status,
+overdue, shu hafta — FILTER bilan). Natija project bo'yicha alohida cache kalitlarida saqlanadi;
+filtrsiz javob ulardan yig'iladi va o'zi ham cache'lanadi. Task yozuvi o'z project'i va umumiy
+kalitni o'chiradi (model signallari — management/signals.py; queryset.update() yo'llari o'zlari),
+keyingi so'rov faqat cache'da yo'q project'larni (bitta so'rovda) qayta hisoblaydi. overdue / shu hafta vaqtga bog'liq, shuning uchun
+kalitlar WORKLOAD_CACHE_TIMEOUT'dan keyin ham eskiradi.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from accounts.models import User
+from config.db_router import use_primary
+
+from .models import Project, Sprint, Task
+
+CACHE_KEY = 'workload:{}'
+ALL_PROJECTS = 'all'
+
+TaskAssignee = Task.assignees.through
+
+
+def week_end(now):
+    """Keyingi dushanba 00:00 (TIME_ZONE bo'yicha)."""
+    local = timezone.localtime(now)
+    monday = local.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=local.weekday())
+    return monday + timedelta(days=7)
+
+
+# project kaliti: {user_id: [status bo'yicha sonlar (Task.Status tartibida)..., overdue, due_this_week]}
+COLUMNS = [*Task.Status.values, 'overdue', 'due_this_week']
+
+
+def compute(project_ids, now=None):
+    """
+    {project_id: {'as_of', 'users': {user_id: [COLUMNS bo'yicha sonlar]}}}.
+    `project_ids=None` — barcha project'lar (IN ro'yxatisiz).
+    """
+    now = now or timezone.now()
+    until = week_end(now)
+    open_task = ~Q(task__status=Task.Status.COMPLETED)
+
+    counts = {f'status_{value}': Count('pk', filter=Q(task__status=value)) for value in Task.Status.values}
+    counts['overdue'] = Count('pk', filter=open_task & Q(task__due_date__lt=now))
+    counts['due_this_week'] = Count('pk', filter=open_task & Q(task__due_date__gte=now, task__due_date__lt=until))
+
+    qs = TaskAssignee.objects.filter(task__is_deleted=False)
+    if project_ids is not None:
+        qs = qs.filter(task__sprint__project_id__in=project_ids)
+    rows = (
+        qs.values('task__sprint__project_id', 'user_id')
+        .annotate(**counts)
+        .order_by()
+        .values_list('task__sprint__project_id', 'user_id', *counts)
+    )
+
+    result = {pk: {'as_of': now, 'users': {}} for pk in project_ids or ()}
+    for project_id, user_id, *values in rows:
+        result.setdefault(project_id, {'as_of': now, 'users': {}})['users'][user_id] = values
+    return result
+
+
+def project_entries(project_ids):
+    keys = {pk: CACHE_KEY.format(pk) for pk in project_ids}
+    cached = cache.get_many(keys.values())
+    entries = {pk: cached[key] for pk, key in keys.items() if key in cached}
+    missing = [pk for pk in project_ids if pk not in entries]
+    if missing:
+        # sovuq cache (hammasi yo'q) — IN ro'yxatisiz bitta skan; cache'ga yoziladigan qiymat primary'dan:
+        # replica kechiksa, invalidatsiyadan keyingi eski holat timeout'gacha cache'da qolardi
+        with use_primary():
+            fresh = compute(None if len(missing) == len(project_ids) > 1 else missing)
+        fresh = {pk: fresh.get(pk) or {'as_of': timezone.now(), 'users': {}} for pk in missing}
+        cache.set_many({keys[pk]: entry for pk, entry in fresh.items()}, settings.WORKLOAD_CACHE_TIMEOUT)
+        entries.update(fresh)
+    return list(entries.values())
+
+
+def build(project):
+    if project is None:
+        project_ids = list(Project.objects.values_list('pk', flat=True))
+    else:
+        project_ids = [project]
+    entries = project_entries(project_ids)
+
+    totals = {}
+    for entry in entries:
+        for user_id, values in entry['users'].items():
+            total = totals.get(user_id)
+            totals[user_id] = values if total is None else [a + b for a, b in zip(total, values)]
+
+    users = []
+    empty = [0] * len(COLUMNS)
+    completed = COLUMNS.index(Task.Status.COMPLETED)
+    statuses = len(Task.Status.values)
+    for user in User.objects.filter(is_active=True).exclude(role=User.Role.VIEWER).values('id', 'email', 'name', 'role'):
+        values = totals.get(user['id'], empty)
+        users.append({
+            'user': user['id'],
+            'email': user['email'],
+            'name': user['name'],
+            'role': user['role'],
+            'open': sum(values[:statuses]) - values[completed],
+            'overdue': values[statuses],
+            'due_this_week': values[statuses + 1],
+            'by_status': dict(zip(Task.Status.values, values)),
+        })
+    users.sort(key=lambda row: (-row['open'], row['user']))
+
+    as_of = min((entry['as_of'] for entry in entries), default=timezone.now())
+    return {
+        'project': project,
+        'as_of': as_of,
+        'week_end': week_end(as_of),
+        'users': users,
+    }
+
+
+def get_workload(project=None):
+    """Filtrsiz natija ham alohida kalitda: o'zgarmagan project'lar qayta yig'ilmaydi."""
+    if project is not None:
+        return build(project)
+    data = cache.get(CACHE_KEY.format(ALL_PROJECTS))
+    if data is None:
+        with use_primary():
+            data = build(None)
+        cache.set(CACHE_KEY.format(ALL_PROJECTS), data, settings.WORKLOAD_CACHE_TIMEOUT)
+    return data
+
+
+def project_id_of(instance):
+    """Project / Sprint / Task -> project id (Task uchun sprint select_related bo'lishi kerak)."""
+    if isinstance(instance, Project):
+        return instance.pk
+    if isinstance(instance, Sprint):
+        return instance.project_id
+    return instance.sprint.project_id
+
+
+def invalidate_workload(*project_ids):
+    """Task yozuvidan keyin: shu project'lar va umumiy kalit (commit'dan keyin — eski snapshot qaytib yozilmasin)."""
+    keys = [CACHE_KEY.format(ALL_PROJECTS)] + [CACHE_KEY.format(pk) for pk in set(project_ids) if pk is not None]
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,19 @@
+import time
+
+from django.db.backends.postgresql import base
+
+from monitoring.db import record_acquire
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Oddiy PostgreSQL backend + ulanish olish vaqtini o'lchash (pool kutishi / connect).
+    Pool, health check (CONN_HEALTH_CHECKS) va buzilgan ulanishlarni almashtirish — Django/psycopg_pool'da.
+    """
+
+    def get_new_connection(self, conn_params):
+        started = time.perf_counter()
+        try:
+            return super().get_new_connection(conn_params)
+        finally:
+            record_acquire(self.alias, started)
@@ -0,0 +1,317 @@
+"""
+Endpoint benchmark'i (python manage.py benchmark).
+
+Har bir hajm (seeding.SCALES) uchun test bazasi tozalanadi, seed_data bilan to'ldiriladi va
+har bir endpoint N marta chaqiriladi: latency (p50/p95/mean) va query soni yoziladi.
+Natija — commit'lar orasida solishtirsa bo'ladigan JSON hisobot.
+"""
+import hashlib
+import io
+import json
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass, field
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from PIL import Image
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from management.models import Task
+
+from .queries import QueryStats
+from .seeding import SCALES, seed
+
+
+def _png():
+    buffer = io.BytesIO()
+    Image.new('RGB', (64, 64), (30, 120, 200)).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+@dataclass
+class Case:
+    """`build(ctx)` -> (path, data, extra) ; `after(ctx, response)` keyingi case'lar uchun ctx'ni to'ldiradi."""
+    name: str
+    method: str
+    role: str
+    build: callable
+    format: str = 'json'
+    after: callable = None
+    expect: tuple = (200, 201, 204, 206)
+
+
+def _upload_created(ctx, response):
+    ctx['upload'] = response.data['id']
+
+
+def _task_deleted(ctx, response):
+    ctx['batch'] = response.data['deleted_batch']
+
+
+def _finalized(ctx, response):
+    ctx['image'] = response.data['image'].split('/media/', 1)[-1]
+
+
+def _new_upload(ctx):
+    return f"/management/tasks/{ctx['task']}/uploads/", {
+        'filename': 'bench.png', 'size': len(ctx['png']), 'sha256': hashlib.sha256(ctx['png']).hexdigest(),
+    }, {}
+
+
+CASES = [
+    Case('accounts.me', 'get', 'owner', lambda c: ('/accounts/me/', None, {})),
+    Case('accounts.me.update', 'patch', 'owner', lambda c: ('/accounts/me/', {'name': 'Bench Owner'}, {})),
+    Case('accounts.users.list', 'get', 'owner', lambda c: ('/accounts/users/', None, {})),
+    Case('accounts.users.create', 'post', 'owner', lambda c: ('/accounts/users/', {
+        'email': f"bench-{time.perf_counter_ns()}@example.com", 'name': 'Bench', 'password': 'Bench-pass-123', 'role': 'DEV',
+    }, {})),
+    Case('accounts.users.detail', 'get', 'owner', lambda c: (f"/accounts/users/{c['dev']}/", None, {})),
+    Case('accounts.users.update', 'patch', 'pm', lambda c: (f"/accounts/users/{c['dev']}/", {'name': 'Bench Dev'}, {})),
+    Case('accounts.users.reset_password', 'patch', 'pm',
+         lambda c: (f"/accounts/users/{c['dev']}/reset-password/", {'password': 'Bench-pass-456'}, {})),
+
+    Case('management.projects.list', 'get', 'owner', lambda c: ('/management/projects/', None, {})),
+    Case('management.projects.create', 'post', 'owner', lambda c: ('/management/projects/', {
+        'title': 'Bench', 'start_date': c['now'], 'end_date': c['now'], 'pm': c['pm'],
+    }, {})),
+    Case('management.projects.detail', 'get', 'owner', lambda c: (f"/management/projects/{c['project']}/", None, {})),
+    Case('management.projects.update', 'patch', 'owner',
+         lambda c: (f"/management/projects/{c['project']}/", {'title': 'Bench project'}, {})),
+    Case('management.sprints.list', 'get', 'pm', lambda c: ('/management/sprints/', None, {})),
+    Case('management.sprints.create', 'post', 'owner', lambda c: ('/management/sprints/', {
+        'project': c['project'], 'name': 'Bench', 'start_date': c['now'], 'duration_days': 14,
+    }, {})),
+    Case('management.sprints.detail', 'get', 'pm', lambda c: (f"/management/sprints/{c['sprint']}/", None, {})),
+    Case('management.sprints.update', 'patch', 'owner',
+         lambda c: (f"/management/sprints/{c['sprint']}/", {'name': 'Bench sprint'}, {})),
+    Case('management.tasks.list', 'get', 'pm', lambda c: ('/management/tasks/', None, {})),
+    Case('management.tasks.list.dev', 'get', 'dev', lambda c: ('/management/tasks/', None, {})),
+    Case('management.tasks.create', 'post', 'owner', lambda c: ('/management/tasks/', {
+        'sprint': c['sprint'], 'title': 'Bench', 'start_date': c['now'], 'due_date': c['now'],
+        'assignees': [c['dev']],
+    }, {}), format='multipart'),
+    Case('management.tasks.detail', 'get', 'dev', lambda c: (f"/management/tasks/{c['task']}/", None, {})),
+    Case('management.tasks.update', 'patch', 'owner',
+         lambda c: (f"/management/tasks/{c['task']}/", {'title': 'Bench task'}, {}), format='multipart'),
+    Case('management.tasks.my', 'get', 'dev', lambda c: ('/management/tasks/my/', None, {})),
+    Case('management.tasks.change_status', 'patch', 'owner',
+         lambda c: (f"/management/tasks/{c['task']}/change-status/", {'status': 'IN_PROGRESS'}, {})),
+    Case('management.uploads.create', 'post', 'owner', _new_upload, after=_upload_created),
+    Case('management.uploads.chunk', 'put', 'owner', lambda c: (f"/management/uploads/{c['upload']}/", c['png'], {
+        'content_type': 'application/octet-stream', 'HTTP_UPLOAD_OFFSET': '0',
+    }), format=None),
+    Case('management.uploads.detail', 'get', 'owner', lambda c: (f"/management/uploads/{c['upload']}/", None, {})),
+    Case('management.uploads.finalize', 'post', 'owner',
+         lambda c: (f"/management/uploads/{c['upload']}/finalize/", None, {}), after=_finalized),
+    Case('management.media', 'get', 'dev', lambda c: (f"/media/{c['image']}", None, {})),
+    Case('management.tasks.delete', 'delete', 'owner',
+         lambda c: (f"/management/tasks/{c['scratch_task']}/", None, {}), after=_task_deleted),
+    Case('management.restore', 'post', 'owner', lambda c: (f"/management/restore/{c['batch']}/", None, {})),
+
+    Case('audit.list', 'get', 'owner', lambda c: (f"/log/?model=management.Task&object_id={c['task']}", None, {})),
+    Case('audit.history', 'get', 'owner', lambda c: (f"/log/management.Task/{c['task']}/history/", None, {})),
+    Case('audit.history.at', 'get', 'owner',
+         lambda c: (f"/log/management.Task/{c['task']}/history/?at={quote(c['now'])}", None, {})),
+]
+
+# bir-biriga bog'liq case'lar ketma-ket bajariladi: upload -> chunk -> finalize -> media, delete -> restore
+CHAINS = [
+    ('management.uploads.create', 'management.uploads.chunk', 'management.uploads.detail',
+     'management.uploads.finalize', 'management.media'),
+    ('management.tasks.delete', 'management.restore'),
+]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+@dataclass
+class Result:
+    latencies: list = field(default_factory=list)
+    queries: list = field(default_factory=list)
+    statuses: dict = field(default_factory=dict)
+
+    def summary(self):
+        ms = [value * 1000 for value in self.latencies]
+        return {
+            'iterations': len(ms),
+            'p50_ms': round(percentile(ms, 50), 3),
+            'p95_ms': round(percentile(ms, 95), 3),
+            'mean_ms': round(statistics.fmean(ms), 3),
+            'max_ms': round(max(ms), 3),
+            'queries': max(self.queries),
+            'statuses': self.statuses,
+        }
+
+
+class Benchmark:
+
+    def __init__(self, iterations=10, warmup=1, cases=None, report=None):
+        self.iterations = iterations
+        self.warmup = warmup
+        selected = set(cases or ())
+        for chain in CHAINS:
+            # zanjirdagi case oldingilarisiz ishlamaydi — butun zanjir qo'shiladi
+            if selected & set(chain):
+                selected.update(chain)
+        self.cases = [case for case in CASES if not cases or case.name in selected]
+        self.report = report or (lambda message: None)
+
+    def context(self):
+        """Seeding'dan keyin case'lar ishlatadigan obyektlar (o'chirilmagan, bir-biriga bog'langan)."""
+        task = (
+            Task.objects
+            .filter(sprint__is_deleted=False, sprint__project__is_deleted=False, assignees__isnull=False)
+            .order_by('pk').first()
+        )
+        dev = task.assignees.order_by('pk').first()
+        owner = User.objects.filter(role=User.Role.OWNER).order_by('pk').first()
+        pm = User.objects.filter(role=User.Role.PM).order_by('pk').first() or owner
+        # benchmark tahrirlaydigan user: boshqa case'lar ishlatadigan dev emas
+        editable = User.objects.filter(role=User.Role.DEV).exclude(pk=dev.pk).order_by('pk').first() or dev
+        return {
+            'now': timezone.now().isoformat(),
+            'png': _png(),
+            'task': task.pk,
+            'sprint': task.sprint_id,
+            'project': task.sprint.project_id,
+            'owner': owner, 'pm': pm.pk, 'dev': editable.pk,
+            'users': {'owner': owner, 'pm': pm, 'dev': dev},
+        }
+
+    def client(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+        return client
+
+    def call(self, client, case, ctx):
+        path, data, extra = case.build(ctx)
+        stats = QueryStats()
+        method = getattr(client, case.method)
+        kwargs = dict(extra)
+        if case.format:
+            kwargs['format'] = case.format
+        started = time.perf_counter()
+        with stats.record():
+            response = method(path, data, **kwargs) if data is not None else method(path, **kwargs)
+            if getattr(response, 'streaming', False):
+                b''.join(response.streaming_content)
+        elapsed = time.perf_counter() - started
+        if case.after and response.status_code in case.expect:
+            case.after(ctx, response)
+        return response, elapsed, stats
+
+    def run_scale(self):
+        ctx = self.context()
+        clients = {role: self.client(user) for role, user in ctx['users'].items()}
+        results = {case.name: Result() for case in self.cases}
+        by_name = {case.name: case for case in self.cases}
+
+        chained = {name for chain in CHAINS for name in chain}
+        groups = [[by_name[name] for name in chain] for chain in CHAINS if chain[0] in by_name]
+        groups += [[case] for case in self.cases if case.name not in chained]
+
+        for group in groups:
+            for n in range(self.warmup + self.iterations):
+                if group[0].name == 'management.tasks.delete':
+                    ctx['scratch_task'] = self.scratch_task(ctx)
+                for case in group:
+                    response, elapsed, stats = self.call(clients[case.role], case, ctx)
+                    if n < self.warmup:
+                        continue
+                    result = results[case.name]
+                    result.latencies.append(elapsed)
+                    result.queries.append(stats.count)
+                    key = str(response.status_code)
+                    result.statuses[key] = result.statuses.get(key, 0) + 1
+            self.report(f"  {', '.join(case.name for case in group)}")
+
+        return {name: result.summary() for name, result in results.items() if result.latencies}
+
+    def scratch_task(self, ctx):
+        task = Task.objects.create(sprint_id=ctx['sprint'], title='Bench scratch')
+        task.assignees.add(ctx['users']['dev'])
+        return task.pk
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True, cwd=settings.BASE_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(scales=('small', 'medium'), iterations=10, warmup=1, cases=None, seed_value=42, report=None):
+    """Har bir hajm uchun: flush -> seed -> endpoint'lar. Joriy (test) bazada ishlaydi."""
+    report = report or (lambda message: None)
+    benchmark = Benchmark(iterations=iterations, warmup=warmup, cases=cases, report=report)
+    result = {
+        'revision': git_revision(),
+        'created_at': timezone.now().isoformat(),
+        'database': connection.vendor,
+        'python': platform.python_version(),
+        'iterations': iterations,
+        'seed': seed_value,
+        'scales': {},
+    }
+
+    for scale in scales:
+        report(f"[{scale}] seeding {SCALES[scale]}")
+        call_command('flush', interactive=False, verbosity=0)
+        started = time.perf_counter()
+        rows = seed(scale=scale, seed=seed_value)
+        seed_seconds = time.perf_counter() - started
+
+        report(f"[{scale}] running {len(benchmark.cases)} endpoint(s) x {iterations}")
+        result['scales'][scale] = {
+            'rows': rows,
+            'seed_seconds': round(seed_seconds, 2),
+            'endpoints': benchmark.run_scale(),
+        }
+    return result
+
+
+def compare(old, new, threshold=0.2):
+    """
+    Ikki hisobot farqi: p50 `threshold`dan ko'p sekinlashgan yoki query soni oshgan endpoint'lar.
+    Qaytadi: (qatorlar, regressiyalar soni).
+    """
+    lines = []
+    regressions = 0
+    for scale, data in new['scales'].items():
+        before = old.get('scales', {}).get(scale, {}).get('endpoints', {})
+        for name, after in sorted(data['endpoints'].items()):
+            prev = before.get(name)
+            if prev is None:
+                lines.append(f"{scale:8} {name:40} new")
+                continue
+            change = (after['p50_ms'] - prev['p50_ms']) / prev['p50_ms'] if prev['p50_ms'] else 0.0
+            # juda tez endpoint'larda millisekunddan kichik shovqin regressiya hisoblanmaydi
+            slower = change > threshold and after['p50_ms'] - prev['p50_ms'] > 1.0
+            more_queries = after['queries'] > prev['queries']
+            flag = ' REGRESSION' if slower or more_queries else ''
+            regressions += bool(flag)
+            lines.append(
+                f"{scale:8} {name:40} p50 {prev['p50_ms']:9.2f} -> {after['p50_ms']:9.2f} ms ({change:+.0%})"
+                f"  queries {prev['queries']} -> {after['queries']}{flag}"
+            )
+    return lines, regressions
+
+
+def dump(result, path):
+    with open(path, 'w') as fh:
+        json.dump(result, fh, indent=2, sort_keys=True)
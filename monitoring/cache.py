@@ -0,0 +1,37 @@
+from django.core.cache.backends import locmem, redis
+
+from .metrics import CACHE_REQUESTS
+
+_missing = object()
+
+
+class InstrumentedCacheMixin:
+    """get (va RedisCache.get_many) natijalarini cache_requests_total{cache, result} ga yozadi."""
+
+    def __init__(self, location, params):
+        super().__init__(location, params)
+        self.hits = CACHE_REQUESTS.labels(params.get("ALIAS", "default"), "hit")
+        self.misses = CACHE_REQUESTS.labels(params.get("ALIAS", "default"), "miss")
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _missing, version=version)
+        if value is _missing:
+            self.misses.inc()
+            return default
+        self.hits.inc()
+        return value
+
+
+class LocMemCache(InstrumentedCacheMixin, locmem.LocMemCache):
+    # get_many — BaseCache'da get() orqali, alohida sanalmaydi
+    pass
+
+
+class RedisCache(InstrumentedCacheMixin, redis.RedisCache):
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = super().get_many(keys, version=version)
+        self.hits.inc(len(found))
+        self.misses.inc(len(keys) - len(found))
+        return found
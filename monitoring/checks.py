@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Warning, register
+
+
+@register()
+def throttle_cache_check(app_configs, **kwargs):
+    """
+    LocMem cache har bir worker jarayonida alohida: throttle sarfi worker'lar orasida
+    sinxronlanmaydi, amaldagi limit THROTTLE_RATES x worker soni bo'ladi.
+    """
+    if not settings.THROTTLE_ENABLED or settings.DEBUG:
+        return []
+    if not isinstance(caches[settings.THROTTLE_CACHE], LocMemCache):
+        return []
+    return [Warning(
+        "Throttling uses a per-process LocMem cache; each worker enforces THROTTLE_RATES on its own, "
+        "so the effective limit is multiplied by the number of workers.",
+        hint="Set REDIS_URL to share throttle state between workers.",
+        id='monitoring.W001',
+    )]
@@ -0,0 +1,83 @@
+"""
+Siqish darajalari benchmark'i (python manage.py benchmark_compression).
+
+Haqiqiy javoblar joriy bazadan olinadi (OWNER sifatida GET, siqilmagan) va har bir o'rnatilgan
+kodek/daraja bilan siqiladi: hajm, nisbat, siqish vaqti (median) va berilgan tarmoq tezligida
+umumiy vaqt (siqish + uzatish) — COMPRESSION_LEVELS'ni tanlash uchun.
+"""
+import statistics
+import time
+
+from django.conf import settings
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from config.compression import CODECS, compress
+
+DEFAULT_PATHS = ('/management/tasks/', '/log/')
+# br 10-11 va zstd 15+ — oldindan siqiladigan statik fayllar uchun: so'rov ichida 10-100x sekin
+LEVELS = {
+    'gzip': range(1, 10),
+    'br': range(0, 10),
+    'zstd': (1, 2, 3, 4, 5, 6, 7, 9, 12),
+}
+
+
+def fetch_payloads(paths, user=None):
+    """{path: bytes} — javoblar Accept-Encoding: identity bilan."""
+    user = user or User.objects.filter(role=User.Role.OWNER, is_active=True).order_by('pk').first()
+    if user is None:
+        raise RuntimeError("No active OWNER user to fetch payloads with.")
+    client = APIClient()
+    client.force_authenticate(user)
+
+    payloads = {}
+    for path in paths:
+        response = client.get(path, HTTP_ACCEPT_ENCODING='identity')
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {path} returned {response.status_code}.")
+        if response.streaming:
+            payloads[path] = b''.join(response.streaming_content)
+        else:
+            payloads[path] = response.content
+    return payloads
+
+
+def measure(data, name, level, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = len(compress(name, data, level))
+        timings.append(time.perf_counter() - started)
+    return size, statistics.median(timings)
+
+
+def run(paths=DEFAULT_PATHS, repeat=5, bandwidth_mbit=10.0, report=None):
+    report = report or (lambda message: None)
+    bytes_per_ms = bandwidth_mbit * 1_000_000 / 8 / 1000
+    result = {
+        'bandwidth_mbit': bandwidth_mbit,
+        'configured': {name: settings.COMPRESSION_LEVELS[name] for name in CODECS},
+        'payloads': {},
+    }
+
+    for path, data in fetch_payloads(paths).items():
+        report(f"{path}: {len(data)} bytes")
+        rows = [{
+            'encoding': 'identity', 'level': None, 'bytes': len(data), 'ratio': 1.0,
+            'compress_ms': 0.0, 'mb_per_s': None, 'total_ms': round(len(data) / bytes_per_ms, 3),
+        }]
+        for name in CODECS:
+            for level in LEVELS[name]:
+                size, seconds = measure(data, name, level, repeat)
+                rows.append({
+                    'encoding': name,
+                    'level': level,
+                    'bytes': size,
+                    'ratio': round(len(data) / size, 2),
+                    'compress_ms': round(seconds * 1000, 3),
+                    'mb_per_s': round(len(data) / seconds / 1_000_000, 1),
+                    'total_ms': round(seconds * 1000 + size / bytes_per_ms, 3),
+                })
+        result['payloads'][path] = {'bytes': len(data), 'results': rows}
+    return result
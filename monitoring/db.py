@@ -0,0 +1,120 @@
+# monitoring/db.py
+import logging
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class AcquireStats:
+    """
+    Ulanish olish vaqti (pool'dan kutish yoki yangi ulanish ochish) — shu worker jarayoni bo'yicha.
+
+    `recent_ms` — yaqindagi o'rtacha (EWMA); yangi o'lchov bo'lmasa vaqt o'tishi bilan nolga
+    so'nadi (LOAD_SHED_DECAY_SECONDS), shuning uchun load shedding yuklama tushgach to'xtaydi.
+    """
+    SMOOTHING = 0.2
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.slow = 0
+        self._recent_ms = 0.0
+        self._recent_at = time.monotonic()
+
+    def _decayed(self, now):
+        return self._recent_ms * math.exp(-(now - self._recent_at) / settings.LOAD_SHED_DECAY_SECONDS)
+
+    def record(self, elapsed_ms, slow):
+        now = time.monotonic()
+        with self._lock:
+            self.count += 1
+            self.total_ms += elapsed_ms
+            if elapsed_ms > self.max_ms:
+                self.max_ms = elapsed_ms
+            if slow:
+                self.slow += 1
+            recent = self._decayed(now)
+            self._recent_ms = recent + self.SMOOTHING * (elapsed_ms - recent)
+            self._recent_at = now
+
+    def recent_ms(self):
+        return self._decayed(time.monotonic())
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'acquire_count': self.count,
+                'acquire_avg_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+                'acquire_max_ms': round(self.max_ms, 3),
+                'acquire_slow': self.slow,
+                'acquire_recent_ms': round(self._decayed(time.monotonic()), 3),
+            }
+
+
+_acquire_stats = {}
+
+
+def get_acquire_stats(alias):
+    stats = _acquire_stats.get(alias)
+    if stats is None:
+        stats = _acquire_stats.setdefault(alias, AcquireStats())
+    return stats
+
+
+def record_acquire(alias, started):
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    slow = elapsed_ms >= settings.DB_POOL_SLOW_ACQUIRE_MS
+    get_acquire_stats(alias).record(elapsed_ms, slow)
+    if slow:
+        logger.warning("Slow DB connection acquire on %r: %.1f ms", alias, elapsed_ms)
+
+
+def recent_acquire_ms():
+    """Barcha alias'lar bo'yicha eng katta yaqindagi ulanish olish vaqti (ms)."""
+    return max((stats.recent_ms() for stats in list(_acquire_stats.values())), default=0.0)
+
+
+def pool_stats(alias):
+    connection = connections[alias]
+    stats = {'alias': alias, 'mode': 'pool' if getattr(connection, 'pool', None) else 'direct'}
+    stats.update(get_acquire_stats(alias).snapshot())
+
+    pool = getattr(connection, 'pool', None)
+    if pool is None:
+        stats['conn_max_age'] = connection.settings_dict.get('CONN_MAX_AGE')
+        return stats
+
+    raw = pool.get_stats()
+    size = raw.get('pool_size', 0)
+    available = raw.get('pool_available', 0)
+    queued = raw.get('requests_queued', 0)
+    stats.update({
+        'pool_min': raw.get('pool_min', 0),
+        'pool_max': raw.get('pool_max', 0),
+        'pool_size': size,
+        'pool_available': available,
+        'in_use': size - available,
+        # band ulanishlar / maksimum: 1.0 — pool to'lgan, yangi so'rovlar navbatda kutadi
+        'saturation': round((size - available) / raw['pool_max'], 3) if raw.get('pool_max') else 0.0,
+        'requests_waiting': raw.get('requests_waiting', 0),
+        'requests_num': raw.get('requests_num', 0),
+        'requests_queued': queued,
+        'requests_wait_avg_ms': round(raw.get('requests_wait_ms', 0) / queued, 3) if queued else 0.0,
+        'requests_errors': raw.get('requests_errors', 0),
+        'returns_bad': raw.get('returns_bad', 0),
+        'connections_num': raw.get('connections_num', 0),
+        'connections_errors': raw.get('connections_errors', 0),
+        'connections_lost': raw.get('connections_lost', 0),
+    })
+    return stats
+
+
+def all_pool_stats():
+    return [pool_stats(alias) for alias in connections]
@@ -0,0 +1,76 @@
+import json
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings, setup_databases, setup_test_environment, teardown_databases, \
+    teardown_test_environment
+
+from monitoring import benchmark
+from monitoring.seeding import SCALES
+
+
+class Command(BaseCommand):
+    help = (
+        "Har bir endpoint uchun latency va query sonini bir nechta ma'lumot hajmida o'lchaydi "
+        "va JSON hisobot yozadi. Alohida test bazada ishlaydi (asosiy baza o'zgarmaydi). "
+        "Misol: python manage.py benchmark --scales small,medium --output bench.json --compare old.json"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', default='small,medium',
+                            help=f"Vergul bilan: {', '.join(SCALES)}")
+        parser.add_argument('--iterations', type=int, default=10)
+        parser.add_argument('--warmup', type=int, default=1)
+        parser.add_argument('--case', action='append', dest='cases',
+                            help="Faqat shu endpoint(lar) (masalan management.tasks.list)")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', default='benchmark.json')
+        parser.add_argument('--compare', help="Oldingi hisobot (JSON) bilan solishtirish")
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help="p50 shu ulushdan ko'p sekinlashsa — regressiya")
+        parser.add_argument('--fail-on-regression', action='store_true')
+
+    def handle(self, *args, **options):
+        scales = [scale.strip() for scale in options['scales'].split(',') if scale.strip()]
+        unknown = set(scales) - set(SCALES)
+        if unknown:
+            raise CommandError(f"Unknown scale(s): {', '.join(sorted(unknown))}")
+
+        previous = None
+        if options['compare']:
+            with open(options['compare']) as fh:
+                previous = json.load(fh)
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False, aliases={'default'})
+        try:
+            # rasm variantlari so'rov ichida (worker jarayonlari test bazani ko'rmaydi),
+            # budget oshsa ham hisobot to'liq bo'lsin; throttle/load shedding o'lchovni buzmasin
+            with tempfile.TemporaryDirectory() as media_root, override_settings(
+                MEDIA_ROOT=media_root, TASK_IMAGE_WORKERS=0, QUERY_BUDGET_STRICT=False,
+                THROTTLE_ENABLED=False, LOAD_SHED_ENABLED=False,
+            ):
+                result = benchmark.run(
+                    scales=scales,
+                    iterations=options['iterations'],
+                    warmup=options['warmup'],
+                    cases=options['cases'],
+                    seed_value=options['seed'],
+                    report=self.stdout.write,
+                )
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        benchmark.dump(result, options['output'])
+        self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}."))
+
+        if previous is not None:
+            lines, regressions = benchmark.compare(previous, result, threshold=options['threshold'])
+            for line in lines:
+                self.stdout.write(line)
+            if regressions:
+                message = f"{regressions} regression(s) against {options['compare']}."
+                if options['fail_on_regression']:
+                    raise CommandError(message)
+                self.stdout.write(self.style.WARNING(message))
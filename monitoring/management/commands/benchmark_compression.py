@@ -0,0 +1,63 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from monitoring import compression_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Haqiqiy javoblarni (joriy baza, faqat GET) har bir kodek va daraja bilan siqib, hajm va CPU "
+        "narxini solishtiradi. Misol: python manage.py benchmark_compression --path /management/tasks/ "
+        "--bandwidth 10 --output compression.json"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', action='append', dest='paths',
+                            help=f"Javob yo'li (standart: {', '.join(compression_benchmark.DEFAULT_PATHS)})")
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--bandwidth', type=float, default=10.0,
+                            help="Umumiy vaqt uchun tarmoq tezligi (Mbit/s)")
+        parser.add_argument('--output', help="JSON hisobot fayli")
+
+    def handle(self, *args, **options):
+        try:
+            # throttle o'lchovni buzmasin
+            with override_settings(THROTTLE_ENABLED=False, LOAD_SHED_ENABLED=False, QUERY_BUDGET_STRICT=False):
+                result = compression_benchmark.run(
+                    paths=options['paths'] or compression_benchmark.DEFAULT_PATHS,
+                    repeat=options['repeat'],
+                    bandwidth_mbit=options['bandwidth'],
+                    report=self.stdout.write,
+                )
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+
+        configured = result['configured']
+        for path, payload in result['payloads'].items():
+            self.stdout.write(f"\n{path} ({payload['bytes']} bytes, total = compress + transfer "
+                              f"at {result['bandwidth_mbit']:g} Mbit/s)")
+            best = {}
+            for row in payload['results']:
+                if row['encoding'] != 'identity' and (
+                        row['encoding'] not in best or row['total_ms'] < best[row['encoding']]['total_ms']):
+                    best[row['encoding']] = row
+            for row in payload['results']:
+                marks = []
+                if row['level'] is not None and configured.get(row['encoding']) == row['level']:
+                    marks.append('configured')
+                if best.get(row['encoding']) is row:
+                    marks.append('fastest total')
+                level = '' if row['level'] is None else row['level']
+                speed = '' if row['mb_per_s'] is None else f"{row['mb_per_s']:8.1f} MB/s"
+                self.stdout.write(
+                    f"  {row['encoding']:8} {level!s:>3}  {row['bytes']:10}  x{row['ratio']:<6}"
+                    f"  {row['compress_ms']:9.2f} ms  {speed:13}  total {row['total_ms']:9.2f} ms"
+                    f"  {', '.join(marks)}"
+                )
+
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(result, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}."))
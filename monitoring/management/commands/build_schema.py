@@ -0,0 +1,31 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from config.schema import generate_schema
+
+
+class Command(BaseCommand):
+    help = (
+        "OpenAPI spec'ni generatsiya qilib OPENAPI_SCHEMA_FILE ga yozadi (deploy/build paytida). "
+        "--check: faylni o'zgartirmaydi, view'lar bilan mos kelmasa xato bilan chiqadi (CI uchun)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help="Standart: settings.OPENAPI_SCHEMA_FILE")
+        parser.add_argument('--check', action='store_true')
+
+    def handle(self, *args, **options):
+        path = Path(options['output'] or settings.OPENAPI_SCHEMA_FILE)
+        schema = generate_schema()
+
+        if options['check']:
+            if not path.exists() or path.read_bytes() != schema:
+                raise CommandError(f"{path} is out of date; run `python manage.py build_schema`.")
+            self.stdout.write(self.style.SUCCESS(f"{path} is up to date."))
+            return
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(schema)
+        self.stdout.write(self.style.SUCCESS(f"Schema written to {path} ({len(schema)} bytes)."))
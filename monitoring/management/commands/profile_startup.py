@@ -0,0 +1,71 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from monitoring import startup
+
+
+class Command(BaseCommand):
+    help = (
+        "Worker startup vaqtini o'lchaydi: WSGI ilovani yuklash, birinchi so'rov va modul bo'yicha "
+        "import vaqti (har o'lchov — yangi jarayon). "
+        "Misol (CI): python manage.py profile_startup --compare startup-baseline.json --fail-on-regression"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--path', default='/accounts/me/', help="Birinchi so'rov yo'li")
+        parser.add_argument('--host', help="Standart: ALLOWED_HOSTS'dagi birinchi host yoki localhost")
+        parser.add_argument('--top', type=int, default=25)
+        parser.add_argument('--output', help="JSON hisobot fayli")
+        parser.add_argument('--compare', help="Oldingi hisobot (JSON) bilan solishtirish")
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help="Median shu ulushdan ko'p sekinlashsa — regressiya")
+        parser.add_argument('--fail-on-regression', action='store_true')
+
+    def handle(self, *args, **options):
+        previous = None
+        if options['compare']:
+            with open(options['compare']) as fh:
+                previous = json.load(fh)
+
+        try:
+            result = startup.run(
+                runs=options['runs'],
+                path=options['path'],
+                host=options['host'],
+                top=options['top'],
+                report=self.stdout.write,
+            )
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write("\nSlowest imports (cumulative):")
+        for row in result['modules']:
+            self.stdout.write(f"  {row['cumulative_ms']:8.1f} ms  {row['self_ms']:8.1f} ms self  "
+                              f"{row['module']} ({row['phase']})")
+        self.stdout.write("\nBy package (self):")
+        for name, ms in result['packages'].items():
+            self.stdout.write(f"  {ms:8.1f} ms  {name}")
+        self.stdout.write(
+            f"\nload {result['load_ms']:.1f} ms + first request {result['first_request_ms']:.1f} ms "
+            f"= {result['total_ms']:.1f} ms; imports {result['import_ms']:.1f} ms, {result['module_count']} modules"
+        )
+        if result['lazy_modules_loaded']:
+            self.stdout.write(self.style.WARNING(
+                f"Loaded at startup: {', '.join(result['lazy_modules_loaded'])}"
+            ))
+
+        if options['output']:
+            startup.dump(result, options['output'])
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}."))
+
+        if previous is not None:
+            lines, regressions = startup.compare(previous, result, threshold=options['threshold'])
+            for line in lines:
+                self.stdout.write(line)
+            if regressions:
+                message = f"{regressions} regression(s) against {options['compare']}."
+                if options['fail_on_regression']:
+                    raise CommandError(message)
+                self.stdout.write(self.style.WARNING(message))
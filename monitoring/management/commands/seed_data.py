@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from monitoring.seeding import SCALES, seed
+
+
+class Command(BaseCommand):
+    help = (
+        "Sintetik ma'lumot yaratadi: user, project, sprint, task, assignee va audit log qatorlari "
+        "(millionlab qatorgacha). PostgreSQL'da COPY, boshqa bazalarda bulk_create. "
+        "Misol: python manage.py seed_data --scale large --seed 42"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=sorted(SCALES), default='small',
+                            help="Tayyor hajm; quyidagi parametrlar uni alohida o'zgartiradi")
+        parser.add_argument('--users', type=int)
+        parser.add_argument('--projects', type=int)
+        parser.add_argument('--sprints', type=int, help="Har bir loyiha uchun")
+        parser.add_argument('--tasks', type=int, help="Har bir sprint uchun")
+        parser.add_argument('--assignees', type=int, help="Har bir task uchun")
+        parser.add_argument('--audit', type=int, help="Har bir task uchun audit log soni")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--deleted-ratio', type=float, default=0.02,
+                            help="Soft-deleted qatorlar ulushi")
+        parser.add_argument('--prefix', default='seed', help="User email prefiksi")
+        parser.add_argument('--no-copy', action='store_true', help="PostgreSQL'da ham bulk_create")
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        counts = seed(
+            scale=options['scale'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            using=options['database'],
+            prefix=options['prefix'],
+            use_copy=False if options['no_copy'] else None,
+            deleted_ratio=options['deleted_ratio'],
+            report=self.stdout.write,
+            users=options['users'],
+            projects=options['projects'],
+            sprints=options['sprints'],
+            tasks=options['tasks'],
+            assignees=options['assignees'],
+            audit=options['audit'],
+        )
+        for label, count in counts.items():
+            self.stdout.write(f"{label}: {count}")
+        total = sum(counts.values())
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"{total} row(s) inserted in {elapsed:.1f}s."))
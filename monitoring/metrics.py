@@ -0,0 +1,119 @@
+"""
+Prometheus metrikalari.
+
+Bir nechta gunicorn worker bo'lsa PROMETHEUS_MULTIPROC_DIR o'rnatiladi (gunicorn.conf.py):
+har bir worker qiymatlarni shu papkadagi mmap fayllarga yozadi, /metrics hammasini yig'adi.
+Yozish — lock'siz mmap yoki bitta qiymat mutex'i, so'rovga qo'shimcha vaqt mikrosekundlarda.
+"""
+import os
+import time
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest,
+)
+from prometheus_client import multiprocess
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route",
+    ["route", "method"],
+)
+RESPONSES = Counter(
+    "http_responses_total",
+    "Responses by route and status code",
+    ["route", "method", "status"],
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_seconds",
+    "Total database time per request, by route",
+    ["route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database queries per request, by route",
+    ["route"],
+    buckets=(1, 2, 3, 5, 8, 13, 21, 34, 55),
+)
+IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests currently being handled",
+    multiprocess_mode="livesum",
+)
+THROTTLED = Counter(
+    "http_requests_throttled_total",
+    "Requests rejected with 429 by the role token-bucket throttle",
+    ["role", "scope"],
+)
+SHED = Counter(
+    "http_requests_shed_total",
+    "Requests rejected with 503 by load shedding",
+    ["reason"],
+)
+# hit ratio: rate(cache_requests_total{result="hit"}) / rate(cache_requests_total)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by cache alias and result",
+    ["cache", "result"],
+)
+
+
+def route_of(request):
+    """URL shabloni (masalan management/tasks/<int:pk>/) — label qiymatlari soni chegaralangan."""
+    match = getattr(request, "resolver_match", None)
+    return match.route if match is not None else UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Eng tashqi middleware: latency, status kodlar, DB vaqti (QueryBudgetMiddleware'dan), in-flight."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        IN_FLIGHT.inc()
+        try:
+            response = self.get_response(request)
+        finally:
+            IN_FLIGHT.dec()
+
+        route = route_of(request)
+        REQUEST_LATENCY.labels(route, request.method).observe(time.perf_counter() - started)
+        RESPONSES.labels(route, request.method, response.status_code).inc()
+
+        stats = getattr(request, "query_stats", None)
+        if stats is not None:
+            REQUEST_DB_TIME.labels(route).observe(stats.time)
+            REQUEST_DB_QUERIES.labels(route).observe(stats.count)
+        return response
+
+
+def get_registry():
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def metrics_view(request):
+    """
+    GET /metrics — Prometheus text format.
+    METRICS_TOKEN o'rnatilgan bo'lsa `Authorization: Bearer <token>` talab qilinadi;
+    o'rnatilmagan bo'lsa endpoint faqat DEBUG rejimda ochiq.
+    """
+    token = settings.METRICS_TOKEN
+    if token:
+        if not constant_time_compare(request.META.get("HTTP_AUTHORIZATION", ""), f"Bearer {token}"):
+            return HttpResponse(status=401)
+    elif not settings.DEBUG:
+        raise Http404()
+
+    return HttpResponse(generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,131 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.http import FileResponse
+
+logger = logging.getLogger(__name__)
+
+# IN (%s, %s, ...) — elementlar soni har xil bo'lsa ham bitta shakl
+_IN_LIST = re.compile(r"IN \((?:%s, )*%s\)")
+_NUMBER = re.compile(r"\b\d+\b")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Strict rejimda (testlar) view o'z query budget'idan oshsa."""
+
+
+def sql_shape(sql):
+    """Parametrlarsiz SQL shakli: bir xil shakl ko'p marta — odatda N+1."""
+    return _NUMBER.sub("N", _IN_LIST.sub("IN (...)", sql))
+
+
+class QueryStats:
+    """Bitta so'rov davomida barcha DB alias'lardagi query'lar."""
+
+    def __init__(self):
+        self.count = 0
+        self.time = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.time += time.perf_counter() - started
+            self.count += 1
+            self.shapes[sql_shape(sql)] += 1
+
+    def record(self):
+        """Barcha ulanishlarga execute_wrapper o'rnatadi (with bilan ishlatiladi)."""
+        stack = ExitStack()
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(self))
+        return stack
+
+    @property
+    def time_ms(self):
+        return self.time * 1000
+
+    def duplicates(self, threshold):
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+def get_query_budget(view_func, method=None):
+    """
+    View'ning `query_budget` atributi (DRF view class'ida yoki funksiya view'da).
+    Son — barcha metodlar uchun; dict — metod bo'yicha ({"GET": 3, "POST": 12}).
+    None — budget e'lon qilinmagan (dict'da metod yo'q bo'lsa ham).
+    Budget JWTAuthentication'ning user so'rovini ham o'z ichiga oladi.
+    """
+    view_class = getattr(view_func, "view_class", None) or getattr(view_func, "cls", None)
+    budget = getattr(view_class or view_func, "query_budget", None)
+    if isinstance(budget, dict):
+        return budget.get(method)
+    return budget
+
+
+class QueryBudgetMiddleware:
+    """
+    Har so'rov uchun query soni, umumiy DB vaqti va takrorlangan SQL shakllarini yozadi.
+    `query_budget`dan oshsa: QUERY_BUDGET_STRICT bo'lsa exception (testlar yiqiladi),
+    aks holda warning log. Takroriy shakllar (N+1) QUERY_DUPLICATE_THRESHOLD dan boshlab log qilinadi.
+
+    StreamingHttpResponse'da javob oqimi davomidagi query'lar ham shu budget'ga kiradi:
+    tekshiruv oqim tugagandan keyin. X-DB-Queries sarlavhasida esa faqat oqimgacha bo'lganlari.
+    FileResponse va async oqimlar hisoblanmaydi (fayl uzatishda query yo'q).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = QueryStats()
+        request.query_stats = stats
+        with stats.record():
+            response = self.get_response(request)
+
+        if response.streaming and not response.is_async and not isinstance(response, FileResponse):
+            response.streaming_content = self.count_streaming(request, stats, response.streaming_content)
+        else:
+            self.check(request, stats)
+        if settings.DEBUG:
+            response["X-DB-Queries"] = str(stats.count)
+            response["X-DB-Time-ms"] = f"{stats.time_ms:.1f}"
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = get_query_budget(view_func, request.method)
+
+    def count_streaming(self, request, stats, content):
+        with stats.record():
+            yield from content
+        self.check(request, stats)
+
+    def check(self, request, stats):
+        view = f"{request.method} {getattr(request.resolver_match, 'view_name', None) or request.path}"
+
+        duplicates = stats.duplicates(settings.QUERY_DUPLICATE_THRESHOLD)
+        if duplicates:
+            logger.warning(
+                "Repeated SQL in %s (possible N+1): %s",
+                view, "; ".join(f"{n}x {shape[:200]}" for shape, n in duplicates),
+            )
+
+        budget = getattr(request, "query_budget", None)
+        if budget is None or stats.count <= budget:
+            logger.debug("%s: %d queries, %.1f ms", view, stats.count, stats.time_ms)
+            return
+
+        message = (
+            f"{view} ran {stats.count} queries ({stats.time_ms:.1f} ms), budget is {budget}. "
+            "Most repeated: " + "; ".join(f"{n}x {shape[:200]}" for shape, n in stats.shapes.most_common(3))
+        )
+        if settings.QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
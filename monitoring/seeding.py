@@ -0,0 +1,263 @@
+"""
+Katta hajmdagi sintetik ma'lumot (python manage.py seed_data).
+
+Qatorlar batch'lab yoziladi: PostgreSQL'da COPY, boshqa bazalarda bulk_create.
+Bir xil seed — bir xil ma'lumot (email'lar prefix + seed + tartib raqamdan).
+Yangi pk'lar batch'dan keyin `pk > oldingi max` bo'yicha o'qiladi, shuning uchun xotira
+faqat bitta batch hajmida; seeding paytida bazaga boshqa yozuvchi bo'lmasligi kerak.
+"""
+import random
+from datetime import timedelta
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.db import connections, models
+from django.db.models import Max
+from django.utils import timezone
+
+from accounts.models import User
+from audit.models import AuditLog
+from management.models import Project, Sprint, Task
+from management.ranking import spaced_ranks
+
+# har bir loyiha uchun sprint, har bir sprint uchun task
+SCALES = {
+    'small': dict(users=50, projects=10, sprints=4, tasks=25, assignees=2, audit=2),
+    'medium': dict(users=500, projects=100, sprints=8, tasks=25, assignees=2, audit=3),
+    'large': dict(users=5000, projects=1000, sprints=10, tasks=100, assignees=3, audit=3),
+    'xlarge': dict(users=20000, projects=2000, sprints=20, tasks=100, assignees=3, audit=4),
+}
+
+SEED_PASSWORD = 'seed-password'
+
+WORDS = (
+    'api', 'auth', 'billing', 'cache', 'dashboard', 'deploy', 'export', 'fix', 'import', 'index',
+    'login', 'migrate', 'mobile', 'notify', 'payment', 'profile', 'refactor', 'report', 'search',
+    'sync', 'upload', 'webhook', 'sprint', 'review', 'test', 'docs', 'queue', 'worker', 'metrics',
+)
+
+ROLE_WEIGHTS = (
+    (User.Role.PM, 5),
+    (User.Role.DEV, 85),
+    (User.Role.VIEWER, 10),
+)
+
+TASK_STATUS_WEIGHTS = (
+    (Task.Status.TO_DO, 30),
+    (Task.Status.IN_PROGRESS, 20),
+    (Task.Status.QA_TESTING, 10),
+    (Task.Status.PM_REVIEW, 10),
+    (Task.Status.COMPLETED, 25),
+    (Task.Status.ON_HOLD, 5),
+)
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Seeder:
+
+    def __init__(self, seed=42, batch_size=5000, using='default', prefix='seed', use_copy=None,
+                 deleted_ratio=0.02, report=None):
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.batch_size = batch_size
+        self.using = using
+        self.prefix = prefix
+        self.connection = connections[using]
+        if use_copy is None:
+            use_copy = self.connection.vendor == 'postgresql'
+        self.use_copy = use_copy
+        self.deleted_ratio = deleted_ratio
+        self.report = report or (lambda message: None)
+        self.now = timezone.now()
+        self.counts = {}
+
+    # ---------- yozish ----------
+
+    def _max_pk(self, model):
+        return model._base_manager.using(self.using).aggregate(m=Max('pk'))['m'] or 0
+
+    def insert(self, model, objs, returning=True):
+        """Bitta batch'ni yozadi; returning=True bo'lsa yangi pk'lar (yozilish tartibida)."""
+        before = self._max_pk(model) if returning else None
+
+        if self.use_copy:
+            self._copy(model, objs)
+        else:
+            model._base_manager.using(self.using).bulk_create(objs, batch_size=self.batch_size)
+
+        label = model._meta.label
+        self.counts[label] = self.counts.get(label, 0) + len(objs)
+        if not returning:
+            return None
+        return list(
+            model._base_manager.using(self.using)
+            .filter(pk__gt=before).order_by('pk').values_list('pk', flat=True)
+        )
+
+    def _copy(self, model, objs):
+        connection = self.connection
+        fields = [f for f in model._meta.local_concrete_fields if not isinstance(f, models.AutoField)]
+        table = connection.ops.quote_name(model._meta.db_table)
+        columns = ', '.join(connection.ops.quote_name(f.column) for f in fields)
+
+        with connection.cursor() as cursor:
+            with cursor.copy(f'COPY {table} ({columns}) FROM STDIN') as copy:
+                for obj in objs:
+                    copy.write_row([self._db_value(f, obj) for f in fields])
+
+    def _db_value(self, field, obj):
+        value = getattr(obj, field.attname)
+        # bulk_create'dagidek auto_now/auto_now_add — lekin oldindan berilgan vaqt saqlanadi
+        if value is None and (getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)):
+            value = self.now
+        return field.get_db_prep_save(value, self.connection)
+
+    def insert_all(self, model, objs, returning=False):
+        ids = []
+        for batch in batched(objs, self.batch_size):
+            result = self.insert(model, batch, returning=returning)
+            if returning:
+                ids.extend(result)
+        return ids
+
+    # ---------- generatorlar ----------
+
+    def choice(self, weighted):
+        values, weights = zip(*weighted)
+        return self.rng.choices(values, weights)[0]
+
+    def words(self, low, high):
+        return ' '.join(self.rng.choice(WORDS) for _ in range(self.rng.randint(low, high)))
+
+    def make_users(self, count):
+        password = make_password(SEED_PASSWORD)
+        start = User.all_objects.using(self.using).filter(email__startswith=f'{self.prefix}.').count()
+        for i in range(start, start + count):
+            role = User.Role.OWNER if i == 0 else self.choice(ROLE_WEIGHTS)
+            yield User(
+                email=f'{self.prefix}.{self.seed}.{i}@example.com',
+                name=f'{role.title()} {i}',
+                role=role,
+                password=password,
+            )
+
+    def soft_deleted(self):
+        if self.rng.random() < self.deleted_ratio:
+            return {'is_deleted': True, 'deleted_at': self.now - timedelta(days=self.rng.randint(1, 200))}
+        return {}
+
+    def run(self, users, projects, sprints, tasks, assignees, audit):
+        user_ids = self.insert_all(User, self.make_users(users), returning=True)
+        roles = dict(User.all_objects.using(self.using).filter(pk__in=user_ids).values_list('pk', 'role'))
+        pms = [pk for pk in user_ids if roles[pk] in (User.Role.PM, User.Role.OWNER)]
+        devs = [pk for pk in user_ids if roles[pk] == User.Role.DEV] or user_ids
+        self.report(f"users: {len(user_ids)}")
+
+        project_starts = []
+        project_objs = []
+        for i in range(projects):
+            start = self.now - timedelta(days=self.rng.randint(0, 720))
+            project_starts.append(start)
+            project_objs.append(Project(
+                title=f'{self.words(1, 3).title()} #{i}',
+                start_date=start,
+                end_date=start + timedelta(days=14 * sprints + 14),
+                status=self.rng.choice(Project.Status.values),
+                pm_id=self.rng.choice(pms),
+                **self.soft_deleted(),
+            ))
+        project_ids = self.insert_all(Project, project_objs, returning=True)
+        self.report(f"projects: {len(project_ids)}")
+
+        sprint_objs = []
+        for project_id, start in zip(project_ids, project_starts):
+            for n in range(sprints):
+                sprint_objs.append(Sprint(
+                    project_id=project_id,
+                    name=f'Sprint {n + 1}',
+                    start_date=start + timedelta(days=14 * n),
+                    duration_days=14,
+                    end_date=start + timedelta(days=14 * n + 14),
+                    status=self.rng.choice(Sprint.Status.values),
+                    **self.soft_deleted(),
+                ))
+        sprint_ids = self.insert_all(Sprint, sprint_objs, returning=True)
+        sprint_starts = dict(zip(sprint_ids, (s.start_date for s in sprint_objs)))
+        del sprint_objs
+        self.report(f"sprints: {len(sprint_ids)}")
+
+        # task'lar batch'lab: har batch'dan keyin shu task'lar uchun assignee va audit qatorlari
+        task_rows = ((sprint_id, n) for sprint_id in sprint_ids for n in range(tasks))
+        # board tartibi: sprint ichidagi raqam bo'yicha (har status ustunida ham o'sib boradi)
+        ranks = spaced_ranks(tasks)
+        for batch in batched(task_rows, self.batch_size):
+            task_objs = [self.make_task(sprint_id, n, sprint_starts[sprint_id], ranks[n]) for sprint_id, n in batch]
+            task_ids = self.insert(Task, task_objs, returning=True)
+            self.insert_links(task_ids, devs, assignees)
+            self.insert_audit(task_ids, task_objs, pms, audit)
+        self.report(f"tasks: {self.counts.get(Task._meta.label, 0)}")
+
+        return self.counts
+
+    def make_task(self, sprint_id, n, sprint_start, rank):
+        start = sprint_start + timedelta(days=self.rng.randint(0, 10))
+        return Task(
+            sprint_id=sprint_id,
+            title=f'{self.words(2, 5).capitalize()} {n}',
+            description=self.words(5, 30),
+            start_date=start,
+            due_date=start + timedelta(days=self.rng.randint(1, 7)),
+            status=self.choice(TASK_STATUS_WEIGHTS),
+            rank=rank,
+            **self.soft_deleted(),
+        )
+
+    def insert_links(self, task_ids, devs, per_task):
+        through = Task.assignees.through
+        links = [
+            through(task_id=task_id, user_id=user_id)
+            for task_id in task_ids
+            for user_id in self.rng.sample(devs, min(per_task, len(devs)))
+        ]
+        self.insert(through, links, returning=False)
+
+    def insert_audit(self, task_ids, task_objs, pms, per_task):
+        if not per_task:
+            return
+        statuses = Task.Status.values
+        logs = []
+        for task_id, task in zip(task_ids, task_objs):
+            created = task.start_date
+            path = f'/management/tasks/{task_id}/'
+            logs.append(AuditLog(
+                action=AuditLog.Action.CREATE, model='management.Task', object_id=str(task_id),
+                object_repr=task.title[:255], user_id=self.rng.choice(pms), changes={},
+                path='/management/tasks/', method='POST', ip_address='10.0.0.1', created_at=created,
+            ))
+            old = Task.Status.TO_DO
+            for n in range(per_task - 1):
+                new = self.rng.choice(statuses)
+                logs.append(AuditLog(
+                    action=AuditLog.Action.UPDATE, model='management.Task', object_id=str(task_id),
+                    object_repr=task.title[:255], user_id=self.rng.choice(pms),
+                    changes={'status': {'old': old, 'new': new}},
+                    path=path + 'change-status/', method='PATCH', ip_address='10.0.0.1',
+                    created_at=created + timedelta(hours=n + 1),
+                ))
+                old = new
+        self.insert(AuditLog, logs, returning=False)
+
+
+def seed(scale=None, seed=42, batch_size=5000, using='default', prefix='seed', use_copy=None,
+         deleted_ratio=0.02, report=None, **volumes):
+    """`scale` (SCALES kaliti) asosida, `volumes` bilan alohida qiymatlar ustidan yoziladi."""
+    params = dict(SCALES[scale or 'small'])
+    params.update({key: value for key, value in volumes.items() if value is not None})
+    seeder = Seeder(seed=seed, batch_size=batch_size, using=using, prefix=prefix, use_copy=use_copy,
+                    deleted_ratio=deleted_ratio, report=report)
+    return seeder.run(**params)
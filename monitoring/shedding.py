@@ -0,0 +1,84 @@
+"""
+Adaptiv load shedding: worker band bo'lsa so'rov view'ga yetmasdan 503 + Retry-After oladi.
+
+Signal'lar (shu worker jarayoni bo'yicha):
+- navbatda kutish vaqti: proxy qo'ygan X-Request-Start (nginx: proxy_set_header X-Request-Start
+  "t=${msec}";) dan worker so'rovni olguncha — LOAD_SHED_QUEUE_MS dan boshlab rad etish ehtimoli
+  chiziqli oshadi, 2x da — 100%. Sync worker'lar (bir jarayon — bir so'rov) band bo'lganda so'rovlar
+  gunicorn backlog'ida kutadi, shuning uchun ular uchun asosiy signal shu; kutib bo'lgan so'rov
+  view'ga yetmay qaytadi va navbat tezroq tarqaladi;
+- in-flight so'rovlar (faqat gthread/ASGI worker'larda ma'noli) — LOAD_SHED_MAX_IN_FLIGHT dan oshsa
+  hammasi rad etiladi;
+- DB ulanish olishning yaqindagi o'rtacha vaqti (monitoring.db) — LOAD_SHED_POOL_WAIT_MS dan
+  boshlab rad etish ehtimoli chiziqli oshadi, 2x da — 100%. O'rtacha vaqt o'lchov bo'lmasa so'nadi,
+  shuning uchun yuklama tushgach so'rovlar asta-sekin qaytadi.
+"""
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.http import JsonResponse
+
+from .db import recent_acquire_ms
+from .metrics import SHED
+
+
+def queue_ms(header, now=None):
+    """
+    X-Request-Start'dan navbatda kutilgan vaqt (ms) yoki None. Qiymat 't=' bilan yoki usiz;
+    sekund (nginx ${msec}: 1700000000.123), millisekund yoki mikrosekund — kattaligidan aniqlanadi.
+    """
+    value = header.strip().removeprefix('t=')
+    try:
+        started = float(value)
+    except ValueError:
+        return None
+    if started > 1e14:
+        started /= 1e6
+    elif started > 1e11:
+        started /= 1e3
+    return max(0.0, ((time.time() if now is None else now) - started) * 1000)
+
+
+def shed_decision(in_flight, queued_ms=None):
+    """(rad etish ehtimoli 0..1, sabab)."""
+    if in_flight >= settings.LOAD_SHED_MAX_IN_FLIGHT:
+        return 1.0, 'in_flight'
+    decision = 0.0, None
+    for reason, pressure in (
+        ('queue_time', (queued_ms or 0) / settings.LOAD_SHED_QUEUE_MS),
+        ('db_pool_wait', recent_acquire_ms() / settings.LOAD_SHED_POOL_WAIT_MS),
+    ):
+        if pressure > 1 and min(1.0, pressure - 1) > decision[0]:
+            decision = min(1.0, pressure - 1), reason
+    return decision
+
+
+class LoadSheddingMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.in_flight = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        if not settings.LOAD_SHED_ENABLED or request.path.startswith(settings.LOAD_SHED_EXEMPT_PATHS):
+            return self.get_response(request)
+
+        start_header = request.META.get('HTTP_X_REQUEST_START')
+        queued_ms = queue_ms(start_header) if start_header else None
+        probability, reason = shed_decision(self.in_flight, queued_ms)
+        if probability and random.random() < probability:
+            SHED.labels(reason).inc()
+            response = JsonResponse({'detail': "Server is overloaded, please retry later."}, status=503)
+            response['Retry-After'] = str(round(settings.LOAD_SHED_RETRY_AFTER * (1 + probability)))
+            return response
+
+        with self.lock:
+            self.in_flight += 1
+        try:
+            return self.get_response(request)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
@@ -0,0 +1,174 @@
+"""
+Worker startup profili (python manage.py profile_startup).
+
+Har bir o'lchov — yangi Python jarayoni (`-X importtime`): WSGI ilovasini yuklash (django.setup,
+app'lar, modellar) va birinchi so'rov (URLconf, view modullari, middleware) vaqti alohida yoziladi.
+importtime natijasidan modul/paket bo'yicha import vaqti chiqariladi. Natija — commit'lar orasida
+solishtirsa bo'ladigan JSON hisobot (benchmark bilan bir xil uslubda).
+"""
+import json
+import re
+import statistics
+import subprocess
+import sys
+from collections import Counter
+
+from django.conf import settings
+
+from .benchmark import git_revision
+
+# worker startup'ida yuklanmasligi kerak bo'lgan og'ir, faqat ba'zi yo'llarda kerak modullar
+# (drf_yasg paketining o'zi INSTALLED_APPS orqali yuklanadi — u yengil)
+LAZY_MODULES = ('drf_yasg.openapi', 'drf_yasg.generators', 'PIL')
+
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$')
+
+# importtime chiqishida yuklash va birinchi so'rov fazalari chegarasi
+MARKER = '-- first request --'
+
+# bola jarayonda ishlaydi: gunicorn worker'i qiladigan ishni takrorlaydi
+PROBE = r'''
+import json, sys, time
+MARKER = %r
+from importlib import import_module
+started = time.perf_counter()
+module_name, attr = sys.argv[1].rsplit('.', 1)
+application = getattr(import_module(module_name), attr)
+loaded = time.perf_counter()
+print(MARKER, file=sys.stderr, flush=True)
+environ = {
+    'REQUEST_METHOD': 'GET', 'PATH_INFO': sys.argv[2], 'QUERY_STRING': '', 'SCRIPT_NAME': '',
+    'SERVER_NAME': sys.argv[3], 'SERVER_PORT': '80', 'HTTP_HOST': sys.argv[3],
+    'SERVER_PROTOCOL': 'HTTP/1.1', 'REMOTE_ADDR': '127.0.0.1',
+    'wsgi.version': (1, 0), 'wsgi.url_scheme': 'http', 'wsgi.input': sys.stdin.buffer,
+    'wsgi.errors': sys.stderr, 'wsgi.multithread': False, 'wsgi.multiprocess': True,
+    'wsgi.run_once': False,
+}
+status = []
+body = application(environ, lambda s, headers, exc_info=None: status.append(s))
+for _ in body:
+    pass
+if hasattr(body, 'close'):
+    body.close()
+finished = time.perf_counter()
+print(json.dumps({
+    'load_ms': (loaded - started) * 1000,
+    'first_request_ms': (finished - loaded) * 1000,
+    'status': status[0] if status else None,
+    'modules': sorted(sys.modules),
+}))
+''' % MARKER
+
+
+def parse_importtime(stderr):
+    """
+    [(modul, self_us, cumulative_us, chuqurlik, faza)] — importtime tartibida; faza 'load' yoki 'request'.
+    importlib.import_module orqali yuklangan modullar (INSTALLED_APPS) importtime'da alohida
+    qator bo'lmaydi, ularning ichki importlari esa yuqori darajali qator sifatida chiqadi.
+    """
+    rows = []
+    phase = 'load'
+    for line in stderr.splitlines():
+        if line == MARKER:
+            phase = 'request'
+            continue
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            rows.append((match.group(4), int(match.group(1)), int(match.group(2)),
+                         len(match.group(3)) // 2, phase))
+    return rows
+
+
+def default_host():
+    for host in settings.ALLOWED_HOSTS:
+        if host not in ('*',) and not host.startswith('.'):
+            return host
+    return 'localhost'
+
+
+def probe(path, host, wsgi_application=None):
+    cmd = [sys.executable, '-X', 'importtime', '-c', PROBE,
+           wsgi_application or settings.WSGI_APPLICATION, path, host]
+    proc = subprocess.run(cmd, capture_output=True, text=True, stdin=subprocess.DEVNULL)
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode or not lines:
+        raise RuntimeError(f"Startup probe failed ({proc.returncode}):\n{proc.stderr[-4000:]}")
+    result = json.loads(lines[-1])
+    rows = parse_importtime(proc.stderr)
+    result['import_ms'] = sum(row[2] for row in rows if row[3] == 0) / 1000
+    result['request_import_ms'] = sum(row[2] for row in rows if row[3] == 0 and row[4] == 'request') / 1000
+    result['rows'] = rows
+    return result
+
+
+def summarize(rows, top=25):
+    packages = Counter()
+    for name, self_us, *_ in rows:
+        packages[name.split('.')[0]] += self_us
+    modules = sorted(rows, key=lambda row: row[2], reverse=True)[:top]
+    return {
+        'packages': {name: round(us / 1000, 2) for name, us in packages.most_common(top)},
+        'modules': [
+            {'module': name, 'self_ms': round(self_us / 1000, 2), 'cumulative_ms': round(cum / 1000, 2),
+             'phase': phase}
+            for name, self_us, cum, _, phase in modules
+        ],
+    }
+
+
+def run(runs=5, path='/accounts/me/', host=None, top=25, report=None):
+    report = report or (lambda message: None)
+    host = host or default_host()
+    samples = []
+    for n in range(runs):
+        sample = probe(path, host)
+        samples.append(sample)
+        report(f"run {n + 1}: load {sample['load_ms']:.1f} ms, first request {sample['first_request_ms']:.1f} ms "
+               f"({sample['status']}), imports {sample['import_ms']:.1f} ms "
+               f"({sample['request_import_ms']:.1f} ms in first request)")
+
+    # modul kesimi — umumiy vaqti mediana bo'lgan o'lchovdan
+    totals = [sample['load_ms'] + sample['first_request_ms'] for sample in samples]
+    median_sample = samples[sorted(range(runs), key=totals.__getitem__)[runs // 2]]
+    loaded = set(median_sample['modules'])
+    return {
+        'meta': {
+            'git': git_revision(),
+            'python': sys.version.split()[0],
+            'runs': runs,
+            'path': path,
+        },
+        'load_ms': round(statistics.median(s['load_ms'] for s in samples), 2),
+        'first_request_ms': round(statistics.median(s['first_request_ms'] for s in samples), 2),
+        'total_ms': round(statistics.median(totals), 2),
+        'import_ms': round(statistics.median(s['import_ms'] for s in samples), 2),
+        'request_import_ms': round(statistics.median(s['request_import_ms'] for s in samples), 2),
+        'module_count': len(loaded),
+        'lazy_modules_loaded': [name for name in LAZY_MODULES if name in loaded],
+        **summarize(median_sample['rows'], top=top),
+    }
+
+
+def compare(old, new, threshold=0.2, floor_ms=5.0):
+    """Hisobot satrlari va regressiyalar soni; `floor_ms` — shovqin uchun minimal farq."""
+    lines = []
+    regressions = 0
+    for key in ('load_ms', 'first_request_ms', 'total_ms', 'import_ms'):
+        before, after = old.get(key), new.get(key)
+        if before is None or after is None:
+            continue
+        change = (after - before) / before if before else 0.0
+        regressed = change > threshold and after - before > floor_ms
+        regressions += regressed
+        lines.append(f"{'REGRESSION ' if regressed else ''}{key}: {before:.1f} -> {after:.1f} ms ({change:+.0%})")
+    for name in new.get('lazy_modules_loaded', []):
+        if name not in old.get('lazy_modules_loaded', []):
+            regressions += 1
+            lines.append(f"REGRESSION {name} is now imported at startup")
+    return lines, regressions
+
+
+def dump(result, path):
+    with open(path, 'w') as fh:
+        json.dump(result, fh, indent=2)
+        fh.write('\n')
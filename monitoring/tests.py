@@ -0,0 +1,398 @@
+import gzip
+import json
+import os
+import time
+import zlib
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from accounts.models import User
+from audit.models import AuditLog
+from config.compression import CompressionMiddleware, negotiate
+from config.db_router import STICKY_CACHE_KEY, PrimaryReplicaRouter, ReplicaRoutingMiddleware, use_primary
+
+from config.schema import generate_schema, load_schema_file
+from config.swagger import LAZY_ATTR, Deferred, apply_swagger_auto_schema, openapi, swagger_auto_schema
+from management.models import Project, Task
+from management.tests import APITestCase
+from monitoring import startup
+from monitoring.benchmark import Benchmark, compare, percentile
+from monitoring.checks import throttle_cache_check
+from monitoring.db import AcquireStats
+from monitoring.seeding import seed
+from monitoring.shedding import queue_ms
+
+
+class OpenAPISchemaTests(SimpleTestCase):
+
+    def test_committed_schema_matches_views(self):
+        stored = load_schema_file()
+        self.assertIsNotNone(stored, f"{settings.OPENAPI_SCHEMA_FILE} is missing; run `python manage.py build_schema`.")
+        self.assertEqual(
+            json.loads(stored[0]), json.loads(generate_schema()),
+            "The committed OpenAPI schema is out of date; run `python manage.py build_schema`.",
+        )
+
+    @override_settings(DEBUG=False)
+    def test_schema_served_from_file_with_etag(self):
+        body, etag = load_schema_file()
+
+        response = self.client.get('/swagger/', {'format': 'openapi'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, body)
+
+        response = self.client.get('/swagger/', {'format': 'openapi'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    @override_settings(DEBUG=False, COMPRESSION_ENABLED=True)
+    def test_compressed_schema_revalidates_with_weak_etag(self):
+        body, etag = load_schema_file()
+
+        response = self.client.get('/swagger/', {'format': 'openapi'}, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['ETag'], 'W/' + etag)
+
+        response = self.client.get(
+            '/swagger/', {'format': 'openapi'}, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'],
+        )
+        self.assertEqual(response.status_code, 304)
+
+
+@override_settings(LOAD_SHED_ENABLED=True, LOAD_SHED_QUEUE_MS=200, DEBUG=False)
+class LoadSheddingTests(SimpleTestCase):
+
+    def test_queue_time_header_formats(self):
+        now = 1_700_000_000.5
+        for header in ('t=1700000000.000', '1700000000000', 't=1700000000000000'):
+            self.assertAlmostEqual(queue_ms(header, now=now), 500.0, places=3)
+        self.assertIsNone(queue_ms('t=soon', now=now))
+
+    def test_request_queued_too_long_is_shed(self):
+        # sync worker: in-flight doim 1 — navbatda kutish vaqti signal
+        started = f't={time.time() - 1:.3f}'
+        response = self.client.get('/swagger/', {'format': 'openapi'}, HTTP_X_REQUEST_START=started)
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('Retry-After', response)
+
+    def test_fresh_request_is_served(self):
+        started = f't={time.time():.3f}'
+        response = self.client.get('/swagger/', {'format': 'openapi'}, HTTP_X_REQUEST_START=started)
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRoutingTests(SimpleTestCase):
+    """Routing qarori: 'replica' alias'i faqat nomi bilan qaytadi, unga ulanilmaydi."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.user = User(pk=987654, email='sticky@example.com')
+        self.addCleanup(cache.delete, STICKY_CACHE_KEY.format(self.user.pk))
+
+    def route(self, request, user=None, primary_block=False, status=200):
+        seen = []
+
+        def view(request):
+            if user is not None:
+                # DRF autentifikatsiyasidan keyingi holat
+                request.user = user
+            if primary_block:
+                with use_primary():
+                    seen.append(PrimaryReplicaRouter().db_for_read(User))
+            else:
+                seen.append(PrimaryReplicaRouter().db_for_read(User))
+            return HttpResponse(status=status)
+
+        response = ReplicaRoutingMiddleware(view)(request)
+        return seen[0], response
+
+    def test_reads_go_to_replica_outside_sticky_window(self):
+        self.assertEqual(self.route(self.factory.get('/'), user=self.user)[0], 'replica')
+        self.assertEqual(self.route(self.factory.get('/'), primary_block=True)[0], 'default')
+
+    def test_write_makes_user_and_client_sticky(self):
+        db, response = self.route(self.factory.post('/'), user=self.user)
+        self.assertEqual(db, 'default')
+        cookie = response.cookies[settings.DB_REPLICA_STICKY_COOKIE].value
+
+        # shu user — boshqa qurilmadan ham (cache)
+        self.assertEqual(self.route(self.factory.get('/'), user=self.user)[0], 'default')
+        # shu klient — user hali ma'lum bo'lmasa ham (cookie)
+        request = self.factory.get('/')
+        request.COOKIES[settings.DB_REPLICA_STICKY_COOKIE] = cookie
+        self.assertEqual(self.route(request)[0], 'default')
+        # boshqa user va klient — replica
+        other = User(pk=self.user.pk + 1, email='other@example.com')
+        self.assertEqual(self.route(self.factory.get('/'), user=other)[0], 'replica')
+
+    def test_failed_write_does_not_stick(self):
+        _, response = self.route(self.factory.post('/'), user=self.user, status=400)
+        self.assertNotIn(settings.DB_REPLICA_STICKY_COOKIE, response.cookies)
+        self.assertEqual(self.route(self.factory.get('/'), user=self.user)[0], 'replica')
+
+
+class ThrottleCacheCheckTests(SimpleTestCase):
+
+    @override_settings(THROTTLE_ENABLED=True, DEBUG=False)
+    def test_locmem_throttle_cache_warns(self):
+        self.assertEqual([w.id for w in throttle_cache_check(None)], ['monitoring.W001'])
+
+    @override_settings(THROTTLE_ENABLED=False, DEBUG=False)
+    def test_disabled_throttle_does_not_warn(self):
+        self.assertEqual(throttle_cache_check(None), [])
+
+
+class PoolStatsTests(APITestCase):
+
+    def test_owner_sees_stats_for_every_alias(self):
+        response = self.client.get('/monitoring/db/')
+        self.assertEqual(response.status_code, 200)
+        default, = [row for row in response.data if row['alias'] == 'default']
+        self.assertIn(default['mode'], ('pool', 'direct'))
+        self.assertIn('acquire_avg_ms', default)
+
+    def test_other_roles_are_denied(self):
+        for role in (User.Role.PM, User.Role.DEV):
+            self.authenticate(User.objects.create_user(f'{role}@example.com', 'secret', name=role, role=role))
+            self.assertEqual(self.client.get('/monitoring/db/').status_code, 403)
+        self.client.credentials()
+        self.assertEqual(self.client.get('/monitoring/db/').status_code, 401)
+
+    @override_settings(LOAD_SHED_DECAY_SECONDS=3600)
+    def test_acquire_stats_snapshot(self):
+        stats = AcquireStats()
+        stats.record(10.0, slow=False)
+        stats.record(30.0, slow=True)
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot['acquire_count'], 2)
+        self.assertEqual(snapshot['acquire_avg_ms'], 20.0)
+        self.assertEqual(snapshot['acquire_max_ms'], 30.0)
+        self.assertEqual(snapshot['acquire_slow'], 1)
+        self.assertGreater(snapshot['acquire_recent_ms'], 0)
+
+
+@override_settings(DEBUG=False, METRICS_TOKEN='')
+class MetricsEndpointTests(SimpleTestCase):
+
+    def test_hidden_without_token_outside_debug(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 404)
+
+    @override_settings(DEBUG=True)
+    def test_open_in_debug_without_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+    @override_settings(METRICS_TOKEN='s3cret')
+    def test_token_is_required_when_set(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong').status_code, 401)
+
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer s3cret')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertIn(b'http_request_duration_seconds', response.content)
+
+
+class SeedingTests(TestCase):
+    volumes = dict(users=6, projects=2, sprints=2, tasks=5, assignees=2, audit=2)
+
+    def test_counts_match_volumes(self):
+        # batch_size kichik — pk'lar bir necha batch'dan keyin ham to'g'ri o'qiladi
+        counts = seed(seed=7, batch_size=3, deleted_ratio=0, **self.volumes)
+
+        self.assertEqual(counts['accounts.User'], 6)
+        self.assertEqual(Project.objects.count(), 2)
+        self.assertEqual(Task.objects.count(), 2 * 2 * 5)
+        self.assertEqual(Task.assignees.through.objects.count(), 20 * 2)
+        self.assertEqual(AuditLog.objects.filter(model='management.Task').count(), 20 * 2)
+        self.assertEqual(User.objects.filter(role=User.Role.OWNER).count(), 1)
+        for sprint_id in Task.objects.values_list('sprint_id', flat=True).distinct():
+            ranks = list(Task.objects.filter(sprint_id=sprint_id).order_by('pk').values_list('rank', flat=True))
+            self.assertEqual(ranks, sorted(set(ranks)))
+
+    def test_same_seed_same_data(self):
+        seed(seed=7, prefix='a', **self.volumes)
+        first = list(Task.objects.order_by('pk').values_list('title', 'status', 'rank'))
+        seed(seed=7, prefix='b', **self.volumes)
+        second = list(Task.objects.order_by('pk').values_list('title', 'status', 'rank'))[len(first):]
+
+        self.assertEqual(first, second)
+        self.assertEqual(User.objects.filter(email__startswith='b.7.').count(), 6)
+
+    def test_benchmark_runs_selected_case(self):
+        seed(seed=7, deleted_ratio=0, **self.volumes)
+
+        result = Benchmark(iterations=2, warmup=1, cases=['accounts.me']).run_scale()
+
+        self.assertEqual(list(result), ['accounts.me'])
+        self.assertEqual(result['accounts.me']['iterations'], 2)
+        self.assertEqual(result['accounts.me']['statuses'], {'200': 2})
+
+
+class BenchmarkCompareTests(SimpleTestCase):
+
+    def report(self, p50, queries):
+        return {'scales': {'small': {'endpoints': {'accounts.me': {'p50_ms': p50, 'queries': queries}}}}}
+
+    def test_percentile(self):
+        values = [5, 1, 4, 2, 3]
+        self.assertEqual(percentile(values, 50), 3)
+        self.assertEqual(percentile(values, 95), 5)
+        self.assertEqual(percentile(values, 0), 1)
+
+    def test_slower_p50_is_regression(self):
+        lines, regressions = compare(self.report(10.0, 2), self.report(15.0, 2))
+        self.assertEqual(regressions, 1)
+        self.assertIn('REGRESSION', lines[0])
+
+    def test_sub_millisecond_noise_ignored(self):
+        _, regressions = compare(self.report(0.5, 2), self.report(1.0, 2))
+        self.assertEqual(regressions, 0)
+
+    def test_more_queries_is_regression(self):
+        _, regressions = compare(self.report(10.0, 2), self.report(10.0, 3))
+        self.assertEqual(regressions, 1)
+
+    def test_new_endpoint(self):
+        lines, regressions = compare({'scales': {}}, self.report(10.0, 2))
+        self.assertEqual(regressions, 0)
+        self.assertTrue(lines[0].endswith('new'))
+
+
+class LazySwaggerTests(SimpleTestCase):
+
+    def test_decorator_records_deferred_arguments(self):
+        param = openapi.Parameter('q', openapi.IN_QUERY, type=openapi.TYPE_STRING)
+
+        def view(self, request):
+            pass
+
+        swagger_auto_schema(manual_parameters=[param], operation_id='lazy_view')(view)
+
+        self.assertIsInstance(param, Deferred)
+        self.assertEqual(getattr(view, LAZY_ATTR), [{'manual_parameters': [param], 'operation_id': 'lazy_view'}])
+
+        apply_swagger_auto_schema(view)
+        self.assertFalse(hasattr(view, LAZY_ATTR))
+        self.assertEqual(view._swagger_auto_schema['operation_id'], 'lazy_view')
+        parameter = view._swagger_auto_schema['manual_parameters'][0]
+        self.assertEqual((parameter.name, parameter.in_, parameter.type), ('q', 'query', 'string'))
+
+
+class StartupProfileTests(SimpleTestCase):
+
+    def test_parse_importtime_phases_and_depth(self):
+        stderr = '\n'.join([
+            'import time: self [us] | cumulative | imported package',
+            'import time:       120 |        120 |     django.utils',
+            'import time:       300 |        420 |   django',
+            startup.MARKER,
+            'import time:        50 |         50 | management.views',
+            'unrelated line',
+        ])
+        self.assertEqual(startup.parse_importtime(stderr), [
+            ('django.utils', 120, 120, 2, 'load'),
+            ('django', 300, 420, 1, 'load'),
+            ('management.views', 50, 50, 0, 'request'),
+        ])
+
+    def test_compare_flags_newly_loaded_lazy_module(self):
+        old = {'load_ms': 100.0, 'lazy_modules_loaded': []}
+        new = {'load_ms': 103.0, 'lazy_modules_loaded': ['PIL']}
+
+        lines, regressions = startup.compare(old, new)
+
+        self.assertEqual(regressions, 1)
+        self.assertEqual(lines[-1], 'REGRESSION PIL is now imported at startup')
+
+    def test_worker_does_not_import_lazy_modules(self):
+        # bola jarayon sozlamalarni qaytadan o'qiydi — test runner qo'shgan 'testserver' u yerda yo'q
+        with mock.patch.dict(os.environ, DJANGO_ALLOWED_HOSTS='probe.local'):
+            result = startup.probe('/accounts/me/', 'probe.local')
+
+        self.assertTrue(result['status'].startswith('401'))
+        loaded = set(result['modules'])
+        self.assertEqual([name for name in startup.LAZY_MODULES if name in loaded], [])
+
+
+@override_settings(COMPRESSION_ENABLED=True, COMPRESSION_MIN_SIZE=100, COMPRESSION_EXCLUDE_PATHS=('/auth/',))
+class CompressionTests(SimpleTestCase):
+    body = json.dumps([{'id': n, 'title': 'task'} for n in range(50)]).encode()
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def respond(self, response, path='/management/tasks/', accept='gzip'):
+        request = self.factory.get(path, HTTP_ACCEPT_ENCODING=accept)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def json_response(self, body=None, **headers):
+        return HttpResponse(self.body if body is None else body, content_type='application/json', headers=headers)
+
+    def test_negotiate_uses_q_values_then_server_order(self):
+        encodings = ['br', 'zstd', 'gzip']
+        self.assertEqual(negotiate('gzip, br', encodings), 'br')
+        self.assertEqual(negotiate('br;q=0.5, gzip', encodings), 'gzip')
+        self.assertEqual(negotiate('*', encodings), 'br')
+        self.assertEqual(negotiate('*;q=0, gzip;q=0.1', encodings), 'gzip')
+        self.assertIsNone(negotiate('identity', encodings))
+        self.assertIsNone(negotiate('gzip;q=0', encodings))
+        self.assertIsNone(negotiate('', encodings))
+        self.assertEqual(negotiate('br, gzip', ['gzip']), 'gzip')
+
+    def test_compresses_json_with_weak_etag(self):
+        response = self.respond(self.json_response(ETag='"abc"'))
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(response['ETag'], 'W/"abc"')
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertEqual(gzip.decompress(response.content), self.body)
+
+    def test_unaccepted_encoding_is_left_plain_but_varies(self):
+        response = self.respond(self.json_response(), accept='identity')
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(response.content, self.body)
+
+    def test_skip_rules(self):
+        cases = {
+            'small': (self.json_response(b'{"ok": true}'), '/management/tasks/'),
+            # siqilgani kattaroq chiqadi
+            'incompressible': (self.json_response(os.urandom(400)), '/management/tasks/'),
+            'binary': (HttpResponse(self.body, content_type='image/png'), '/management/tasks/'),
+            'encoded': (self.json_response(**{'Content-Encoding': 'br'}), '/management/tasks/'),
+            'no-transform': (self.json_response(**{'Cache-Control': 'no-transform'}), '/management/tasks/'),
+            'excluded path': (self.json_response(), '/auth/login/'),
+            'not modified': (HttpResponse(status=304, content_type='application/json'), '/management/tasks/'),
+        }
+        for label, (response, path) in cases.items():
+            with self.subTest(label):
+                content = response.content
+                response = self.respond(response, path=path)
+                self.assertNotEqual(response.get('Content-Encoding'), 'gzip')
+                self.assertEqual(response.content, content)
+
+    @override_settings(COMPRESSION_ENABLED=False)
+    def test_disabled(self):
+        self.assertFalse(self.respond(self.json_response()).has_header('Content-Encoding'))
+
+    def test_streaming_response_is_flushed_per_chunk(self):
+        chunks = [self.body[:len(self.body) // 2], self.body[len(self.body) // 2:]]
+        response = StreamingHttpResponse(iter(chunks), content_type='application/x-ndjson')
+
+        response = self.respond(response)
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('Content-Length'))
+        parts = list(response.streaming_content)
+        # har bo'lakdan keyin flush — birinchi bo'lak oqim tugashini kutmasdan o'qiladi
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self.assertEqual(decoder.decompress(parts[0]), chunks[0])
+        self.assertEqual(gzip.decompress(b''.join(parts)), self.body)
@@ -0,0 +1,138 @@
+"""
+Rol va endpoint sinfi bo'yicha token-bucket throttle (REST_FRAMEWORK DEFAULT_THROTTLE_CLASSES).
+
+Bucket'lar worker xotirasida: dict, har bir kalit holati — o'zgarmas tuple, yangilanish bitta
+`dict[key] = ...` yozuvi (lock yo'q). Bir kalitga parallel so'rovlar bo'lsa bitta yozuv yo'qolishi
+mumkin — eng ko'pi bilan bitta token kam hisoblanadi.
+
+Sarflangan tokenlar har THROTTLE_SYNC_INTERVAL soniyada umumiy cache'ga (Redis) `incr` bilan
+qo'shiladi; javobdagi yig'indidan boshqa worker'lar sarfi lokal bucket'dan ayiriladi. Shunday qilib
+limit butun klaster bo'yicha, lekin har so'rovda tarmoq chaqiruvi yo'q (xatolik — bitta sync
+oralig'idagi sarf). Cache ishlamasa throttle lokal bucket bilan davom etadi.
+
+REDIS_URL berilmasa umumiy cache — LocMem, ya'ni har bir worker'ning o'z xotirasi: sinxronlash
+faqat shu jarayon ichida, limit esa worker soniga ko'payadi (`manage.py check` — monitoring.W001).
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+from .metrics import THROTTLED
+
+logger = logging.getLogger(__name__)
+
+ANONYMOUS = 'ANON'
+
+# key -> (tokens, refilled_at, pending, seen, window, synced_at)
+#   pending — oxirgi sync'dan beri shu worker sarflagan tokenlar
+#   seen    — oxirgi sync'da o'qilgan umumiy sarf (joriy oyna bo'yicha, o'zimizniki bilan)
+_buckets = {}
+
+
+def endpoint_class(request, view):
+    """'read' / 'write' yoki view'dagi `throttle_scope` (masalan 'export')."""
+    scope = getattr(view, 'throttle_scope', None)
+    if scope:
+        return scope
+    return 'read' if request.method in SAFE_METHODS else 'write'
+
+
+def _sync(key, tokens, pending, seen, window):
+    """Umumiy store bilan almashish; (tokens, pending, seen, window)."""
+    window_seconds = settings.THROTTLE_SYNC_WINDOW
+    current = int(time.time() // window_seconds)
+    if current != window:
+        seen = 0
+    shared_key = f'{key}:{current}'
+    cache = caches[settings.THROTTLE_CACHE]
+    try:
+        if pending:
+            try:
+                total = cache.incr(shared_key, pending)
+            except ValueError:
+                # oynadagi birinchi yozuv; parallel add yutqazsa — incr
+                if cache.add(shared_key, pending, timeout=window_seconds * 2):
+                    total = pending
+                else:
+                    total = cache.incr(shared_key, pending)
+        else:
+            total = cache.get(shared_key, 0)
+    except Exception:
+        logger.warning("Throttle sync failed for %s", key, exc_info=True)
+        return tokens, pending, seen, window
+
+    # birinchi sync — faqat boshlang'ich nuqta: oynadagi oldingi sarf allaqachon to'lgan bo'lishi mumkin
+    others = 0 if window is None else total - seen - pending
+    return tokens - max(0, others), 0, total, current
+
+
+def take(key, rate, burst, now=None):
+    """Bitta token oladi: (ruxsat, kutish_soniya)."""
+    now = time.monotonic() if now is None else now
+    state = _buckets.get(key)
+    if state is None:
+        if len(_buckets) >= settings.THROTTLE_MAX_KEYS:
+            prune(now)
+        # synced_at = -inf: yangi bucket darhol umumiy store bilan tanishadi
+        tokens, refilled_at, pending, seen, window, synced_at = float(burst), now, 0, 0, None, float('-inf')
+    else:
+        tokens, refilled_at, pending, seen, window, synced_at = state
+
+    tokens = min(float(burst), tokens + (now - refilled_at) * rate)
+    if now - synced_at >= settings.THROTTLE_SYNC_INTERVAL:
+        tokens, pending, seen, window = _sync(key, tokens, pending, seen, window)
+        # boshqalar sarfi qarz sifatida qoladi (0 da kesilsa limit worker'lar soniga ko'payadi)
+        tokens = max(-float(burst), tokens)
+        synced_at = now
+
+    if tokens >= 1:
+        _buckets[key] = (tokens - 1, now, pending + 1, seen, window, synced_at)
+        return True, 0.0
+    _buckets[key] = (tokens, now, pending, seen, window, synced_at)
+    return False, (1 - tokens) / rate
+
+
+def prune(now):
+    """Uzoq ishlatilmagan (to'lib bo'lgan, sync qilingan) bucket'larni chiqaradi."""
+    idle = settings.THROTTLE_IDLE_SECONDS
+    for key, state in list(_buckets.items()):
+        if now - state[1] > idle and not state[2]:
+            _buckets.pop(key, None)
+
+
+class RoleRateThrottle(BaseThrottle):
+    """
+    THROTTLE_RATES[rol][endpoint sinfi] = (soniyasiga token, bucket hajmi).
+    Kalit — user (anonim bo'lsa IP), rol va endpoint sinfi.
+    """
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def allow_request(self, request, view):
+        if not settings.THROTTLE_ENABLED:
+            return True
+
+        user = request.user
+        if user and user.is_authenticated:
+            role, ident = getattr(user, 'role', ANONYMOUS), user.pk
+        else:
+            role, ident = ANONYMOUS, self.get_ident(request)
+        scope = endpoint_class(request, view)
+
+        rates = settings.THROTTLE_RATES.get(role) or settings.THROTTLE_RATES[ANONYMOUS]
+        if scope not in rates:
+            return True
+        rate, burst = rates[scope]
+
+        allowed, self.wait_seconds = take(f'throttle:{role}:{scope}:{ident}', rate, burst)
+        if not allowed:
+            THROTTLED.labels(role, scope).inc()
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
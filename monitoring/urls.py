@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import DatabasePoolStatsAPIView
+
+urlpatterns = [
+    path('db/', DatabasePoolStatsAPIView.as_view(), name='monitoring-db'),
+]
@@ -0,0 +1,18 @@
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from config.swagger import swagger_auto_schema
+
+from accounts.permissions import IsOwner
+from .db import all_pool_stats
+
+
+class DatabasePoolStatsAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsOwner]
+
+    @swagger_auto_schema(
+        tags=["Monitoring"],
+        operation_summary="DB connection pool holati (shu worker jarayoni bo'yicha, faqat OWNER)"
+    )
+    def get(self, request):
+        return Response(all_pool_stats())